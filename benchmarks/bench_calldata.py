@@ -0,0 +1,40 @@
+"""
+Micro-benchmark: execute() calldata template vs full eth_abi encoding.
+
+Usage: PYTHONPATH=src python benchmarks/bench_calldata.py
+"""
+
+import timeit
+from web3 import Web3
+from clients.uniswap.calldata import ExecuteCalldataTemplate, encode_execute_calldata
+from config import UNIVERSAL_ROUTER_ABI
+
+N = 5_000
+AMOUNT = 2 * 10**15
+LIMIT = 7_123_456
+
+
+def _bench(name: str, fn) -> float:
+    best = min(timeit.repeat(fn, number=N, repeat=5)) / N * 1e6
+    print(f"{name:<28} {best:8.3f} us/op")
+    return best
+
+
+def main():
+    router = Web3().eth.contract(abi=UNIVERSAL_ROUTER_ABI)
+    for zero_for_one in (True, False):
+        template = ExecuteCalldataTemplate(zero_for_one, router)
+        assert template.build(AMOUNT, LIMIT) == encode_execute_calldata(
+            zero_for_one, AMOUNT, LIMIT, router
+        )
+        label = "sell" if zero_for_one else "buy"
+        ref = _bench(
+            f"{label} eth_abi",
+            lambda z=zero_for_one: encode_execute_calldata(z, AMOUNT, LIMIT, router),
+        )
+        fast = _bench(f"{label} template", lambda t=template: t.build(AMOUNT, LIMIT))
+        print(f"{label + ' speedup':<28} {ref / fast:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Micro-benchmark: float vs integer (sqrtPriceX96) edge detection per flashblock.
+
+Usage: PYTHONPATH=src python benchmarks/bench_detector.py
+"""
+
+import logging
+import timeit
+from engine.detector import ArbDetector
+from state.orderbook import OrderBook
+from state.pool import Pool
+
+N = 200_000
+
+
+def _bench(name: str, fn) -> float:
+    best = min(timeit.repeat(fn, number=N, repeat=5)) / N * 1e6
+    print(f"{name:<28} {best:8.3f} us/op")
+    return best
+
+
+def _make_detector(mode: str) -> ArbDetector:
+    """Pool and quote at 4000 USDC/ETH, no edge"""
+    sqrt_price = ArbDetector._price_to_sqrt_x96(4000.0)
+    pool = Pool(sqrt_price_x96=sqrt_price, price=4000.0)
+    orderbook = OrderBook(4000.0, 4000.01, 1.0, 1.0, 400000, 400001, -2)
+    return ArbDetector(pool, orderbook, None, None, logging.getLogger(), mode=mode)
+
+
+def main():
+    for mode in ("float", "integer"):
+        detector = _make_detector(mode)
+        _bench(f"{mode} detect", lambda d=detector: d._detect(1, 0, False))
+
+    # integer mode recomputes thresholds on every new quote
+    detector = _make_detector("integer")
+    ob = detector.orderbook
+    quotes = [(m, m + 1) for m in range(399_900, 400_100)]
+
+    def new_quote():
+        for ob.bid_mantissa, ob.ask_mantissa in quotes:
+            detector._detect(1, 0, False)
+
+    best = min(timeit.repeat(new_quote, number=N // 200, repeat=5)) / N * 1e6
+    print(f"{'integer detect, new quote':<28} {best:8.3f} us/op")
+
+
+if __name__ == "__main__":
+    main()
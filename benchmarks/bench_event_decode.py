@@ -0,0 +1,53 @@
+"""
+Micro-benchmark: fixed-layout event decoder vs eth_abi.
+
+Usage: PYTHONPATH=src python benchmarks/bench_event_decode.py
+"""
+
+import timeit
+from eth_abi import encode, decode
+from feeds.event_decoder import decode_swap_data, decode_modify_liquidity_data
+
+SWAP_TYPES = ["int128", "int128", "uint160", "uint128", "int24", "int24"]
+MODIFY_TYPES = ["int24", "int24", "int256", "bytes32"]
+N = 20_000
+
+SWAP_HEX = (
+    "0x"
+    + encode(
+        SWAP_TYPES,
+        [-2 * 10**15, 6_543_210, 3_987_654_321 * 2**64, 10**18, -198_765, 500],
+    ).hex()
+)
+MODIFY_HEX = (
+    "0x" + encode(MODIFY_TYPES, [-199_000, -198_000, -(10**15), b"\x01" * 32]).hex()
+)
+
+
+def _abi_swap():
+    return decode(SWAP_TYPES, bytes.fromhex(SWAP_HEX[2:]))
+
+
+def _abi_modify():
+    return decode(MODIFY_TYPES, bytes.fromhex(MODIFY_HEX[2:]))
+
+
+def _bench(name: str, fn) -> float:
+    best = min(timeit.repeat(fn, number=N, repeat=5)) / N * 1e6
+    print(f"{name:<28} {best:8.3f} us/op")
+    return best
+
+
+def main():
+    abi = _bench("swap eth_abi", _abi_swap)
+    fast = _bench("swap fixed-layout", lambda: decode_swap_data(SWAP_HEX))
+    print(f"{'swap speedup':<28} {abi / fast:8.1f}x")
+    abi = _bench("modify_liquidity eth_abi", _abi_modify)
+    fast = _bench(
+        "modify_liquidity fixed", lambda: decode_modify_liquidity_data(MODIFY_HEX)
+    )
+    print(f"{'modify_liquidity speedup':<28} {abi / fast:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Micro-benchmark: caller-thread (event loop) time per per-flashblock log line,
+synchronous basicConfig-style handler vs queue handler vs sampled queue handler.
+
+Usage: PYTHONPATH=src python benchmarks/bench_logging.py
+"""
+
+import os
+import logging
+import timeit
+from infra.log import LOG_FORMAT, SampledLogger, setup_logging
+
+N = 20_000
+ARGS = (38_620_834, 7, 4001.152311, 4001.152311, 3999.991234, 4004.003425)
+MSG = "#%s-%s: B b=%.6f, a=%.6f | U b=%.6f, a=%.6f"
+
+
+def _bench(name: str, fn) -> float:
+    best = min(timeit.repeat(fn, number=N, repeat=5)) / N * 1e6
+    print(f"{name:<28} {best:8.3f} us/op")
+    return best
+
+
+def main():
+    logger = logging.getLogger()
+    devnull = open(os.devnull, "w", encoding="utf-8")  # pylint: disable=R1732
+
+    # before: basicConfig stream handler, formats + writes on the caller thread
+    handler = logging.StreamHandler(devnull)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    _bench("sync stream handler", lambda: logger.info(MSG, *ARGS))
+
+    # after: queue handler, the listener thread formats and writes
+    listener = setup_logging()
+    listener.handlers[0].setStream(devnull)
+    _bench("queue handler", lambda: logger.info(MSG, *ARGS))
+
+    sampled = SampledLogger(logger, "INFO", every=10)
+
+    def sampled_line():
+        if sampled.due():
+            sampled.log(MSG, *ARGS)
+
+    _bench("queue handler, 1 in 10", sampled_line)
+    listener.stop()
+    devnull.close()
+
+
+if __name__ == "__main__":
+    main()
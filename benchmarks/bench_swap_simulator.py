@@ -0,0 +1,56 @@
+"""
+Micro-benchmark: integer-exact v4 swap simulation on a dense tick map.
+
+Usage: PYTHONPATH=src python benchmarks/bench_swap_simulator.py
+"""
+
+import random
+import timeit
+from engine.swap_simulator import swap_to_price
+from engine.tick_math import get_sqrt_price_at_tick, sqrt_price_table
+from state.pool import Pool
+from state.ticks import TickStore
+
+N = 2_000
+CURRENT_TICK = -199_005
+
+
+def _bench(name: str, fn) -> float:
+    best = min(timeit.repeat(fn, number=N, repeat=5)) / N * 1e6
+    print(f"{name:<28} {best:8.3f} us/op")
+    return best
+
+
+def _make_pool() -> Pool:
+    """~1000 initialized ticks at spacing 10 around the current tick"""
+    rng = random.Random(1)
+    ticks = TickStore()
+    liquidity = 0
+    for idx in range(CURRENT_TICK - 5_005, CURRENT_TICK + 5_005, 10):
+        net = rng.randint(10**15, 10**17)
+        ticks.update(idx, net, net)
+        if idx <= CURRENT_TICK:
+            liquidity += net
+    return Pool(
+        sqrt_price_x96=get_sqrt_price_at_tick(CURRENT_TICK),
+        current_tick=CURRENT_TICK,
+        active_liquidity=liquidity,
+        ticks=ticks,
+    )
+
+
+def main():
+    pool = _make_pool()
+    sqrt_price_table.prefill(pool.ticks)
+    for crossed in (0, 10, 100):
+        target = get_sqrt_price_at_tick(CURRENT_TICK - 10 * crossed - 3)
+        result = swap_to_price(pool, target)
+        assert result.ticks_crossed == crossed
+        _bench(
+            f"swap_to_price {crossed:>3} ticks",
+            lambda t=target: swap_to_price(pool, t),
+        )
+
+
+if __name__ == "__main__":
+    main()
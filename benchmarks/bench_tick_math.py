@@ -0,0 +1,53 @@
+"""
+Micro-benchmark: cached sqrt price table vs reference TickMath.
+
+Usage: PYTHONPATH=src python benchmarks/bench_tick_math.py
+"""
+
+import random
+import timeit
+from engine.tick_math import (
+    SqrtPriceTable,
+    get_sqrt_price_at_tick,
+    get_tick_at_sqrt_price,
+)
+
+N = 20_000
+TICKS = list(range(-204_000, -194_000, 10))
+
+
+def _bench(name: str, fn, number: int = N) -> float:
+    best = min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+    print(f"{name:<28} {best:8.3f} us/op")
+    return best
+
+
+def main():
+    table = SqrtPriceTable()
+    _bench("prefill (1000 ticks)", lambda: SqrtPriceTable().prefill(TICKS), 20)
+    table.prefill(TICKS)
+
+    tick = -199_010
+    ref = _bench("sqrt price reference", lambda: get_sqrt_price_at_tick(tick))
+    cached = _bench("sqrt price cached", lambda: table.get(tick))
+    print(f"{'sqrt price speedup':<28} {ref / cached:8.1f}x")
+
+    rng = random.Random(2)
+    lo, hi = get_sqrt_price_at_tick(TICKS[0]), get_sqrt_price_at_tick(TICKS[-1])
+    prices = [rng.randint(lo, hi) for _ in range(64)]
+    assert all(table.tick_at_sqrt_price(p) == get_tick_at_sqrt_price(p) for p in prices)
+    ref = _bench(
+        "tick at price reference",
+        lambda: [get_tick_at_sqrt_price(p) for p in prices],
+        N // 64,
+    )
+    cached = _bench(
+        "tick at price table",
+        lambda: [table.tick_at_sqrt_price(p) for p in prices],
+        N // 64,
+    )
+    print(f"{'tick at price speedup':<28} {ref / cached:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
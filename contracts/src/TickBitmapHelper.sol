@@ -3,6 +3,21 @@ pragma solidity ^0.8.20;
 
 /// @notice Minimal interface for StateView contract
 interface IStateView {
+    function getSlot0(bytes32 poolId)
+        external
+        view
+        returns (
+            uint160 sqrtPriceX96,
+            int24 tick,
+            uint24 protocolFee,
+            uint24 lpFee
+        );
+
+    function getLiquidity(bytes32 poolId)
+        external
+        view
+        returns (uint128 liquidity);
+
     function getTickBitmap(bytes32 poolId, int16 word)
         external
         view
@@ -22,6 +37,9 @@ interface IStateView {
 contract TickBitmapHelper {
     IStateView public immutable STATE_VIEW;
 
+    int24 internal constant MIN_TICK = -887272;
+    int24 internal constant MAX_TICK = 887272;
+
     struct TickData {
         int24 index;
         uint128 liquidityGross;
@@ -30,6 +48,22 @@ contract TickBitmapHelper {
         uint256 feeGrowthOutside1X128;
     }
 
+    struct TickLiquidity {
+        int24 index;
+        uint128 liquidityGross;
+        int128 liquidityNet;
+    }
+
+    struct PoolSnapshot {
+        uint256 blockNumber;
+        uint160 sqrtPriceX96;
+        int24 tick;
+        uint128 liquidity;
+        int16 startWord;
+        int16 endWord;
+        TickLiquidity[] ticks;
+    }
+
     constructor(address _stateView) {
         require(_stateView != address(0), "stateView is zero");
         STATE_VIEW = IStateView(_stateView);
@@ -86,4 +120,144 @@ contract TickBitmapHelper {
             });
         }
     }
+
+    /// @notice slot0, active liquidity and all initialized ticks in the bitmap
+    /// words [word - wordRadius, word + wordRadius] around the current tick,
+    /// clamped to the valid tick range
+    function getPoolSnapshot(
+        bytes32 poolId,
+        int24 tickSpacing,
+        uint16 wordRadius
+    ) external view returns (PoolSnapshot memory snapshot) {
+        (uint160 sqrtPriceX96, int24 tick, , ) = STATE_VIEW.getSlot0(poolId);
+        snapshot.blockNumber = block.number;
+        snapshot.sqrtPriceX96 = sqrtPriceX96;
+        snapshot.tick = tick;
+        snapshot.liquidity = STATE_VIEW.getLiquidity(poolId);
+        (snapshot.startWord, snapshot.endWord) = _window(
+            tick,
+            tickSpacing,
+            wordRadius
+        );
+        snapshot.ticks = _initializedTicks(
+            poolId,
+            tickSpacing,
+            snapshot.startWord,
+            snapshot.endWord
+        );
+    }
+
+    /// @notice Liquidity of all initialized ticks in the words [startWord, endWord]
+    function getInitializedTicks(
+        bytes32 poolId,
+        int24 tickSpacing,
+        int16 startWord,
+        int16 endWord
+    ) external view returns (TickLiquidity[] memory ticks) {
+        require(endWord >= startWord, "invalid range");
+        return _initializedTicks(poolId, tickSpacing, startWord, endWord);
+    }
+
+    function _initializedTicks(
+        bytes32 poolId,
+        int24 tickSpacing,
+        int16 startWord,
+        int16 endWord
+    ) internal view returns (TickLiquidity[] memory ticks) {
+        (uint256[] memory bitmaps, uint256 count) = _readBitmaps(
+            poolId,
+            startWord,
+            endWord
+        );
+        ticks = new TickLiquidity[](count);
+        uint256 n;
+        for (uint256 i = 0; i < bitmaps.length; i++) {
+            uint256 bitmap = bitmaps[i];
+            while (bitmap != 0) {
+                uint256 bit = _leastSignificantBit(bitmap);
+                bitmap &= bitmap - 1;
+                // forge-lint: disable-next-line(unsafe-typecast)
+                int24 index = int24(
+                    ((int256(startWord) + int256(i)) * 256 + int256(bit)) *
+                        tickSpacing
+                );
+                (uint128 liquidityGross, int128 liquidityNet, , ) = STATE_VIEW
+                    .getTickInfo(poolId, index);
+                ticks[n] = TickLiquidity(index, liquidityGross, liquidityNet);
+                n++;
+            }
+        }
+    }
+
+    /// @dev Bitmaps of the words [startWord, endWord] and their set bit count
+    function _readBitmaps(
+        bytes32 poolId,
+        int16 startWord,
+        int16 endWord
+    ) internal view returns (uint256[] memory bitmaps, uint256 count) {
+        // forge-lint: disable-next-line(unsafe-typecast)
+        uint256 len = uint256(int256(endWord) - int256(startWord) + 1);
+        bitmaps = new uint256[](len);
+
+        int16 w = startWord;
+        for (uint256 i = 0; i < len; i++) {
+            uint256 bitmap = STATE_VIEW.getTickBitmap(poolId, w);
+            bitmaps[i] = bitmap;
+            while (bitmap != 0) {
+                bitmap &= bitmap - 1;
+                count++;
+            }
+            unchecked {
+                w++;
+            }
+        }
+    }
+
+    /// @dev Words around the tick's word, clamped to [MIN_TICK, MAX_TICK]
+    function _window(
+        int24 tick,
+        int24 tickSpacing,
+        uint16 wordRadius
+    ) internal pure returns (int16 startWord, int16 endWord) {
+        int256 word = _wordOf(tick, tickSpacing);
+        int256 minWord = _wordOf(MIN_TICK, tickSpacing);
+        int256 maxWord = _wordOf(MAX_TICK, tickSpacing);
+        int256 start = word - int256(uint256(wordRadius));
+        int256 end = word + int256(uint256(wordRadius));
+        // forge-lint: disable-next-line(unsafe-typecast)
+        startWord = int16(start < minWord ? minWord : start);
+        // forge-lint: disable-next-line(unsafe-typecast)
+        endWord = int16(end > maxWord ? maxWord : end);
+    }
+
+    /// @dev Bitmap word of a tick, as TickBitmap.compress + position
+    function _wordOf(int24 tick, int24 tickSpacing)
+        internal
+        pure
+        returns (int256)
+    {
+        int256 compressed = int256(tick) / tickSpacing;
+        if (tick < 0 && tick % tickSpacing != 0) compressed--;
+        return compressed >> 8;
+    }
+
+    /// @dev Index of the least significant set bit, x != 0
+    function _leastSignificantBit(uint256 x) internal pure returns (uint256 r) {
+        r = 255;
+        if (x & type(uint128).max > 0) r -= 128;
+        else x >>= 128;
+        if (x & type(uint64).max > 0) r -= 64;
+        else x >>= 64;
+        if (x & type(uint32).max > 0) r -= 32;
+        else x >>= 32;
+        if (x & type(uint16).max > 0) r -= 16;
+        else x >>= 16;
+        if (x & type(uint8).max > 0) r -= 8;
+        else x >>= 8;
+        if (x & 0xf > 0) r -= 4;
+        else x >>= 4;
+        if (x & 0x3 > 0) r -= 2;
+        else x >>= 2;
+        if (x & 0x1 > 0) r -= 1;
+    }
 }
@@ -16,6 +16,46 @@ contract MockStateView is IStateView {
 
     mapping(bytes32 => mapping(int24 => TickInfo)) public ticks;
 
+    struct Slot0 {
+        uint160 sqrtPriceX96;
+        int24 tick;
+    }
+
+    mapping(bytes32 => Slot0) public slot0;
+    mapping(bytes32 => uint128) public liquidity;
+
+    function setSlot0(bytes32 poolId, uint160 sqrtPriceX96, int24 tick) external {
+        slot0[poolId] = Slot0({sqrtPriceX96: sqrtPriceX96, tick: tick});
+    }
+
+    function setLiquidity(bytes32 poolId, uint128 value) external {
+        liquidity[poolId] = value;
+    }
+
+    function getSlot0(bytes32 poolId)
+        external
+        view
+        override
+        returns (
+            uint160 sqrtPriceX96,
+            int24 tick,
+            uint24 protocolFee,
+            uint24 lpFee
+        )
+    {
+        Slot0 memory s = slot0[poolId];
+        return (s.sqrtPriceX96, s.tick, 0, 500);
+    }
+
+    function getLiquidity(bytes32 poolId)
+        external
+        view
+        override
+        returns (uint128)
+    {
+        return liquidity[poolId];
+    }
+
     function setTickBitmap(bytes32 poolId, int16 word, uint256 value) external {
         bitmaps[poolId][word] = value;
     }
@@ -142,4 +182,71 @@ contract TickBitmapHelperTest is Test {
         assertEq(ticks[1].feeGrowthOutside0X128, 3e18);
         assertEq(ticks[1].feeGrowthOutside1X128, 4e18);
     }
+
+    /// @dev Pool around tick -195_000 (word -77) with spacing 10
+    function _setUpPool() internal {
+        mock.setSlot0(poolId, 4_000 << 96, -195_000);
+        mock.setLiquidity(poolId, 1e18);
+        // word -80: tick -204_750, outside a radius of 1
+        mock.setTickBitmap(poolId, -80, uint256(1) << 5);
+        // word -77: ticks -197_090 and -195_120
+        mock.setTickBitmap(poolId, -77, (uint256(1) << 3) | (uint256(1) << 200));
+        // word -76: tick -194_560
+        mock.setTickBitmap(poolId, -76, 1);
+        mock.setTickInfo(poolId, -204_750, 10, 10, 0, 0);
+        mock.setTickInfo(poolId, -197_090, 20, 20, 0, 0);
+        mock.setTickInfo(poolId, -195_120, 30, -5, 0, 0);
+        mock.setTickInfo(poolId, -194_560, 25, -25, 0, 0);
+    }
+
+    function testGetPoolSnapshotWindow() public {
+        _setUpPool();
+
+        TickBitmapHelper.PoolSnapshot memory snapshot =
+            helper.getPoolSnapshot(poolId, 10, 1);
+
+        assertEq(snapshot.blockNumber, block.number);
+        assertEq(snapshot.sqrtPriceX96, 4_000 << 96);
+        assertEq(snapshot.tick, -195_000);
+        assertEq(snapshot.liquidity, 1e18);
+        assertEq(snapshot.startWord, -78);
+        assertEq(snapshot.endWord, -76);
+        assertEq(snapshot.ticks.length, 3);
+        assertEq(snapshot.ticks[0].index, -197_090);
+        assertEq(snapshot.ticks[0].liquidityGross, 20);
+        assertEq(snapshot.ticks[1].index, -195_120);
+        assertEq(snapshot.ticks[1].liquidityNet, -5);
+        assertEq(snapshot.ticks[2].index, -194_560);
+        assertEq(snapshot.ticks[2].liquidityNet, -25);
+    }
+
+    function testGetPoolSnapshotFullRangeIsClamped() public {
+        _setUpPool();
+
+        TickBitmapHelper.PoolSnapshot memory snapshot =
+            helper.getPoolSnapshot(poolId, 10, type(uint16).max);
+
+        // compress(-887272) = -88728 -> word -347, compress(887272) -> word 346
+        assertEq(snapshot.startWord, -347);
+        assertEq(snapshot.endWord, 346);
+        assertEq(snapshot.ticks.length, 4);
+        assertEq(snapshot.ticks[0].index, -204_750);
+        assertEq(snapshot.ticks[3].index, -194_560);
+    }
+
+    function testGetInitializedTicksRange() public {
+        _setUpPool();
+
+        TickBitmapHelper.TickLiquidity[] memory ticks =
+            helper.getInitializedTicks(poolId, 10, -80, -78);
+
+        assertEq(ticks.length, 1);
+        assertEq(ticks[0].index, -204_750);
+        assertEq(ticks[0].liquidityGross, 10);
+    }
+
+    function testGetInitializedTicksRevertsOnInvalidRange() public {
+        vm.expectRevert(bytes("invalid range"));
+        helper.getInitializedTicks(poolId, 10, 2, 1);
+    }
 }
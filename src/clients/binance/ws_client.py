@@ -0,0 +1,196 @@
+import time
+import base64
+import asyncio
+import itertools
+import orjson
+import websockets
+from websockets.exceptions import ConnectionClosed, WebSocketException
+from cryptography.hazmat.primitives.serialization import load_pem_private_key
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+from config import (
+    BINANCE_URI_WS_API,
+    BINANCE_API_KEY_ED25519,
+    BINANCE_ED25519_PRIVATE_KEY_PATH,
+)
+
+
+class BinanceWsError(Exception):
+    """Error response of the WebSocket API"""
+
+    def __init__(self, status: int, code: int | None, msg: str | None):
+        super().__init__(f"{status} {code}: {msg}")
+        self.status = status
+        self.code = code
+        self.msg = msg
+
+
+def load_private_key(path: str) -> Ed25519PrivateKey:
+    """Reads the unencrypted PEM Ed25519 key registered for the API key"""
+    with open(path, "rb") as f:
+        key = load_pem_private_key(f.read(), password=None)
+    if not isinstance(key, Ed25519PrivateKey):
+        raise ValueError(f"Not an Ed25519 private key: {path}")
+    return key
+
+
+class BinanceWsClient:
+    """
+    CEX client over the WebSocket API, drop-in for BinanceClient. One
+    persistent session authenticated via session.logon (Ed25519), so later
+    requests need no signature; responses are matched to requests by id.
+    """
+
+    __slots__ = (
+        "uri",
+        "api_key",
+        "private_key",
+        "timeout",
+        "_ws",
+        "_reader",
+        "_pending",
+        "_ids",
+        "_connect_lock",
+    )
+
+    def __init__(
+        self,
+        uri: str = BINANCE_URI_WS_API,
+        api_key: str | None = BINANCE_API_KEY_ED25519,
+        private_key: Ed25519PrivateKey | None = None,
+        timeout: float = 10.0,
+    ):
+        self.uri = uri
+        self.api_key = api_key
+        if private_key is None:
+            private_key = load_private_key(BINANCE_ED25519_PRIVATE_KEY_PATH)
+        self.private_key = private_key
+        self.timeout = timeout
+        self._ws = None
+        self._reader: asyncio.Task | None = None
+        # request id -> future of the response
+        self._pending: dict[int, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+        self._connect_lock = asyncio.Lock()
+
+    async def connect(self) -> None:
+        """Opens the connection and logs the session on, no-op if open"""
+        async with self._connect_lock:
+            if self._ws is not None:
+                return
+            ws = await websockets.connect(self.uri, max_queue=None)
+            self._reader = asyncio.create_task(self._read_loop(ws))
+            params = {"apiKey": self.api_key, "timestamp": int(time.time() * 1000)}
+            params["signature"] = self._sign(params)
+            try:
+                await self._send(ws, "session.logon", params)
+            except BaseException:
+                await self._drop(ws)
+                raise
+            # published only once logged on, requests meanwhile wait on the lock
+            self._ws = ws
+
+    async def keep_connection_hot(
+        self, ping_interval: float = 10, retry_delay: float = 5
+    ) -> None:
+        """Keeps the session logged on, reconnects if it dropped"""
+        while True:
+            try:
+                await self.request("ping", {})
+                await asyncio.sleep(ping_interval)
+            except (
+                OSError,
+                ConnectionError,
+                asyncio.TimeoutError,
+                WebSocketException,
+                BinanceWsError,
+            ):
+                # next ping opens and logs on a fresh session
+                if self._ws is not None:
+                    await self._drop(self._ws)
+                await asyncio.sleep(retry_delay)
+
+    async def close(self) -> None:
+        """Closes connection"""
+        if self._ws is not None:
+            await self._drop(self._ws)
+
+    async def get_balances(self) -> tuple:
+        """Returns balances for USDC and ETH"""
+        account_data = await self.request(
+            "account.status", {"timestamp": int(time.time() * 1000)}
+        )
+
+        bal_map = {b["asset"]: b["free"] for b in account_data.get("balances", [])}
+
+        eth_str = bal_map.get("ETH")
+        usdc_str = bal_map.get("USDC")
+
+        return float(eth_str), float(usdc_str)
+
+    async def execute_trade(self, side: str, qty: float) -> dict:
+        """Returns the order with fills, same shape as the REST response"""
+        params = {
+            "symbol": "ETHUSDC",
+            "side": side.upper(),
+            "type": "MARKET",
+            "quantity": str(qty),
+            "newOrderRespType": "FULL",
+            "timestamp": int(time.time() * 1000),
+        }
+        return await self.request("order.place", params)
+
+    async def request(self, method: str, params: dict) -> dict:
+        """Sends a request on the logged on session, returns its result"""
+        if self._ws is None:
+            await self.connect()
+        ws = self._ws
+        if ws is None:
+            raise ConnectionError("WebSocket API closed")
+        return await self._send(ws, method, params)
+
+    async def _send(self, ws, method: str, params: dict) -> dict:
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            await ws.send(
+                orjson.dumps({"id": request_id, "method": method, "params": params})
+            )
+            response = await asyncio.wait_for(future, self.timeout)
+        finally:
+            self._pending.pop(request_id, None)
+        if response.get("status") != 200:
+            error = response.get("error") or {}
+            raise BinanceWsError(
+                response.get("status"), error.get("code"), error.get("msg")
+            )
+        return response["result"]
+
+    async def _read_loop(self, ws) -> None:
+        """Resolves pending requests, fails them when the connection drops"""
+        try:
+            async for raw_msg in ws:
+                response = orjson.loads(raw_msg)
+                future = self._pending.get(response.get("id"))
+                if future is not None and not future.done():
+                    future.set_result(response)
+        except ConnectionClosed:
+            pass
+        finally:
+            if self._ws is ws:
+                self._ws = None
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("WebSocket API closed"))
+
+    async def _drop(self, ws) -> None:
+        if self._ws is ws:
+            self._ws = None
+        await ws.close()
+        if self._reader is not None:
+            await self._reader
+
+    def _sign(self, params: dict) -> str:
+        """Ed25519 over the alphabetically sorted key=value payload, base64"""
+        payload = "&".join(f"{k}={v}" for k, v in sorted(params.items()))
+        return base64.b64encode(self.private_key.sign(payload.encode())).decode()
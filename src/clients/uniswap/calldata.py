@@ -0,0 +1,130 @@
+import threading
+from web3.contract.contract import Contract
+from eth_abi import encode
+from eth_abi.packed import encode_packed
+
+from config import (
+    UNICHAIN_ETH_NATIVE,
+    UNICHAIN_USDC,
+)
+
+UINT128_MAX = 2**128 - 1
+# distinct uint128 markers used to locate the variable words in the template
+_AMOUNT_SENTINEL = int.from_bytes(b"\xa1" * 16, "big")
+_LIMIT_SENTINEL = int.from_bytes(b"\xb2" * 16, "big")
+
+
+def encode_execute_calldata(
+    zero_for_one: bool,
+    amount_token0: int,
+    amount_limit: int,
+    universal_router_contract: Contract,
+) -> str:
+    """
+    Reference encoding of Universal Router execute() for a single v4 swap.
+    zero_for_one: False for BUY (exact out), True for SELL (exact in)
+    """
+    swap_exact_params = encode(
+        [
+            "address",
+            "address",
+            "uint24",
+            "int24",
+            "address",
+            "bool",
+            "uint128",
+            "uint128",
+            "bytes",
+        ],
+        [
+            UNICHAIN_ETH_NATIVE,  # currency0
+            UNICHAIN_USDC,  # currency1
+            500,  # fee (uint24)
+            10,  # tickSpacing (int24)
+            "0x0000000000000000000000000000000000000000",  # poolHooks
+            zero_for_one,  # zeroForOne
+            amount_token0,  # amountIn / amountOut
+            amount_limit,  # amountOutMinimum / amountInMaximum
+            b"",  # hookData
+        ],
+    )
+    settle_all_params = encode(
+        ["address", "uint128"],
+        [
+            (UNICHAIN_ETH_NATIVE if zero_for_one else UNICHAIN_USDC),
+            UINT128_MAX,
+        ],
+    )
+    take_all_params = encode(
+        ["address", "uint128"],
+        [
+            (UNICHAIN_USDC if zero_for_one else UNICHAIN_ETH_NATIVE),
+            0,
+        ],
+    )
+    # 0x06=SWAP_EXACT_IN_SINGLE, 0x08=SWAP_EXACT_OUT_SINGLE
+    # 0x0C=SETTLE_ALL
+    # 0x0F=TAKE_ALL
+    actions = encode_packed(
+        ["uint8", "uint8", "uint8"], [0x06 if zero_for_one else 0x08, 0x0C, 0x0F]
+    )
+    inputs = [
+        encode(
+            ["bytes", "bytes[]"],
+            [actions, [swap_exact_params, settle_all_params, take_all_params]],
+        )
+    ]
+    commands = encode_packed(["uint8"], [0x10])
+    return universal_router_contract.encode_abi("execute", args=[commands, inputs])
+
+
+def _find_word(calldata: bytes, value: int) -> int:
+    """Returns offset of the unique 32-byte word holding value"""
+    word = value.to_bytes(32, "big")
+    offset = calldata.find(word)
+    if offset < 0 or calldata.find(word, offset + 1) >= 0:
+        raise ValueError("Calldata template sentinel not unique")
+    return offset
+
+
+class ExecuteCalldataTemplate:
+    """
+    execute() calldata for one swap direction, encoded once with sentinel
+    amount/limit. build() patches only these two words in a preallocated
+    buffer, all other bytes are constant for our pool.
+    """
+
+    __slots__ = ("zero_for_one", "_buffer", "_amount_slice", "_limit_slice", "_lock")
+
+    def __init__(self, zero_for_one: bool, universal_router_contract: Contract):
+        self.zero_for_one = zero_for_one
+        calldata = bytes.fromhex(
+            encode_execute_calldata(
+                zero_for_one,
+                _AMOUNT_SENTINEL,
+                _LIMIT_SENTINEL,
+                universal_router_contract,
+            )[2:]
+        )
+        amount_offset = _find_word(calldata, _AMOUNT_SENTINEL)
+        limit_offset = _find_word(calldata, _LIMIT_SENTINEL)
+        self._amount_slice = slice(amount_offset, amount_offset + 32)
+        self._limit_slice = slice(limit_offset, limit_offset + 32)
+        self._buffer = bytearray(calldata)
+        # build() runs on the event loop and on the presign thread
+        self._lock = threading.Lock()
+
+    def build(self, amount_token0: int, amount_limit: int) -> str:
+        """Returns '0x' calldata hex, equal to encode_execute_calldata"""
+        if (
+            not 0 <= amount_token0 <= UINT128_MAX
+            or not 0 <= amount_limit <= UINT128_MAX
+        ):
+            raise ValueError(
+                f"uint128 out of range: amount={amount_token0}, limit={amount_limit}"
+            )
+        with self._lock:
+            buf = self._buffer
+            buf[self._amount_slice] = amount_token0.to_bytes(32, "big")
+            buf[self._limit_slice] = amount_limit.to_bytes(32, "big")
+            return "0x" + buf.hex()
@@ -1,22 +1,20 @@
 import asyncio
-from web3.contract.contract import Contract
 from web3.types import TxReceipt
-from web3.exceptions import Web3RPCError
 from eth_account.types import TransactionDictType
-from eth_abi import encode
-from eth_abi.packed import encode_packed
 
 
 from infra.web3 import connect_web3, connect_web3_async
+from clients.uniswap.presign import PresignedTxCache, TradeParams
+from clients.uniswap.nonce import NonceManager
+from clients.uniswap.calldata import ExecuteCalldataTemplate
+from engine.sizing import MAX_LOT_QTY
 from config import (
     ERC20_ABI,
-    TOKEN0_INPUT,
     UNICHAIN_CHAINID,
     TOKEN0_DECIMALS,
     PRIVATE_KEY,
     WALLET_ADDRESS,
     UNICHAIN_UNIVERSAL_ROUTER_ADDRESS,
-    UNICHAIN_ETH_NATIVE,
     UNICHAIN_USDC,
     UNICHAIN_RPC_URL,
     ALCHEMY_API_KEY,
@@ -31,9 +29,12 @@ class UniswapClient:
     __slots__ = (
         "w3_seq",
         "w3_alc",
-        "nonce",
+        "nonces",
         "account",
         "universal_router_contract",
+        "calldata_templates",
+        "tx_cache",
+        "trade_params",
     )
 
     def __init__(self):
@@ -41,12 +42,54 @@ class UniswapClient:
         self.w3_seq = connect_web3_async(UNICHAIN_SEQUENCER_RPC_URL)
         # nonce, account
         self.w3_alc = connect_web3(UNICHAIN_RPC_URL + ALCHEMY_API_KEY)
-        self.nonce = self.w3_alc.eth.get_transaction_count(WALLET_ADDRESS, "pending")
+        self.nonces = NonceManager(self.fetch_nonce())
         self.account = self.w3_alc.eth.account
         # router contract
         self.universal_router_contract = self.w3_alc.eth.contract(
             address=UNICHAIN_UNIVERSAL_ROUTER_ADDRESS, abi=UNIVERSAL_ROUTER_ABI
         )
+        # execute() calldata per direction, only amount/limit words are patched
+        self.calldata_templates = {
+            zero_for_one: ExecuteCalldataTemplate(
+                zero_for_one, self.universal_router_contract
+            )
+            for zero_for_one in (True, False)
+        }
+        # pre-signed tx per direction for the max lot at the limit price of
+        # the last trade, refreshed on nonce changes. Only trades capped at
+        # the max size within that price range hit, smaller sizes sign inline
+        self.tx_cache = PresignedTxCache(self._build_and_sign)
+        self.trade_params: dict[bool, TradeParams] = {True: None, False: None}
+
+    @property
+    def nonce(self) -> int:
+        """Nonce of the next tx"""
+        return self.nonces.next_nonce
+
+    def fetch_nonce(self) -> int:
+        """Account nonce incl. pending txs via RPC"""
+        return self.w3_alc.eth.get_transaction_count(WALLET_ADDRESS, "pending")
+
+    def reconcile_nonce(self, account_nonce: int) -> bool:
+        """Resets the local nonce to account_nonce, True if it differed"""
+        changed = self.nonces.reconcile(account_nonce)
+        self._presign()
+        return changed
+
+    def set_trade_params(
+        self, zero_for_one: bool, amount_token0: float, amount_limit: int | None
+    ) -> None:
+        """
+        Sets trade size + min-out/max-in limit pre-signed for one direction,
+        re-signs. amount_limit None stops pre-signing that direction.
+        """
+        self.trade_params[zero_for_one] = (
+            None if amount_limit is None else (amount_token0, amount_limit)
+        )
+        self._presign()
+
+    def _presign(self) -> None:
+        self.tx_cache.prepare(self.nonces.next_nonce, self.trade_params)
 
     async def keep_connection_hot(self, ping_interval: int = 30) -> None:
         """Sends HTTP request to keep TCP/TLS connection alive"""
@@ -54,13 +97,69 @@ class UniswapClient:
             # TODO: implement
             await asyncio.sleep(ping_interval)
 
-    async def send_bundle(self, zero_for_one: bool, amount_token0: float) -> str:
-        """Builds and broadcasts tx"""
+    def close(self) -> None:
+        """Stops the presign thread"""
+        self.tx_cache.close()
+
+    def sign_tx(
+        self,
+        zero_for_one: bool,
+        amount_token0: float,
+        amount_limit: int | None = None,
+        nonce: int | None = None,
+        expected_amount1: int | None = None,
+    ) -> str:
+        """
+        Returns raw tx hex, pre-signed if cached, else builds and signs inline.
+        nonce: acquired from self.nonces, None = next nonce (not reserved)
+        expected_amount1: simulated USDC out (sell) / in (buy). A pre-signed
+        limit between amount_limit and it is at least as strict and still
+        fills, so the pre-signed tx is used.
+        """
+        if nonce is None:
+            nonce = self.nonces.next_nonce
+        raw_tx = None
+        if amount_limit is not None:
+            bound = amount_limit if expected_amount1 is None else expected_amount1
+            raw_tx = self.tx_cache.get(
+                zero_for_one,
+                nonce,
+                amount_token0,
+                min(amount_limit, bound),
+                max(amount_limit, bound),
+            )
+        if raw_tx is None:
+            raw_tx = self._build_and_sign(
+                zero_for_one, nonce, amount_token0, amount_limit
+            )
+        # sized trades rarely repeat a qty, the capped lot does: pre-sign it
+        # on the nonce of the next tx at this trade's limit price
+        max_lot_limit = None
+        if amount_limit is not None:
+            max_lot_limit = round(amount_limit * MAX_LOT_QTY / amount_token0)
+        self.set_trade_params(zero_for_one, MAX_LOT_QTY, max_lot_limit)
+        return raw_tx
+
+    def _build_and_sign(
+        self,
+        zero_for_one: bool,
+        nonce: int,
+        amount_token0: float,
+        amount_limit: int | None,
+    ) -> str:
+        """Builds and signs tx, also runs on the presign thread"""
         tx = self.build_tx(
-            zero_for_one, self.universal_router_contract, self.nonce, amount_token0
+            zero_for_one,
+            self.calldata_templates[zero_for_one],
+            nonce,
+            amount_token0,
+            amount_limit,
         )
         signed_tx = self.account.sign_transaction(tx, PRIVATE_KEY)  # bottleneck: 4-8 ms
-        raw_tx = "0x" + signed_tx.raw_transaction.hex()
+        return "0x" + signed_tx.raw_transaction.hex()
+
+    async def post_bundle(self, raw_tx: str) -> str:
+        """Broadcasts signed tx via eth_sendBundle, returns bundle hash"""
         bundle_params = {"txs": [raw_tx]}  # default expire is 10 blocks
         bundle_response = await self.w3_seq.manager.coro_request(
             "eth_sendBundle", [bundle_params]
@@ -85,66 +184,20 @@ class UniswapClient:
     @staticmethod
     def build_tx(
         zero_for_one: bool,
-        universal_router_contract: Contract,
+        calldata_template: ExecuteCalldataTemplate,
         nonce: int,
         amount_token0: float,
+        amount_limit: int | None = None,
     ) -> TransactionDictType:
-        """zero_for_one: False for BUY, True for SELL"""
-        amount_token0 = int(amount_token0 * 10**TOKEN0_DECIMALS)
-        swap_exact_params = encode(
-            [
-                "address",
-                "address",
-                "uint24",
-                "int24",
-                "address",
-                "bool",
-                "uint128",
-                "uint128",
-                "bytes",
-            ],
-            [
-                UNICHAIN_ETH_NATIVE,  # currency0
-                UNICHAIN_USDC,  # currency1
-                500,  # fee (uint24)
-                10,  # tickSpacing (int24)
-                "0x0000000000000000000000000000000000000000",  # poolHooks
-                zero_for_one,  # zeroForOne
-                amount_token0,  # amountIn / amountOut
-                0 if zero_for_one else 2**128 - 1,  # amountOutMinimum / amountInMaximum
-                b"",  # hookData
-            ],
-        )
-        settle_all_params = encode(
-            ["address", "uint128"],
-            [
-                (UNICHAIN_ETH_NATIVE if zero_for_one else UNICHAIN_USDC),
-                2**128 - 1,
-            ],
-        )
-        take_all_params = encode(
-            ["address", "uint128"],
-            [
-                (UNICHAIN_USDC if zero_for_one else UNICHAIN_ETH_NATIVE),
-                0,
-            ],
-        )
-        # 0x06=SWAP_EXACT_IN_SINGLE, 0x08=SWAP_EXACT_OUT_SINGLE
-        # 0x0C=SETTLE_ALL
-        # 0x0F=TAKE_ALL
-        actions = encode_packed(
-            ["uint8", "uint8", "uint8"], [0x06 if zero_for_one else 0x08, 0x0C, 0x0F]
-        )
-        inputs = [
-            encode(
-                ["bytes", "bytes[]"],
-                [actions, [swap_exact_params, settle_all_params, take_all_params]],
-            )
-        ]
-        commands = encode_packed(["uint8"], [0x10])
-        calldata = universal_router_contract.encode_abi(
-            "execute", args=[commands, inputs]
-        )
+        """
+        zero_for_one: False for BUY, True for SELL
+        amount_limit: amountOutMinimum (SELL) / amountInMaximum (BUY), None = no limit
+        """
+        # round, not truncate: e.g. 0.0003 * 1e18 = 299999999999999.97
+        amount_token0 = round(amount_token0 * 10**TOKEN0_DECIMALS)
+        if amount_limit is None:
+            amount_limit = 0 if zero_for_one else 2**128 - 1
+        calldata = calldata_template.build(amount_token0, amount_limit)
         return {
             "from": WALLET_ADDRESS,
             "to": UNICHAIN_UNIVERSAL_ROUTER_ADDRESS,
@@ -0,0 +1,72 @@
+class NonceManager:
+    """
+    Hands out sequential nonces locally so several bundles can be in flight.
+    Inclusion (successful or reverted) consumes a nonce. An expired bundle
+    leaves a gap that later nonces can't be included across, so new nonces
+    are withheld until all in-flight bundles are resolved and the account
+    nonce was re-read via reconcile().
+    """
+
+    __slots__ = ("next_nonce", "_in_flight", "_dirty")
+
+    def __init__(self, nonce: int):
+        self.next_nonce = nonce
+        self._in_flight: set[int] = set()
+        self._dirty = False
+
+    @property
+    def in_flight(self) -> int:
+        """Number of handed out, unresolved nonces"""
+        return len(self._in_flight)
+
+    @property
+    def needs_reconcile(self) -> bool:
+        """True once an expiry happened and nothing is in flight anymore"""
+        return self._dirty and not self._in_flight
+
+    @property
+    def available(self) -> bool:
+        """False while a reconciliation is pending"""
+        return not self._dirty
+
+    def acquire(self) -> int | None:
+        """Returns the next nonce, None while a reconciliation is pending"""
+        if self._dirty:
+            return None
+        nonce = self.next_nonce
+        self.next_nonce += 1
+        self._in_flight.add(nonce)
+        return nonce
+
+    def included(self, nonce: int) -> None:
+        """Tx with nonce landed on chain, reverted or not"""
+        self._in_flight.discard(nonce)
+
+    def expired(self, nonce: int) -> None:
+        """Tx with nonce was not seen in time"""
+        if nonce in self._in_flight:
+            self._in_flight.remove(nonce)
+            self._dirty = True
+
+    def release(self, nonce: int) -> None:
+        """
+        Tx with nonce was never sent: handed out again if it is the last
+        nonce, else it leaves a gap like an expiry
+        """
+        if nonce not in self._in_flight:
+            return
+        if nonce == self.next_nonce - 1:
+            self._in_flight.remove(nonce)
+            self.next_nonce = nonce
+        else:
+            self.expired(nonce)
+
+    def reconcile(self, account_nonce: int) -> bool:
+        """
+        Sets the next nonce from get_transaction_count, returns True if it
+        differed from the local one
+        """
+        changed = account_nonce != self.next_nonce
+        self.next_nonce = account_nonce
+        self._dirty = False
+        return changed
@@ -0,0 +1,81 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+
+# (zero_for_one, nonce, amount_token0, amount_limit) -> raw tx hex
+SignFn = Callable[[bool, int, float, int], str]
+# (amount_token0, amount_limit) to pre-sign for a direction, None = nothing
+TradeParams = tuple[float, int] | None
+# (nonce, amount_token0, amount_limit)
+CacheKey = tuple[int, float, int]
+
+
+class PresignedTxCache:
+    """
+    Holds one pre-signed tx per swap direction, signed in a background thread.
+    An entry is only valid for the exact (nonce, amount) it was signed for and
+    a caller-given range of limits, so nonce increments or new sizes
+    invalidate it implicitly.
+    """
+
+    __slots__ = ("_sign_fn", "_pool", "_entries")
+
+    def __init__(self, sign_fn: SignFn):
+        self._sign_fn = sign_fn
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="presign")
+        self._entries: dict[bool, tuple[CacheKey, Future]] = {}
+
+    def prepare(self, nonce: int, params: dict[bool, TradeParams]) -> None:
+        """(Re-)signs each direction with params in the background if changed"""
+        for zero_for_one in (True, False):
+            trade = params.get(zero_for_one)
+            entry = self._entries.get(zero_for_one)
+            if trade is None:
+                if entry is not None:
+                    entry[1].cancel()
+                    del self._entries[zero_for_one]
+                continue
+            key = (nonce, *trade)
+            if entry is not None:
+                if entry[0] == key:
+                    continue
+                entry[1].cancel()
+            future = self._pool.submit(self._sign_fn, zero_for_one, *key)
+            self._entries[zero_for_one] = (key, future)
+
+    def get(
+        self,
+        zero_for_one: bool,
+        nonce: int,
+        amount_token0: float,
+        limit_lo: int,
+        limit_hi: int,
+    ) -> str | None:
+        """
+        Returns the ready raw tx for nonce and amount_token0 if it was signed
+        with a limit within [limit_lo, limit_hi], else None
+        """
+        entry = self._entries.get(zero_for_one)
+        if entry is None:
+            return None
+        key_nonce, key_amount, key_limit = entry[0]
+        if (
+            key_nonce != nonce
+            or key_amount != amount_token0
+            or not limit_lo <= key_limit <= limit_hi
+        ):
+            return None
+        future = entry[1]
+        if not future.done() or future.cancelled() or future.exception() is not None:
+            return None
+        return future.result()
+
+    def invalidate(self) -> None:
+        """Drops all entries"""
+        for _key, future in self._entries.values():
+            future.cancel()
+        self._entries.clear()
+
+    def close(self) -> None:
+        """Stops the signing thread"""
+        self.invalidate()
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -1,68 +1,232 @@
 import asyncio
+from dataclasses import dataclass
 from logging import Logger
 from web3 import AsyncWeb3
+from web3.exceptions import BadFunctionCallOutput, ContractLogicError
 
 from infra.web3 import connect_web3_async
+from engine.tick_math import sqrt_price_table, MIN_TICK, MAX_TICK
+from state.pool_cache import load_checkpoint
+from state.tick_bitmap import word_ticks
 from config import (
     UNISWAP_POOL_ID,
+    UNICHAIN_POOL_MANAGER,
     TICK_BITMAP_HELPER_ADDRESS,
     TICK_BITMAP_HELPER_ABI,
     UNICHAIN_RPC_URL,
     ALCHEMY_API_KEY,
+    POOL_CACHE_PATH,
+    POOL_CACHE_MAX_BLOCKS,
+    SNAPSHOT_WORD_RADIUS,
+    SNAPSHOT_CHUNK_WORDS,
 )
 
+TICK_SPACING = 10
+# getPoolSnapshot word radius covering the full tick range
+FULL_RANGE_RADIUS = 2**16 - 1
+# bitmap words of the valid tick range
+MIN_WORD = (MIN_TICK // TICK_SPACING) >> 8
+MAX_WORD = (MAX_TICK // TICK_SPACING) >> 8
 
-async def snapshot_once(feed, logger: Logger) -> None:
-    """Initialize pool state."""
+
+@dataclass(slots=True)
+class PoolSnapshot:
+    """TickBitmapHelper.getPoolSnapshot result"""
+
+    block_number: int
+    sqrt_price_x96: int
+    tick: int
+    liquidity: int
+    # bitmap word window the ticks were read from
+    start_word: int
+    end_word: int
+    # (tick, liquidity_gross, liquidity_net)
+    ticks: list[tuple[int, int, int]]
+
+
+async def snapshot_once(
+    feed,
+    logger: Logger,
+    word_radius: int = SNAPSHOT_WORD_RADIUS,
+    chunk_words: int = SNAPSHOT_CHUNK_WORDS,
+) -> None:
+    """
+    Initialize pool state. With a word_radius, the ticks near the price are
+    applied first and the remaining words are filled in the background.
+    """
     w3 = connect_web3_async(UNICHAIN_RPC_URL + ALCHEMY_API_KEY)
-    ticks_raw, snapshot_block = await initialize_uniswap_pool(w3)
-    feed.create_snapshot(ticks_raw, snapshot_block)
+    snapshot_block = await wait_for_snapshot_block(feed, w3)
+    try:
+        snapshot = await fetch_pool_snapshot(w3, snapshot_block, word_radius)
+    except (ContractLogicError, BadFunctionCallOutput):
+        # helper deployed without getPoolSnapshot
+        logger.warning("getPoolSnapshot unavailable, using getTicks snapshot")
+        ticks_raw = await initialize_uniswap_pool(w3, snapshot_block)
+        feed.create_snapshot(ticks_raw, snapshot_block)
+    else:
+        complete = snapshot.start_word <= MIN_WORD and snapshot.end_word >= MAX_WORD
+        feed.create_snapshot(
+            snapshot.ticks,
+            snapshot_block,
+            (snapshot.sqrt_price_x96, snapshot.liquidity, snapshot.tick),
+            complete=complete,
+        )
+        if not complete:
+            sqrt_price_table.prefill(feed.pool.ticks)
+            logger.warning(
+                "Snapshot of words %s-%s applied at block %s, filling the rest",
+                snapshot.start_word,
+                snapshot.end_word,
+                snapshot_block,
+            )
+            await fill_outer_ticks(feed, w3, snapshot, logger, chunk_words)
+    sqrt_price_table.prefill(feed.pool.ticks)
 
     logger.warning("Initial snapshot applied at block %s", snapshot_block)
 
 
-async def initialize_uniswap_pool(w3: AsyncWeb3):
+def outer_chunks(
+    start_word: int, end_word: int, chunk_words: int
+) -> list[tuple[int, int]]:
+    """Word ranges outside [start_word, end_word], nearest to it first"""
+    below = []
+    for end in range(start_word - 1, MIN_WORD - 1, -chunk_words):
+        below.append((max(end - chunk_words + 1, MIN_WORD), end))
+    above = []
+    for start in range(end_word + 1, MAX_WORD + 1, chunk_words):
+        above.append((start, min(start + chunk_words - 1, MAX_WORD)))
+    chunks = []
+    for i in range(max(len(below), len(above))):
+        chunks += below[i : i + 1] + above[i : i + 1]
+    return chunks
+
+
+async def fill_outer_ticks(
+    feed, w3: AsyncWeb3, snapshot: PoolSnapshot, logger: Logger, chunk_words: int
+) -> None:
     """
-    Initialize Uniswap pool state by fetching data from the blockchain.
-    Notice: no pending flag (flashblocks) is used -> returns flashblock index 0 state.
+    Fetches the words outside the snapshot window concurrently and merges
+    each chunk as it arrives. All chunks are read at the snapshot block, so
+    adding them on top of the events applied since keeps the order intact.
     """
-    await asyncio.sleep(5)  # wait for feed warmup
+    generation = feed.snapshot_count
+    tasks = [
+        asyncio.create_task(
+            fetch_initialized_ticks(w3, start_word, end_word, snapshot.block_number)
+        )
+        for start_word, end_word in outer_chunks(
+            snapshot.start_word, snapshot.end_word, chunk_words
+        )
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            if not feed.merge_ticks(await next_done, generation):
+                # resynced meanwhile, its snapshot fills its own ticks
+                return
+    except Exception:
+        logger.exception("Filling outer ticks failed")
+        feed.request_resync()
+        return
+    finally:
+        for task in tasks:
+            task.cancel()
+    feed.ticks_complete = True
 
-    pool_id_bytes = bytes.fromhex(UNISWAP_POOL_ID.removeprefix("0x"))
 
+async def fetch_initialized_ticks(
+    w3: AsyncWeb3, start_word: int, end_word: int, block_number: int
+) -> list[tuple[int, int, int]]:
+    """(tick, liquidity_gross, liquidity_net) of the words [start_word, end_word]"""
     tick_bitmap_helper = w3.eth.contract(
         address=TICK_BITMAP_HELPER_ADDRESS, abi=TICK_BITMAP_HELPER_ABI
     )
+    ticks = await tick_bitmap_helper.functions.getInitializedTicks(
+        bytes.fromhex(UNISWAP_POOL_ID.removeprefix("0x")),
+        TICK_SPACING,
+        start_word,
+        end_word,
+    ).call(block_identifier=block_number)
+    return [tuple(tick) for tick in ticks]
+
+
+async def wait_for_snapshot_block(feed, w3: AsyncWeb3) -> int:
+    """
+    Latest block once the feed is connected and the node has caught up with
+    it, so all events after it are in the feed's buffer
+    """
+    while feed.last_block is None:
+        await asyncio.sleep(0.05)
+    live_block = feed.live_block()
+    while (block_number := await w3.eth.block_number) < live_block:
+        await asyncio.sleep(0.1)
+    return block_number
+
+
+async def fetch_pool_snapshot(
+    w3: AsyncWeb3, snapshot_block: int, word_radius: int = 0
+) -> PoolSnapshot:
+    """
+    slot0, liquidity and initialized ticks in a single eth_call,
+    word_radius limits the ticks to words around the current tick (0 = all)
+    """
+    tick_bitmap_helper = w3.eth.contract(
+        address=TICK_BITMAP_HELPER_ADDRESS, abi=TICK_BITMAP_HELPER_ABI
+    )
+    raw = await tick_bitmap_helper.functions.getPoolSnapshot(
+        bytes.fromhex(UNISWAP_POOL_ID.removeprefix("0x")),
+        TICK_SPACING,
+        word_radius or FULL_RANGE_RADIUS,
+    ).call(block_identifier=snapshot_block)
+    *header, ticks = raw
+    return PoolSnapshot(*header, [tuple(tick) for tick in ticks])
+
+
+async def warm_start(feed, logger: Logger, path: str | None = POOL_CACHE_PATH) -> None:
+    """
+    Restores the pool state cached at path and catches up from its block via
+    eth_getLogs, snapshot_once if there is no usable cache.
+    """
+    checkpoint = load_checkpoint(path) if path else None
+    if checkpoint is None:
+        await snapshot_once(feed, logger)
+        return
+
+    # the live feed position bounds the catch-up range
+    while feed.last_block is None:
+        await asyncio.sleep(0.05)
+    feed.restore(checkpoint)
+    logger.warning(
+        "Pool state restored from %s, catching up from block %s",
+        path,
+        checkpoint.from_block,
+    )
+    await feed.catch_up(
+        checkpoint.from_block, checkpoint.applied_txs, POOL_CACHE_MAX_BLOCKS
+    )
 
-    def _tick_to_word(tick: int) -> int:
-        compressed = tick // tick_spacing
-        if tick < 0 and tick % tick_spacing != 0:
-            compressed -= 1
-        return compressed >> 8
 
-    # get block number for snapshot
-    snapshot_block = await w3.eth.block_number
+async def initialize_uniswap_pool(w3: AsyncWeb3, snapshot_block: int):
+    """
+    Initialize Uniswap pool state by fetching data from the blockchain.
+    Notice: no pending flag (flashblocks) is used -> returns flashblock index 0 state.
+    """
+    pool_id_bytes = bytes.fromhex(UNISWAP_POOL_ID.removeprefix("0x"))
 
-    tick_spacing = 10
-    min_word = _tick_to_word(-887272)
-    max_word = _tick_to_word(887272)
+    tick_bitmap_helper = w3.eth.contract(
+        address=TICK_BITMAP_HELPER_ADDRESS, abi=TICK_BITMAP_HELPER_ABI
+    )
 
     # first call: get initialized tick bitmaps
     bitmaps = await tick_bitmap_helper.functions.getTickBitmapsRange(
         pool_id_bytes,
-        min_word,
-        max_word,
+        MIN_WORD,
+        MAX_WORD,
     ).call(block_identifier=snapshot_block)
-    tick_indices: list[int] = []
-    word_pos_indices = list(range(min_word, max_word + 1))
-    for ind, bitmap in zip(word_pos_indices, bitmaps):
-        if bitmap != 0:
-            for i in range(256):
-                bit = 1
-                initialized = (bitmap & (bit << i)) != 0
-                if initialized:
-                    tick_index = (ind * 256 + i) * tick_spacing
-                    tick_indices.append(tick_index)
+    tick_indices = [
+        tick
+        for word_pos, bitmap in enumerate(bitmaps, MIN_WORD)
+        for tick in word_ticks(word_pos, bitmap, TICK_SPACING)
+    ]
 
     # second call: get tick data for initialized ticks
     ticks_raw = await tick_bitmap_helper.functions.getTicks(
@@ -71,4 +235,42 @@ async def initialize_uniswap_pool(w3: AsyncWeb3):
     ).call(block_identifier=snapshot_block)
 
     # ticks_raw : [(index, liquidityGross, liquidityNet, fee0, fee1), ...]
-    return ticks_raw, snapshot_block
+    return ticks_raw
+
+
+def _hex(value) -> str:
+    """0x-prefixed lowercase hex of HexBytes/bytes/str"""
+    if isinstance(value, str):
+        return value.lower()
+    return "0x" + bytes(value).hex()
+
+
+async def fetch_pool_logs(
+    w3: AsyncWeb3, from_block: int, to_block: int
+) -> list[tuple[str, str, list[str]]]:
+    """
+    PoolManager logs of our pool in [from_block, to_block] in chain order,
+    as (tx_hash, data, topics) hex strings. Waits for the node to reach
+    to_block first, it may trail the flashblock feed.
+    """
+    while await w3.eth.block_number < to_block:
+        await asyncio.sleep(0.1)
+
+    logs = await w3.eth.get_logs(
+        {
+            "fromBlock": from_block,
+            "toBlock": to_block,
+            "address": UNICHAIN_POOL_MANAGER,
+            # every PoolManager event of a pool has its id as topic[1]
+            "topics": [None, UNISWAP_POOL_ID],
+        }
+    )
+    logs = sorted(logs, key=lambda log: (log["blockNumber"], log["logIndex"]))
+    return [
+        (
+            _hex(log["transactionHash"]),
+            _hex(log["data"]),
+            [_hex(topic) for topic in log["topics"]],
+        )
+        for log in logs
+    ]
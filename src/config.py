@@ -28,6 +28,7 @@ ALCHEMY_API_KEY = os.getenv("ALCHEMY_API_KEY")
 INFURA_API_KEY = os.getenv("INFURA_API_KEY")
 BINANCE_API_KEY = os.getenv("BINANCE_API_KEY")
 BINANCE_API_KEY_ED25519 = os.getenv("BINANCE_API_KEY_ED25519")
+BINANCE_ED25519_PRIVATE_KEY_PATH = os.getenv("BINANCE_ED25519_PRIVATE_KEY_PATH")
 BINANCE_API_KEY_TESTNET = os.getenv("BINANCE_API_KEY_TESTNET")
 BINANCE_API_SECRET = os.getenv("BINANCE_API_SECRET")
 BINANCE_API_SECRET_TESTNET = os.getenv("BINANCE_API_SECRET_TESTNET")
@@ -37,12 +38,20 @@ PRIVATE_KEY = os.getenv("PRIVATE_KEY")
 PRIVATE_KEY_TESTNET = os.getenv("PRIVATE_KEY_TESTNET")
 TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
+CAPTURE_PATH = os.getenv("CAPTURE_PATH")  # optional raw frame capture
 
 # Unichain (Mainnet)
 UNICHAIN_CHAINID = config["unichain"]["chain_id"]
 UNICHAIN_SEQUENCER_RPC_URL = config["unichain"]["sequencer_rpc_url"]
 UNICHAIN_RPC_URL = config["unichain"]["rpc_url"]
 UNICHAIN_FLASHBLOCKS_WS_URL = config["unichain"]["flashblocks_ws_url"]
+GAP_RECOVERY_MAX_BLOCKS = config["unichain"]["gap_recovery_max_blocks"]
+GAP_RECOVERY_TIMEOUT = config["unichain"]["gap_recovery_timeout"]
+POOL_CACHE_PATH = config["unichain"]["pool_cache_path"]
+POOL_CACHE_INTERVAL = config["unichain"]["pool_cache_interval"]
+POOL_CACHE_MAX_BLOCKS = config["unichain"]["pool_cache_max_blocks"]
+SNAPSHOT_WORD_RADIUS = config["unichain"]["snapshot_word_radius"]
+SNAPSHOT_CHUNK_WORDS = config["unichain"]["snapshot_chunk_words"]
 ## Contract addresses
 UNICHAIN_UNIVERSAL_ROUTER_ADDRESS = validate_eth_address(
     config["unichain"]["uniswap"]["contract_deployments"]["universal_router"]
@@ -65,6 +74,8 @@ UNICHAIN_ETH_NATIVE = validate_eth_address(
 # Binance
 BINANCE_URI_REST = config["binance"]["uri_rest"]
 BINANCE_URI_SBE = config["binance"]["uri_sbe"]
+BINANCE_URI_WS_API = config["binance"]["uri_ws_api"]
+BINANCE_ORDER_ENTRY = config["binance"]["order_entry"]
 
 # Execution
 VERSION = config["execution"]["version"]
@@ -72,10 +83,29 @@ TOKEN0_INPUT = config["execution"]["token0_input"]
 TOKEN0_DECIMALS = config["execution"]["token0_decimals"]
 TOKEN1_DECIMALS = config["execution"]["token1_decimals"]
 BINANCE_FEE = config["execution"]["binance_fee"]
+BINANCE_MIN_QTY = config["execution"]["binance_min_qty"]
+BINANCE_STEP_SIZE = config["execution"]["binance_step_size"]
+BINANCE_MIN_NOTIONAL = config["execution"]["binance_min_notional"]
+MAX_TOKEN0_INPUT = config["execution"]["max_token0_input"]
+GAS_COST = config["execution"]["gas_cost"]
 MIN_EDGE = config["execution"]["min_edge"]
+DETECTOR_MODE = config["execution"]["detector_mode"]
 GAS_RESERVE = config["execution"]["gas_reserve"]
+MAX_IN_FLIGHT = config["execution"]["max_in_flight"]
+EXECUTION_STRATEGY = config["execution"]["strategy"]
 UNISWAP_POOL_ID = config["execution"]["uniswap_pool_id"]
 
+# Monitoring
+LATENCY_ENABLED = config["monitoring"]["latency_enabled"]
+LATENCY_LOG_INTERVAL = config["monitoring"]["latency_log_interval"]
+METRICS_HOST = config["monitoring"]["metrics_host"]
+METRICS_PORT = config["monitoring"]["metrics_port"]
+CSV_FLUSH_ROWS = config["monitoring"]["csv_flush_rows"]
+CSV_FLUSH_INTERVAL = config["monitoring"]["csv_flush_interval"]
+LOG_LEVEL = config["monitoring"]["log_level"]
+QUOTE_LOG_EVERY = config["monitoring"]["quote_log_every"]
+QUOTE_LOG_LEVEL = config["monitoring"]["quote_log_level"]
+
 # ABIs
 UNIVERSAL_ROUTER_ABI = [
     {
@@ -250,6 +280,88 @@ TICK_BITMAP_HELPER_ABI = [
         "stateMutability": "view",
         "type": "function",
     },
+    {
+        "inputs": [
+            {"internalType": "bytes32", "name": "poolId", "type": "bytes32"},
+            {"internalType": "int24", "name": "tickSpacing", "type": "int24"},
+            {"internalType": "uint16", "name": "wordRadius", "type": "uint16"},
+        ],
+        "name": "getPoolSnapshot",
+        "outputs": [
+            {
+                "components": [
+                    {
+                        "internalType": "uint256",
+                        "name": "blockNumber",
+                        "type": "uint256",
+                    },
+                    {
+                        "internalType": "uint160",
+                        "name": "sqrtPriceX96",
+                        "type": "uint160",
+                    },
+                    {"internalType": "int24", "name": "tick", "type": "int24"},
+                    {"internalType": "uint128", "name": "liquidity", "type": "uint128"},
+                    {"internalType": "int16", "name": "startWord", "type": "int16"},
+                    {"internalType": "int16", "name": "endWord", "type": "int16"},
+                    {
+                        "components": [
+                            {"internalType": "int24", "name": "index", "type": "int24"},
+                            {
+                                "internalType": "uint128",
+                                "name": "liquidityGross",
+                                "type": "uint128",
+                            },
+                            {
+                                "internalType": "int128",
+                                "name": "liquidityNet",
+                                "type": "int128",
+                            },
+                        ],
+                        "internalType": "struct TickBitmapHelper.TickLiquidity[]",
+                        "name": "ticks",
+                        "type": "tuple[]",
+                    },
+                ],
+                "internalType": "struct TickBitmapHelper.PoolSnapshot",
+                "name": "snapshot",
+                "type": "tuple",
+            }
+        ],
+        "stateMutability": "view",
+        "type": "function",
+    },
+    {
+        "inputs": [
+            {"internalType": "bytes32", "name": "poolId", "type": "bytes32"},
+            {"internalType": "int24", "name": "tickSpacing", "type": "int24"},
+            {"internalType": "int16", "name": "startWord", "type": "int16"},
+            {"internalType": "int16", "name": "endWord", "type": "int16"},
+        ],
+        "name": "getInitializedTicks",
+        "outputs": [
+            {
+                "components": [
+                    {"internalType": "int24", "name": "index", "type": "int24"},
+                    {
+                        "internalType": "uint128",
+                        "name": "liquidityGross",
+                        "type": "uint128",
+                    },
+                    {
+                        "internalType": "int128",
+                        "name": "liquidityNet",
+                        "type": "int128",
+                    },
+                ],
+                "internalType": "struct TickBitmapHelper.TickLiquidity[]",
+                "name": "ticks",
+                "type": "tuple[]",
+            }
+        ],
+        "stateMutability": "view",
+        "type": "function",
+    },
 ]
 ERC20_ABI = [
     {
@@ -1,14 +1,20 @@
+import asyncio
+from fractions import Fraction
+from functools import lru_cache
 from logging import Logger
 import math
 from state.pool import Pool
 from state.orderbook import OrderBook
 from engine.executor import Executor
+from engine.sizing import TradeSizer
 from infra.monitoring import append_row_to_csv
+from infra.latency import latency
+from infra.log import SampledLogger
 from config import (
     BINANCE_FEE,
+    DETECTOR_MODE,
 )
 
-
 Q96 = 2**96
 UNI_FEE_BPS = 500
 UNI_FEE_DEN = 1_000_000
@@ -17,35 +23,86 @@ DEC0 = 18  # ETH
 DEC1 = 6  # USDC
 SCALE = 10 ** (DEC0 - DEC1)
 
+# target price factors as exact rationals, see _detect_float for derivation
+_B_FEE = Fraction(str(BINANCE_FEE))
+_U_FEE = Fraction(UNI_FEE_BPS, UNI_FEE_DEN)
+SELL_FACTOR = (1 - _B_FEE) * (1 - _U_FEE)
+BUY_FACTOR = (1 + _B_FEE) / (1 - _U_FEE)
+
+
+@lru_cache(maxsize=None)
+def price_factors(price_exp: int) -> tuple[int, int, int]:
+    """
+    (sell_num, buy_num, den) mapping a Binance price mantissa m to the squared
+    target sqrtPriceX96 m * num / den, with a common denominator
+    """
+    scale = Fraction(Q96 * Q96) * Fraction(10) ** price_exp / SCALE
+    sell = scale * SELL_FACTOR
+    buy = scale * BUY_FACTOR
+    den = math.lcm(sell.denominator, buy.denominator)
+    return (
+        sell.numerator * (den // sell.denominator),
+        buy.numerator * (den // buy.denominator),
+        den,
+    )
+
 
 class ArbDetector:
     """Detects arbitrage opportunities and calls execute"""
 
-    __slots__ = ("pool", "orderbook", "executor", "logger")
+    __slots__ = (
+        "pool",
+        "orderbook",
+        "executor",
+        "sizer",
+        "logger",
+        "quote_log",
+        "last_block",
+        "last_flashblock_index",
+        "_quote_handle",
+        "_executed_state",
+        "integer",
+        "_price_exp",
+        "_factors",
+        "_bid_mantissa",
+        "_ask_mantissa",
+        "_sell_val",
+        "_buy_val",
+    )
 
     def __init__(
-        self, pool: Pool, orderbook: OrderBook, executor: Executor, logger: Logger
+        self,
+        pool: Pool,
+        orderbook: OrderBook,
+        executor: Executor,
+        sizer: TradeSizer,
+        logger: Logger,
+        mode: str = DETECTOR_MODE,
     ):
+        if mode not in ("integer", "float"):
+            raise ValueError(f"Unknown detector mode: {mode}")
         self.pool = pool
         self.orderbook = orderbook
         self.executor = executor
+        self.sizer = sizer
         self.logger = logger
-
-    @staticmethod
-    def _calc_amount1_with_fee(L: int, p_t_sqrt_x96: int, u_sqrt_price_x96: int) -> int:
-        # Δy = L * (sqrt(P_t) - sqrt(P_c))
-        dy_eff = L * (p_t_sqrt_x96 - u_sqrt_price_x96) // Q96
-        dy_in = dy_eff * UNI_FEE_DEN // (UNI_FEE_DEN - UNI_FEE_BPS)
-        return dy_in
-
-    @staticmethod
-    def _calc_amount0_with_fee(L: int, p_t_sqrt_x96: int, u_sqrt_price_x96: int) -> int:
-        # Δx = L * (1/sqrt(P_t) - 1/sqrt(P_c))
-        num = L * Q96 * (u_sqrt_price_x96 - p_t_sqrt_x96)
-        denom = u_sqrt_price_x96 * p_t_sqrt_x96
-        dx_eff = num // denom
-        dx_in = dx_eff * UNI_FEE_DEN // (UNI_FEE_DEN - UNI_FEE_BPS)
-        return dx_in
+        # per-flashblock quote line, sampled (monitoring.quote_log_*)
+        self.quote_log = SampledLogger(logger)
+        # flashblock the local pool state corresponds to
+        self.last_block: int | None = None
+        self.last_flashblock_index: int | None = None
+        # pending quote-triggered evaluation, at most one per loop turn
+        self._quote_handle: asyncio.Handle | None = None
+        # (block, index) of the pool state an execution was last triggered on
+        self._executed_state: tuple[int, int] | None = None
+        # integer mode: squared sqrtPriceX96 thresholds of the last quote
+        self.integer = mode == "integer"
+        self._price_exp: int | None = None
+        self._factors = (0, 0, 1)
+        self._bid_mantissa: int | None = None
+        self._ask_mantissa: int | None = None
+        self._sell_val = 0
+        self._buy_val = 0
 
     @staticmethod
     def _price_to_sqrt_x96(p: float) -> int:
@@ -54,12 +111,79 @@ class ArbDetector:
 
     def on_flashblock_done(self, block_number: int, index: int) -> None:
         """Hook to detect arbitrage opportunities"""
+        if latency.enabled:
+            latency.record("detect")
+        self.last_block = block_number
+        self.last_flashblock_index = index
+        # this evaluation already sees the newest quote
+        if self._quote_handle is not None:
+            self._quote_handle.cancel()
+            self._quote_handle = None
+        self._detect(block_number, index, log_quotes=True)
+
+    def on_sync_lost(self) -> None:
+        """
+        Hook for feed resyncs/gap recoveries: the pool state is stale until
+        the next flashblock, so quote changes aren't evaluated until then
+        """
+        self.last_block = None
+        self.last_flashblock_index = None
+        if self._quote_handle is not None:
+            self._quote_handle.cancel()
+            self._quote_handle = None
+
+    def on_quote_change(self) -> None:
+        """
+        Hook for Binance bid/ask changes. Bursts within one event-loop turn
+        are coalesced into a single evaluation against the latest pool state.
+        """
+        # last_block is None until the first flashblock and after a lost sync
+        if self._quote_handle is None and self.last_block is not None:
+            self._quote_handle = asyncio.get_running_loop().call_soon(
+                self._on_quote_change
+            )
+
+    def _on_quote_change(self) -> None:
+        self._quote_handle = None
+        if self.last_block is None:
+            return
+        if latency.enabled:
+            latency.record("detect")
+        self._detect(self.last_block, self.last_flashblock_index, log_quotes=False)
+
+    def _detect(self, block_number: int, index: int, log_quotes: bool) -> None:
         u_sqrt_price_x96 = self.pool.sqrt_price_x96
         if u_sqrt_price_x96 is None:
-            self.logger.info("#%s-%s: Waiting for price", block_number, index)
+            if log_quotes and self.quote_log.due():
+                self.quote_log.log("#%s-%s: Waiting for price", block_number, index)
             return
+        if self.orderbook.bid_price is None:
+            return
+        # one execution per pool state, a quote change alone doesn't move the pool
+        if self._executed_state == (block_number, index):
+            return
+
+        if self.integer:
+            self._detect_int(block_number, index)
+        else:
+            self._detect_float(block_number, index)
+
+        if not log_quotes or not self.quote_log.due():
+            return
+        u_price = self.pool.price
+        b_bid = self.orderbook.bid_price
+        b_ask = self.orderbook.ask_price
+        self.quote_log.log(
+            "#%s-%s: B b=%.6f, a=%.6f | U b=%.6f, a=%.6f",
+            block_number,
+            index,
+            b_bid * (1 - BINANCE_FEE),
+            b_ask * (1 + BINANCE_FEE),
+            u_price * (1 - UNI_FEE),
+            u_price / (1 - UNI_FEE),
+        )
 
-        u_L = self.pool.active_liquidity
+    def _detect_float(self, block_number: int, index: int) -> None:
         u_price = self.pool.price
 
         b_bid = self.orderbook.bid_price
@@ -83,56 +207,111 @@ class ArbDetector:
             # Binance SELL, Uniswap BUY
             # eff_b_sell = P_t / (1 - UNI_FEE) → P_t = eff_b_sell * (1 - UNI_FEE)
             p_t = eff_b_sell * (1 - UNI_FEE)
-            p_t_sqrt_x96 = self._price_to_sqrt_x96(p_t)
-            dy_in = self._calc_amount1_with_fee(u_L, p_t_sqrt_x96, u_sqrt_price_x96)
-
-            self.executor.execute_b_sell_u_buy(dy_in, block_number, index)
-            self.logger.info(
-                "[B sell / U buy] edge: %.6f USDC/ETH, amount1_in: %.3f USDC",
-                sell_edge,
-                dy_in / 1e6,
-            )
-            append_row_to_csv(
-                "edges.csv",
-                {
-                    "block": block_number,
-                    "fb_index": index,
-                    "b_side": "SELL",
-                    "edge": sell_edge,
-                    "d_in": dy_in / 1e6,
-                },
+            self._on_edge(
+                False, sell_edge, self._price_to_sqrt_x96(p_t), block_number, index
             )
 
         elif buy_edge > 0:
             # Binance BUY, Uniswap Sell
             # eff_b_buy = P_t * (1 - UNI_FEE) → P_t = eff_b_buy / (1 - UNI_FEE)
             p_t = eff_b_buy / (1 - UNI_FEE)
-            p_t_sqrt_x96 = self._price_to_sqrt_x96(p_t)
-            dx_in = self._calc_amount0_with_fee(u_L, p_t_sqrt_x96, u_sqrt_price_x96)
-
-            self.executor.execute_b_buy_u_sell(dx_in, block_number, index)
-            self.logger.info(
-                "[B buy / U sell] edge: %.6f USDC/ETH, amount0_in: %.6f ETH",
-                buy_edge,
-                dx_in / 1e18,
+            self._on_edge(
+                True, buy_edge, self._price_to_sqrt_x96(p_t), block_number, index
+            )
+
+    def _detect_int(self, block_number: int, index: int) -> None:
+        """
+        Same edges as _detect_float, exact: with S = sqrtPriceX96 and the
+        fee-adjusted Binance prices as m * num / den, a U buy pays off iff
+        S**2 * den < bid_m * sell_num, a U sell iff S**2 * den > ask_m * buy_num.
+        A new quote costs one multiplication per side, a flashblock two.
+        """
+        ob = self.orderbook
+        if ob.price_exp != self._price_exp:
+            self._price_exp = ob.price_exp
+            self._factors = price_factors(ob.price_exp)
+            self._bid_mantissa = self._ask_mantissa = None
+        if ob.bid_mantissa != self._bid_mantissa:
+            self._bid_mantissa = ob.bid_mantissa
+            self._sell_val = ob.bid_mantissa * self._factors[0]
+        if ob.ask_mantissa != self._ask_mantissa:
+            self._ask_mantissa = ob.ask_mantissa
+            self._buy_val = ob.ask_mantissa * self._factors[1]
+
+        u_sqrt_price_x96 = self.pool.sqrt_price_x96
+        u_val = u_sqrt_price_x96 * u_sqrt_price_x96 * self._factors[2]
+        if u_val < self._sell_val:
+            # Binance SELL, Uniswap BUY
+            self._on_edge(
+                False, self._float_edge(False), self._target(False), block_number, index
+            )
+        elif u_val > self._buy_val:
+            # Binance BUY, Uniswap Sell
+            self._on_edge(
+                True, self._float_edge(True), self._target(True), block_number, index
             )
-            append_row_to_csv(
-                "edges.csv",
-                {
-                    "block": block_number,
-                    "fb_index": index,
-                    "b_side": "BUY",
-                    "edge": buy_edge,
-                    "d_in": dx_in / 1e18,
-                },
+
+    def _target(self, zero_for_one: bool) -> int:
+        """Last sqrtPriceX96 with an edge towards the fee-adjusted Binance price"""
+        den = self._factors[2]
+        if zero_for_one:
+            # smallest S with S**2 > floor(x)
+            return math.isqrt(self._buy_val // den) + 1
+        # largest S with S**2 < ceil(x)
+        return math.isqrt(-(-self._sell_val // den) - 1)
+
+    def _float_edge(self, zero_for_one: bool) -> float:
+        """Edge in USDC/ETH for logs, only computed once an edge is found"""
+        u_price = self.pool.price
+        if zero_for_one:
+            return u_price * (1 - UNI_FEE) - self.orderbook.ask_price * (
+                1 + BINANCE_FEE
             )
+        return self.orderbook.bid_price * (1 - BINANCE_FEE) - u_price / (1 - UNI_FEE)
 
+    def _on_edge(
+        self,
+        zero_for_one: bool,
+        edge: float,
+        target_sqrt_price_x96: int,
+        block_number: int,
+        index: int,
+    ) -> None:
+        """Sizes the trade up to the target price and hands it to the executor"""
+        # our pending swap will move the pool, the edge may already be taken
+        if self.executor.swap_pending(zero_for_one):
+            return
+        label = "[B buy / U sell]" if zero_for_one else "[B sell / U buy]"
+        plan = self.sizer.solve(zero_for_one, target_sqrt_price_x96)
+        if plan is None:
+            self.logger.info("%s edge: %.6f USDC/ETH, no profitable size", label, edge)
+            return
+
+        self._executed_state = (block_number, index)
+        if zero_for_one:
+            self.executor.execute_b_buy_u_sell(plan, block_number, index)
+        else:
+            self.executor.execute_b_sell_u_buy(plan, block_number, index)
         self.logger.info(
-            "#%s-%s: B b=%.6f, a=%.6f | U b=%.6f, a=%.6f",
-            block_number,
-            index,
-            eff_b_sell,
-            eff_b_buy,
-            u_bid,
-            u_ask,
+            "%s edge: %.6f USDC/ETH, size: %.4f ETH, amount1: %.6f USDC, "
+            "exp. profit: %.6f USDC, ticks crossed: %s",
+            label,
+            edge,
+            plan.qty,
+            plan.expected_amount1 / 1e6,
+            plan.expected_profit,
+            plan.ticks_crossed,
+        )
+        append_row_to_csv(
+            "edges.csv",
+            {
+                "block": block_number,
+                "fb_index": index,
+                "b_side": "BUY" if zero_for_one else "SELL",
+                "edge": edge,
+                # input amount: ETH for U sell, USDC for U buy
+                "d_in": plan.qty if zero_for_one else plan.expected_amount1 / 1e6,
+                "size": plan.qty,
+                "exp_profit": plan.expected_profit,
+            },
         )
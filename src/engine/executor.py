@@ -1,6 +1,9 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from datetime import datetime
 from logging import Logger
 import asyncio
+import time
 from typing import Callable, Awaitable
 from decimal import Decimal
 from web3.types import TxReceipt
@@ -10,15 +13,116 @@ from web3 import Web3
 from clients.binance.client import BinanceClient
 from clients.uniswap.client import UniswapClient
 from state.balances import Balances
-from state.flashblocks import FlashblockBuffer
+from state.flashblocks import FlashblockBuffer, Inclusion
+from engine.sizing import TradePlan
 from infra.monitoring import TelegramBot, append_row_to_csv
+from infra.latency import latency
 from config import (
     TOKEN1_DECIMALS,
     BINANCE_FEE,
+    MAX_IN_FLIGHT,
+    EXECUTION_STRATEGY,
 )
 
-
 FetchBalancesFn = Callable[[], Awaitable[None]]
+# receipt fields used by calculate_pnl
+PNL_RECEIPT_FIELDS = ("logs", "gasUsed", "effectiveGasPrice", "l1Fee")
+TRANSFER_TOPIC = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+
+
+@dataclass(slots=True)
+class ExecutionLegs:
+    """Outcome of both legs of one execution, times in time.monotonic_ns()"""
+
+    start_ns: int
+    u_bundle_hash: str | None = None
+    inclusion: Inclusion = None
+    u_done_ns: int | None = None
+    b_response: dict | None = None
+    b_done_ns: int | None = None
+    unwind_response: dict | None = None
+    # taken at submit or by the Uniswap leg, None if never needed
+    nonce: int | None = None
+    # bundle posted, may have reached the builder even if post_bundle raised
+    u_sent: bool = False
+    # exception raised by a leg, the other leg and the unwind still run
+    u_error: Exception | None = None
+    b_error: Exception | None = None
+    # Uniswap leg resolved (included/expired) or never sent
+    settled: bool = False
+
+    @property
+    def u_success(self) -> bool:
+        """Bundle included and not reverted"""
+        return self.inclusion is not None and self.inclusion[2]
+
+    @property
+    def b_filled(self) -> bool:
+        """Binance market order has fills"""
+        return bool(self.b_response and self.b_response.get("fills"))
+
+
+class ExecutionStrategy(ABC):
+    """Orders the Uniswap and Binance legs of an execution"""
+
+    __slots__ = ()
+    name = ""
+    # nonce taken at submit, else by the Uniswap leg once it starts
+    nonce_first = True
+
+    @abstractmethod
+    async def run(
+        self,
+        executor: "Executor",
+        plan: TradePlan,
+        origin_ns: int,
+        legs: ExecutionLegs,
+    ) -> None:
+        """Runs the legs, results are stored in legs"""
+
+
+class SequentialStrategy(ExecutionStrategy):
+    """Binance only once the bundle is included: no unhedged Binance fills"""
+
+    __slots__ = ()
+    name = "sequential"
+
+    async def run(self, executor, plan, origin_ns, legs):
+        await executor.uniswap_leg(plan, origin_ns, legs)
+        if legs.u_success:
+            await executor.binance_leg(plan, origin_ns, legs)
+
+
+class ParallelStrategy(ExecutionStrategy):
+    """Both legs at once: Binance fill is unwound if the bundle fails"""
+
+    __slots__ = ()
+    name = "parallel"
+
+    async def run(self, executor, plan, origin_ns, legs):
+        await asyncio.gather(
+            executor.uniswap_leg(plan, origin_ns, legs),
+            executor.binance_leg(plan, origin_ns, legs),
+        )
+
+
+class BinanceFirstStrategy(ExecutionStrategy):
+    """Binance fill first, then the bundle: unwound if the bundle fails"""
+
+    __slots__ = ()
+    name = "binance_first"
+    # no nonce is used up if Binance doesn't fill
+    nonce_first = False
+
+    async def run(self, executor, plan, origin_ns, legs):
+        await executor.binance_leg(plan, origin_ns, legs)
+        if legs.b_filled:
+            await executor.uniswap_leg(plan, origin_ns, legs)
+
+
+STRATEGIES = {
+    s.name: s for s in (SequentialStrategy, ParallelStrategy, BinanceFirstStrategy)
+}
 
 
 class Executor:
@@ -31,9 +135,12 @@ class Executor:
         "binance_client",
         "uniswap_client",
         "flashblock_buffer",
-        "_exec_in_progress",
         "telegram_bot",
         "fatal_error_future",
+        "max_in_flight",
+        "strategy",
+        "_in_flight",
+        "_pending_swaps",
     )
 
     def __init__(
@@ -46,7 +153,11 @@ class Executor:
         flashblock_buffer: FlashblockBuffer,
         telegram_bot: TelegramBot,
         fatal_error_future: asyncio.Future | None = None,
+        max_in_flight: int = MAX_IN_FLIGHT,
+        strategy: str = EXECUTION_STRATEGY,
     ):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown execution strategy: {strategy}")
         self.balances = balances
         self.logger = logger
         self.fetch_balances = fetch_balances
@@ -55,100 +166,251 @@ class Executor:
         self.flashblock_buffer = flashblock_buffer
         self.telegram_bot = telegram_bot
         self.fatal_error_future = fatal_error_future
-        self._exec_in_progress = False
+        self.max_in_flight = max_in_flight
+        self.strategy: ExecutionStrategy = STRATEGIES[strategy]()
+        # number of started, unfinished executions
+        self._in_flight = 0
+        # per direction: own swaps submitted but not yet reflected in pool state
+        self._pending_swaps: dict[bool, int] = {True: 0, False: 0}
 
-    def execute_b_sell_u_buy(self, dy_in, detected_block: int, detected_fb_index: int):
-        """Delegates execution given dy_in (USDC)"""
-        if self._exec_in_progress:
+    def swap_pending(self, zero_for_one: bool) -> bool:
+        """
+        True while an own swap in this direction is in flight and not yet
+        included, so the pool state doesn't reflect it yet
+        """
+        return self._pending_swaps[zero_for_one] > 0
+
+    def execute_b_sell_u_buy(
+        self, plan: TradePlan, detected_block: int, detected_fb_index: int
+    ):
+        """Delegates execution of a sized U buy / B sell"""
+        self._submit(plan, detected_block, detected_fb_index)
+
+    def execute_b_buy_u_sell(
+        self, plan: TradePlan, detected_block: int, detected_fb_index: int
+    ):
+        """Delegates execution of a sized U sell / B buy"""
+        self._submit(plan, detected_block, detected_fb_index)
+
+    def _submit(
+        self, plan: TradePlan, detected_block: int, detected_fb_index: int
+    ) -> None:
+        """
+        Starts an execution alongside the ones in flight: takes the next
+        nonce (unless the strategy defers it) and reserves the planned
+        balances until it has finished.
+        """
+        label = "b_buy_u_sell" if plan.zero_for_one else "b_sell_u_buy"
+        if self._in_flight >= self.max_in_flight:
             self.logger.warning(
-                "Execution skipped: post_execute_hook still running (b_sell_u_buy, block #%s-%s)",
+                "Execution skipped: %s executions in flight (%s, block #%s-%s)",
+                self._in_flight,
+                label,
                 detected_block,
                 detected_fb_index,
             )
             return
-        task = asyncio.create_task(
-            self._guarded_execute(False, detected_block, detected_fb_index)
-        )
-        task.add_done_callback(self._handle_exec_task_done)
-
-    def execute_b_buy_u_sell(self, dx_in, detected_block: int, detected_fb_index: int):
-        """Delegates execution given dx_in (ETH)"""
-        if self._exec_in_progress:
+        if not self._pre_execute_hook(plan):
+            return
+        if not self.uniswap_client.nonces.available:
             self.logger.warning(
-                "Execution skipped: post_execute_hook still running (b_buy_u_sell, block #%s-%s)",
+                "Execution skipped: nonce reconciliation pending (%s, block #%s-%s)",
+                label,
                 detected_block,
                 detected_fb_index,
             )
             return
+        legs = ExecutionLegs(time.monotonic_ns())
+        if self.strategy.nonce_first:
+            legs.nonce = self.uniswap_client.nonces.acquire()
+        self._in_flight += 1
+        self._pending_swaps[plan.zero_for_one] += 1
+        self.balances.reserve(self._reservation(plan))
         task = asyncio.create_task(
-            self._guarded_execute(True, detected_block, detected_fb_index)
+            self._guarded_execute(
+                plan,
+                legs,
+                detected_block,
+                detected_fb_index,
+                latency.origin_ns,
+            )
         )
         task.add_done_callback(self._handle_exec_task_done)
 
     async def _guarded_execute(
-        self, zero_for_one: bool, detected_block: int, detected_fb_index: int
+        self,
+        plan: TradePlan,
+        legs: ExecutionLegs,
+        detected_block: int,
+        detected_fb_index: int,
+        origin_ns: int,
     ) -> None:
-        self._exec_in_progress = True
-        await self._execute(zero_for_one, detected_block, detected_fb_index)
-        self._exec_in_progress = False
+        try:
+            await self._execute(
+                plan, legs, detected_block, detected_fb_index, origin_ns
+            )
+        finally:
+            self._settle(plan, legs)
+            self._in_flight -= 1
+            self.balances.release(self._reservation(plan))
+            nonces = self.uniswap_client.nonces
+            if legs.nonce is not None:
+                if legs.u_sent:
+                    # no-op if the tx was included, else the nonce may be unused
+                    nonces.expired(legs.nonce)
+                else:
+                    nonces.release(legs.nonce)
+            if nonces.needs_reconcile:
+                await self._reconcile_nonce()
+
+    async def _reconcile_nonce(self) -> None:
+        """Re-reads the account nonce after an expired bundle"""
+        account_nonce = await asyncio.to_thread(self.uniswap_client.fetch_nonce)
+        # a concurrently finished execution may have reconciled already
+        if not self.uniswap_client.nonces.needs_reconcile:
+            return
+        local_nonce = self.uniswap_client.nonce
+        if self.uniswap_client.reconcile_nonce(account_nonce):
+            self.logger.warning(
+                "Nonce reconciled: local %s, account %s", local_nonce, account_nonce
+            )
+
+    def _settle(self, plan: TradePlan, legs: ExecutionLegs) -> None:
+        """Own swap included, expired or never sent: detection may resume"""
+        if not legs.settled:
+            legs.settled = True
+            self._pending_swaps[plan.zero_for_one] -= 1
 
     async def _execute(
-        self, zero_for_one: bool, detected_block: int, detected_fb_index: int
+        self,
+        plan: TradePlan,
+        legs: ExecutionLegs,
+        detected_block: int,
+        detected_fb_index: int,
+        origin_ns: int,
+    ) -> None:
+        """
+        Executes Uniswap/Binance legs for plan.qty ETH in strategy order.
+        legs.start_ns: time the execution was submitted
+        origin_ns: receive time of the frame that triggered detection
+        """
+        await self.strategy.run(self, plan, origin_ns, legs)
+
+        u_receipt = None
+        if legs.u_success:
+            u_receipt = await self._get_own_receipt(legs.u_bundle_hash)
+            if not legs.b_filled:
+                # unhedged Uniswap leg, only left to the next opportunity
+                self.logger.error(
+                    "Binance leg not filled: %s", legs.b_response or legs.b_error
+                )
+        elif legs.b_filled:
+            await self._unwind(plan, legs)
+        else:
+            return
+        await self._post_execute_hook(
+            plan, legs, u_receipt, detected_block, detected_fb_index
+        )
+
+    async def uniswap_leg(
+        self, plan: TradePlan, origin_ns: int, legs: ExecutionLegs
     ) -> None:
-        """Sequentially execute Uniswap/Binance legs"""
-        # pre-execution hook
-        if not self._pre_execute_hook(zero_for_one):
+        """eth_sendBundle + wait/check if included, min-out/max-in at Binance break-even"""
+        nonces = self.uniswap_client.nonces
+        if legs.nonce is None:
+            legs.nonce = nonces.acquire()
+            if legs.nonce is None:
+                self.logger.warning("Uniswap leg skipped: nonce reconciliation pending")
+                self._settle(plan, legs)
+                return
+        try:
+            raw_tx = self.uniswap_client.sign_tx(
+                plan.zero_for_one,
+                plan.qty,
+                plan.amount_limit,
+                legs.nonce,
+                plan.expected_amount1,
+            )
+            if latency.enabled:
+                latency.record("sign", origin_ns)
+            legs.u_sent = True
+            legs.u_bundle_hash = await self.uniswap_client.post_bundle(raw_tx)
+            if latency.enabled:
+                latency.record("bundle", origin_ns)
+            legs.inclusion = await self._wait_for_own_tx(
+                legs.u_bundle_hash, 50
+            )  # 50 flashblocks >= 10 blocks
+            legs.u_done_ns = time.monotonic_ns()
+        except Exception as e:
+            # nonce may be used or not, treated as expired once finished
+            legs.u_error = e
+            self.logger.exception("Uniswap leg failed: %s", legs.u_bundle_hash)
+        self._settle(plan, legs)
+        if legs.u_error is not None:
             return
-        b_side = "BUY" if zero_for_one else "SELL"
-
-        # 1. Uniswap via eth_sendBundle + wait/check if included
-        u_bundle_hash = await self.uniswap_client.send_bundle(zero_for_one, 0.002)
-        executed = await self._wait_for_own_tx(
-            u_bundle_hash, 50
-        )  # 50 flashblocks >= 10 blocks
-        if not executed:
+        if legs.inclusion is None:
             # missed opp
-            self.logger.warning("Tx not included: ")
+            self.logger.warning("Tx not included: %s", legs.u_bundle_hash)
             return
-        self.uniswap_client.nonce += 1
+        nonces.included(legs.nonce)
+        if not legs.inclusion[2]:
+            self.flashblock_buffer.pop_receipt(legs.u_bundle_hash)
+            self.logger.warning("Tx included but reverted: %s", legs.u_bundle_hash)
 
-        # 2. Binance only when bundle was included
-        b_response = await self.binance_client.execute_trade(b_side, 0.002)
+    async def binance_leg(
+        self, plan: TradePlan, origin_ns: int, legs: ExecutionLegs
+    ) -> None:
+        """Binance market order for plan.qty"""
+        b_side = "BUY" if plan.zero_for_one else "SELL"
+        try:
+            legs.b_response = await self.binance_client.execute_trade(b_side, plan.qty)
+        except Exception as e:
+            legs.b_error = e
+            self.logger.exception("Binance leg failed: %s %s", b_side, plan.qty)
+            return
+        legs.b_done_ns = time.monotonic_ns()
+        if latency.enabled:
+            latency.record("binance", origin_ns)
 
-        # post-execution hook
-        u_receipt = await asyncio.to_thread(
-            self.uniswap_client.fetch_receipt, u_bundle_hash
-        )
-        await self._post_execute_hook(
-            b_response, u_receipt, detected_block, detected_fb_index
-        )
+    async def _unwind(self, plan: TradePlan, legs: ExecutionLegs) -> None:
+        """Reverses the Binance fill of a failed bundle"""
+        _price, qty = self._acc_fills(legs.b_response["fills"])
+        side = "SELL" if plan.zero_for_one else "BUY"
+        self.logger.warning("Uniswap leg failed, unwinding Binance: %s %s", side, qty)
+        legs.unwind_response = await self.binance_client.execute_trade(side, float(qty))
 
-    async def _wait_for_own_tx(self, tx_hash: str, max_blocks: int) -> bool:
+    async def _get_own_receipt(self, tx_hash: str) -> TxReceipt | dict:
         """
-        Subscriber to _new_block event in FlashblockBuffer
-        Returns 'True' if tx was executed and found in the buffer
+        Returns the receipt retained from the flashblock feed, falls back to
+        RPC if it is missing or lacks fields needed for calculate_pnl
         """
-        for _ in range(max_blocks):
-            await self.flashblock_buffer.wait_for_new_block()
-            if self.flashblock_buffer.lookup(tx_hash) is not None:
-                return True
-        return False
+        receipt = self.flashblock_buffer.pop_receipt(tx_hash)
+        if receipt is not None and all(f in receipt for f in PNL_RECEIPT_FIELDS):
+            return receipt
+        return await asyncio.to_thread(self.uniswap_client.fetch_receipt, tx_hash)
+
+    async def _wait_for_own_tx(self, tx_hash: str, max_flashblocks: int) -> Inclusion:
+        """
+        Waits on the tx_hash future in FlashblockBuffer, resolved by the feed.
+        Returns (block_number, index, success), None if not included in time
+        """
+        return await self.flashblock_buffer.wait_for_tx(tx_hash, max_flashblocks)
 
     async def _post_execute_hook(
         self,
-        b_response: dict,
-        u_receipt: TxReceipt,
+        plan: TradePlan,
+        legs: ExecutionLegs,
+        u_receipt: TxReceipt | dict | None,
         detected_block: int,
         detected_fb_index: int,
     ) -> None:
-        """Refreshes balances"""
-        tx_hash_raw = u_receipt.get("transactionHash")
-        tx_hash = "0x" + tx_hash_raw.hex()
-
+        """Logs the execution incl. strategy latency/slippage, refreshes balances"""
         block_number = None
         index = None
+        tx_hash = legs.u_bundle_hash
+        b_response = legs.b_response
 
-        fb_info = self.flashblock_buffer.lookup(tx_hash)
+        fb_info = self.flashblock_buffer.lookup(tx_hash) if legs.u_success else None
         if fb_info is not None:
             block_number, index = fb_info
             self.logger.info(
@@ -162,10 +424,12 @@ class Executor:
             self.logger.warning(
                 "Post-execute status: flashblock not found for tx %s", tx_hash
             )
-        pnl = self.calculate_pnl(
-            b_response,
-            u_receipt,
-        )
+        pnl = None
+        if u_receipt is not None and legs.b_filled:
+            pnl = self.calculate_pnl(
+                b_response,
+                u_receipt,
+            )
         self.logger.info("Post-execute status: PnL: %s", pnl)
         all_tx_hashes_in_fb = self.flashblock_buffer.get_tx_hashes(block_number, index)
         append_row_to_csv(
@@ -177,38 +441,90 @@ class Executor:
                 "fb_index": index,
                 "pnl": pnl,
                 "tx_hashes": all_tx_hashes_in_fb,
-                "b_side": b_response.get("side"),
+                "b_side": b_response.get("side") if b_response else None,
                 "u_tx_hash": tx_hash,
+                **self._execution_metrics(plan, legs, u_receipt),
             },
         )
-        await self.telegram_bot.notify_executed(pnl)
+        if pnl is not None:
+            await self.telegram_bot.notify_executed(pnl)
         await self.fetch_balances()
 
-    def _pre_execute_hook(self, zero_for_one: bool) -> bool:
-        """Checks balances"""
-        # balances check
-        b = self.balances
-        if zero_for_one:
+    def _execution_metrics(
+        self,
+        plan: TradePlan,
+        legs: ExecutionLegs,
+        u_receipt: TxReceipt | dict | None,
+    ) -> dict:
+        """
+        Per-strategy metrics: leg latency since submit (ms), Binance fill time
+        minus inclusion time (ms, unhedged window) and adverse slippage vs.
+        the plan (bps, positive = worse than planned)
+        """
+
+        def ms(end_ns: int | None) -> float | None:
+            return None if end_ns is None else (end_ns - legs.start_ns) / 1e6
+
+        u_latency, b_latency = ms(legs.u_done_ns), ms(legs.b_done_ns)
+        leg_gap = None
+        if u_latency is not None and b_latency is not None:
+            leg_gap = b_latency - u_latency
+
+        b_slippage = None
+        if legs.b_filled:
+            fill_price, _qty = self._acc_fills(legs.b_response["fills"])
+            diff = float(fill_price) - plan.b_price
+            b_slippage = (diff if plan.zero_for_one else -diff) / plan.b_price * 1e4
+
+        u_slippage = None
+        if u_receipt is not None and plan.expected_amount1:
+            usdc = float(self._get_transfer_amount(u_receipt)) * 10**TOKEN1_DECIMALS
+            # U sell receives, U buy pays amount1
+            diff = plan.expected_amount1 - usdc
+            diff = diff if plan.zero_for_one else -diff
+            u_slippage = diff / plan.expected_amount1 * 1e4
+
+        return {
+            "strategy": self.strategy.name,
+            "qty": plan.qty,
+            "exp_profit": plan.expected_profit,
+            "u_latency_ms": u_latency,
+            "b_latency_ms": b_latency,
+            "leg_gap_ms": leg_gap,
+            "b_slippage_bps": b_slippage,
+            "u_slippage_bps": u_slippage,
+            "unwound": legs.unwind_response is not None,
+        }
+
+    @staticmethod
+    def _reservation(plan: TradePlan) -> dict[str, float]:
+        """Balances an execution of plan may spend"""
+        if plan.zero_for_one:
             # B_BUY_U_SELL
-            if b.b_usdc < 10 or b.u_eth < 0.002:
-                self.logger.warning(
-                    "Pre-check: insufficient Balance b_buy_u_sell: b_usdc %s, u_eth %s",
-                    b.b_usdc,
-                    b.u_eth,
-                )
-                return False
-        else:
-            # B_SELL_U_BUY
-            if b.b_eth < 0.002 or b.u_usdc < 10:
+            return {"b_usdc": plan.qty * plan.b_price, "u_eth": plan.qty}
+        # B_SELL_U_BUY
+        return {
+            "b_eth": plan.qty,
+            "u_usdc": plan.amount_limit / 10**TOKEN1_DECIMALS,
+        }
+
+    def _pre_execute_hook(self, plan: TradePlan) -> bool:
+        """Checks balances net of in-flight reservations against the plan"""
+        b = self.balances
+        for name, amount in self._reservation(plan).items():
+            if b.available(name) < amount:
                 self.logger.warning(
-                    "Pre-check: insufficient Balance b_sell_u_buy: b_eth %s, u_usdc %s",
-                    b.b_eth,
-                    b.u_usdc,
+                    "Pre-check: insufficient Balance %s: %s available, %s needed",
+                    name,
+                    b.available(name),
+                    amount,
                 )
                 return False
         return True
 
     def _handle_exec_task_done(self, task: asyncio.Task):
+        if task.cancelled():
+            return
         exc = task.exception()
         if exc:
             self.logger.error("Error during execution", exc_info=exc)
@@ -220,8 +536,13 @@ class Executor:
         return now.microsecond // 1000
 
     @staticmethod
-    def calculate_pnl(response_binance: dict, receipt_uniswap: TxReceipt) -> Decimal:
-        """Returns PnL in USDC"""
+    def calculate_pnl(
+        response_binance: dict, receipt_uniswap: TxReceipt | dict
+    ) -> Decimal:
+        """
+        Returns PnL in USDC.
+        receipt_uniswap: web3 TxReceipt or raw flashblock receipt (hex strings)
+        """
         fill_price, qty = Executor._acc_fills(response_binance["fills"])
         notional_price = fill_price * qty
         b_fee = notional_price * Decimal(BINANCE_FEE)
@@ -250,26 +571,39 @@ class Executor:
         return avg_price, total_qty
 
     @staticmethod
-    def _get_transfer_amount(tx_receipt: TxReceipt) -> Decimal:
+    def _get_transfer_amount(tx_receipt: TxReceipt | dict) -> Decimal:
         transfer_topic_log = Executor._extract_transfer_log(tx_receipt)
-        transfer_out_raw = int(transfer_topic_log.data.hex(), 16)
+        transfer_out_raw = Executor._to_int(transfer_topic_log["data"])
         return transfer_out_raw / Decimal(f"1e{TOKEN1_DECIMALS}")
 
     @staticmethod
-    def _extract_transfer_log(tx_receipt: TxReceipt) -> AttributeDict | None:
+    def _extract_transfer_log(tx_receipt: TxReceipt | dict) -> AttributeDict | None:
         for log in tx_receipt["logs"]:
             topics = log["topics"]
             # TOPIC_TRANSFER_EVENT
-            if (
-                "0x" + topics[0].hex()
-                == "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
-            ):
+            if Executor._to_hex(topics[0]) == TRANSFER_TOPIC:
                 return log
 
     @staticmethod
-    def _get_transaction_costs(tx_receipt: TxReceipt) -> Decimal:
-        gas_used = int(tx_receipt["gasUsed"])
-        effective_gas_price = int(tx_receipt["effectiveGasPrice"])
-        l1_fee = int(tx_receipt["l1Fee"], 16)
+    def _get_transaction_costs(tx_receipt: TxReceipt | dict) -> Decimal:
+        gas_used = Executor._to_int(tx_receipt["gasUsed"])
+        effective_gas_price = Executor._to_int(tx_receipt["effectiveGasPrice"])
+        l1_fee = Executor._to_int(tx_receipt["l1Fee"])
         tx_cost_wei = gas_used * effective_gas_price + l1_fee
         return Decimal(Web3.from_wei(tx_cost_wei, "ether"))
+
+    @staticmethod
+    def _to_int(value: int | str | bytes) -> int:
+        """Receipt quantity from web3 (int/HexBytes) or flashblock (hex str)"""
+        if isinstance(value, int):
+            return value
+        if isinstance(value, str):
+            return int(value, 16)
+        return int.from_bytes(value, "big")
+
+    @staticmethod
+    def _to_hex(value: str | bytes) -> str:
+        """Lowercase '0x' hex of a topic from web3 (HexBytes) or flashblock (str)"""
+        if isinstance(value, str):
+            return value.lower()
+        return "0x" + value.hex()
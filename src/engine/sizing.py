@@ -0,0 +1,165 @@
+"""
+Trade sizing: ETH quantity maximizing the expected net profit of a Uniswap
+swap hedged with a Binance market order.
+"""
+
+import math
+from dataclasses import dataclass
+
+from engine.swap_simulator import simulate_swap, swap_to_price
+from state.balances import Balances
+from state.orderbook import OrderBook
+from state.pool import Pool
+from config import (
+    BINANCE_FEE,
+    BINANCE_MIN_NOTIONAL,
+    BINANCE_MIN_QTY,
+    BINANCE_STEP_SIZE,
+    GAS_COST,
+    GAS_RESERVE,
+    MAX_TOKEN0_INPUT,
+    TOKEN0_DECIMALS,
+    TOKEN1_DECIMALS,
+)
+
+WEI = 10**TOKEN0_DECIMALS
+USDC = 10**TOKEN1_DECIMALS
+STEP_WEI = round(BINANCE_STEP_SIZE * WEI)
+MIN_QTY_WEI = round(BINANCE_MIN_QTY * WEI)
+# qty of every trade capped by MAX_TOKEN0_INPUT, same rounding as solve()
+MAX_LOT_QTY = round(int(MAX_TOKEN0_INPUT * WEI) // STEP_WEI * STEP_WEI / WEI, 8)
+
+
+@dataclass(slots=True)
+class TradePlan:
+    """Sized arbitrage trade, amounts in raw token units unless noted."""
+
+    zero_for_one: bool  # True: U sell / B buy, False: U buy / B sell
+    qty: float  # ETH, multiple of the Binance step size
+    amount_token0: int  # Uniswap exact in (sell) / exact out (buy)
+    amount_limit: int  # USDC amountOutMinimum (sell) / amountInMaximum (buy)
+    expected_amount1: int  # simulated USDC out (sell) / in (buy)
+    b_price: float  # Binance ask (buy) / bid (sell)
+    expected_profit: float  # USDC, after fees and gas
+    ticks_crossed: int
+
+
+class TradeSizer:
+    """
+    Sizes trades against the local pool state (all initialized ticks) and
+    Binance top of book, capped by quantity, balances and max_qty.
+    """
+
+    __slots__ = ("pool", "orderbook", "balances", "max_qty", "gas_cost")
+
+    def __init__(
+        self,
+        pool: Pool,
+        orderbook: OrderBook,
+        balances: Balances | None,
+        max_qty: float = MAX_TOKEN0_INPUT,
+        gas_cost: float = GAS_COST,
+    ):
+        self.pool = pool
+        self.orderbook = orderbook
+        # None: balances are not checked (dry-run)
+        self.balances = balances
+        self.max_qty = max_qty
+        self.gas_cost = gas_cost
+
+    def solve(self, zero_for_one: bool, target_sqrt_price_x96: int) -> TradePlan | None:
+        """
+        Returns the most profitable lot size, None if no size clears fees/gas.
+        target_sqrt_price_x96: pool price where the marginal Uniswap price after
+        fee meets the Binance price after fee. The exact swap to it (closed form
+        per tick range, walking initialized ticks) is the unconstrained optimum.
+        Profit is concave in size, so only the lots next to min(optimum, cap)
+        are evaluated.
+        """
+        ob = self.orderbook
+        b_price = ob.ask_price if zero_for_one else ob.bid_price
+        try:
+            to_target = swap_to_price(self.pool, target_sqrt_price_x96)
+        except ValueError:
+            return None
+        optimum = to_target.amount_in if zero_for_one else to_target.amount_out
+        cap = self._cap(zero_for_one, b_price)
+        lots = min(optimum, cap) // STEP_WEI
+
+        best = None
+        for amount in (lots * STEP_WEI, (lots + 1) * STEP_WEI):
+            if amount < MIN_QTY_WEI or amount > cap:
+                continue
+            plan = self._evaluate(zero_for_one, amount, b_price)
+            if plan is not None and (
+                best is None or plan.expected_profit > best.expected_profit
+            ):
+                best = plan
+        return best
+
+    def _cap(self, zero_for_one: bool, b_price: float) -> int:
+        """Largest tradable amount of token0 in wei"""
+        ob = self.orderbook
+        caps = [self.max_qty, ob.ask_qty if zero_for_one else ob.bid_qty]
+        b = self.balances
+        if b is not None:
+            # net of amounts reserved by in-flight executions
+            if zero_for_one:
+                # U sell ETH (keep gas), B buy with USDC (BNB commission)
+                caps.append(b.available("u_eth") - GAS_RESERVE)
+                caps.append(b.available("b_usdc") / b_price)
+            else:
+                # B sell ETH, U buy for at most the Binance proceeds
+                caps.append(b.available("b_eth"))
+                caps.append(b.available("u_usdc") / (b_price * (1 - BINANCE_FEE)))
+        return max(0, int(min(caps) * WEI))
+
+    def _evaluate(
+        self, zero_for_one: bool, amount: int, b_price: float
+    ) -> TradePlan | None:
+        """Exact pool simulation of one size, None if not profitable"""
+        qty = round(amount / WEI, 8)
+        if qty * b_price < BINANCE_MIN_NOTIONAL:
+            return None
+        pool = self.pool
+        try:
+            result = simulate_swap(
+                pool.sqrt_price_x96,
+                pool.current_tick,
+                pool.active_liquidity,
+                pool.ticks,
+                zero_for_one,
+                -amount if zero_for_one else amount,
+            )
+        except ValueError:
+            return None
+        gas_usdc = self.gas_cost * b_price
+
+        if zero_for_one:
+            if result.amount_in < amount:
+                return None  # pool liquidity exhausted
+            amount1 = result.amount_out
+            b_cost = qty * b_price * (1 + BINANCE_FEE)
+            profit = amount1 / USDC - b_cost - gas_usdc
+            # break-even: revert rather than lose vs. the Binance leg
+            amount_limit = math.ceil((b_cost + gas_usdc) * USDC)
+        else:
+            if result.amount_out < amount:
+                return None
+            amount1 = result.amount_in
+            b_proceeds = qty * b_price * (1 - BINANCE_FEE)
+            profit = b_proceeds - amount1 / USDC - gas_usdc
+            amount_limit = math.floor((b_proceeds - gas_usdc) * USDC)
+
+        if profit <= 0:
+            return None
+        return TradePlan(
+            zero_for_one=zero_for_one,
+            qty=qty,
+            amount_token0=amount,
+            amount_limit=amount_limit,
+            expected_amount1=amount1,
+            b_price=b_price,
+            expected_profit=profit,
+            ticks_crossed=result.ticks_crossed,
+        )
@@ -0,0 +1,201 @@
+"""
+Integer-exact port of Uniswap v4 SqrtPriceMath and SwapMath.
+Python ints are unbounded, so 256-bit overflow is only emulated where the
+Solidity code branches on it.
+"""
+
+from engine.tick_math import Q96
+
+MAX_SWAP_FEE = 1_000_000  # fee denominator, pips
+_UINT160_MAX = 2**160 - 1
+_UINT256 = 2**256
+
+
+def mul_div_rounding_up(a: int, b: int, denominator: int) -> int:
+    """ceil(a * b / denominator)"""
+    return -(-(a * b) // denominator)
+
+
+def div_rounding_up(x: int, y: int) -> int:
+    """ceil(x / y)"""
+    return -(-x // y)
+
+
+def get_next_sqrt_price_from_amount0_rounding_up(
+    sqrt_price_x96: int, liquidity: int, amount: int, add: bool
+) -> int:
+    """Next sqrt price after adding/removing amount of token0, rounded up"""
+    if amount == 0:
+        return sqrt_price_x96
+    numerator1 = liquidity << 96
+    product = amount * sqrt_price_x96
+    if add:
+        if product < _UINT256 and numerator1 + product < _UINT256:
+            return mul_div_rounding_up(numerator1, sqrt_price_x96, numerator1 + product)
+        return div_rounding_up(numerator1, numerator1 // sqrt_price_x96 + amount)
+    if product >= _UINT256 or numerator1 <= product:
+        raise ValueError("Price overflow")
+    next_price = mul_div_rounding_up(numerator1, sqrt_price_x96, numerator1 - product)
+    if next_price > _UINT160_MAX:
+        raise ValueError("Price overflow")
+    return next_price
+
+
+def get_next_sqrt_price_from_amount1_rounding_down(
+    sqrt_price_x96: int, liquidity: int, amount: int, add: bool
+) -> int:
+    """Next sqrt price after adding/removing amount of token1, rounded down"""
+    if add:
+        next_price = sqrt_price_x96 + (amount << 96) // liquidity
+        if next_price > _UINT160_MAX:
+            raise ValueError("Price overflow")
+        return next_price
+    quotient = div_rounding_up(amount << 96, liquidity)
+    if sqrt_price_x96 <= quotient:
+        raise ValueError("Not enough liquidity")
+    return sqrt_price_x96 - quotient
+
+
+def get_next_sqrt_price_from_input(
+    sqrt_price_x96: int, liquidity: int, amount_in: int, zero_for_one: bool
+) -> int:
+    """Next sqrt price given an input amount of token0 or token1"""
+    if sqrt_price_x96 == 0 or liquidity == 0:
+        raise ValueError("Invalid price or liquidity")
+    if zero_for_one:
+        return get_next_sqrt_price_from_amount0_rounding_up(
+            sqrt_price_x96, liquidity, amount_in, True
+        )
+    return get_next_sqrt_price_from_amount1_rounding_down(
+        sqrt_price_x96, liquidity, amount_in, True
+    )
+
+
+def get_next_sqrt_price_from_output(
+    sqrt_price_x96: int, liquidity: int, amount_out: int, zero_for_one: bool
+) -> int:
+    """Next sqrt price given an output amount of token0 or token1"""
+    if sqrt_price_x96 == 0 or liquidity == 0:
+        raise ValueError("Invalid price or liquidity")
+    if zero_for_one:
+        return get_next_sqrt_price_from_amount1_rounding_down(
+            sqrt_price_x96, liquidity, amount_out, False
+        )
+    return get_next_sqrt_price_from_amount0_rounding_up(
+        sqrt_price_x96, liquidity, amount_out, False
+    )
+
+
+def get_amount0_delta(
+    sqrt_price_a_x96: int, sqrt_price_b_x96: int, liquidity: int, round_up: bool
+) -> int:
+    """Amount of token0 between two prices for liquidity"""
+    if sqrt_price_a_x96 > sqrt_price_b_x96:
+        sqrt_price_a_x96, sqrt_price_b_x96 = sqrt_price_b_x96, sqrt_price_a_x96
+    if sqrt_price_a_x96 == 0:
+        raise ValueError("Invalid price")
+    numerator1 = liquidity << 96
+    numerator2 = sqrt_price_b_x96 - sqrt_price_a_x96
+    if round_up:
+        return div_rounding_up(
+            mul_div_rounding_up(numerator1, numerator2, sqrt_price_b_x96),
+            sqrt_price_a_x96,
+        )
+    return numerator1 * numerator2 // sqrt_price_b_x96 // sqrt_price_a_x96
+
+
+def get_amount1_delta(
+    sqrt_price_a_x96: int, sqrt_price_b_x96: int, liquidity: int, round_up: bool
+) -> int:
+    """Amount of token1 between two prices for liquidity"""
+    if sqrt_price_a_x96 > sqrt_price_b_x96:
+        sqrt_price_a_x96, sqrt_price_b_x96 = sqrt_price_b_x96, sqrt_price_a_x96
+    if round_up:
+        return mul_div_rounding_up(liquidity, sqrt_price_b_x96 - sqrt_price_a_x96, Q96)
+    return liquidity * (sqrt_price_b_x96 - sqrt_price_a_x96) // Q96
+
+
+def get_sqrt_price_target(
+    zero_for_one: bool, sqrt_price_next_x96: int, sqrt_price_limit_x96: int
+) -> int:
+    """Next tick price, clamped to the swap limit"""
+    if zero_for_one:
+        return max(sqrt_price_next_x96, sqrt_price_limit_x96)
+    return min(sqrt_price_next_x96, sqrt_price_limit_x96)
+
+
+def compute_swap_step(
+    sqrt_price_current_x96: int,
+    sqrt_price_target_x96: int,
+    liquidity: int,
+    amount_remaining: int,
+    fee_pips: int,
+) -> tuple[int, int, int, int]:
+    """
+    Single swap step within one liquidity range, as SwapMath.computeSwapStep.
+    amount_remaining < 0 is exact input, > 0 exact output (v4 sign convention).
+    Returns (sqrt_price_next_x96, amount_in, amount_out, fee_amount).
+    """
+    zero_for_one = sqrt_price_current_x96 >= sqrt_price_target_x96
+    exact_in = amount_remaining < 0
+
+    if exact_in:
+        amount_remaining_less_fee = (
+            -amount_remaining * (MAX_SWAP_FEE - fee_pips) // MAX_SWAP_FEE
+        )
+        if zero_for_one:
+            amount_in = get_amount0_delta(
+                sqrt_price_target_x96, sqrt_price_current_x96, liquidity, True
+            )
+        else:
+            amount_in = get_amount1_delta(
+                sqrt_price_current_x96, sqrt_price_target_x96, liquidity, True
+            )
+        if amount_remaining_less_fee >= amount_in:
+            sqrt_price_next_x96 = sqrt_price_target_x96
+            fee_amount = (
+                amount_in
+                if fee_pips == MAX_SWAP_FEE
+                else mul_div_rounding_up(amount_in, fee_pips, MAX_SWAP_FEE - fee_pips)
+            )
+        else:
+            amount_in = amount_remaining_less_fee
+            sqrt_price_next_x96 = get_next_sqrt_price_from_input(
+                sqrt_price_current_x96, liquidity, amount_in, zero_for_one
+            )
+            fee_amount = -amount_remaining - amount_in
+        if zero_for_one:
+            amount_out = get_amount1_delta(
+                sqrt_price_next_x96, sqrt_price_current_x96, liquidity, False
+            )
+        else:
+            amount_out = get_amount0_delta(
+                sqrt_price_current_x96, sqrt_price_next_x96, liquidity, False
+            )
+    else:
+        if zero_for_one:
+            amount_out = get_amount1_delta(
+                sqrt_price_target_x96, sqrt_price_current_x96, liquidity, False
+            )
+        else:
+            amount_out = get_amount0_delta(
+                sqrt_price_current_x96, sqrt_price_target_x96, liquidity, False
+            )
+        if amount_remaining >= amount_out:
+            sqrt_price_next_x96 = sqrt_price_target_x96
+        else:
+            amount_out = amount_remaining
+            sqrt_price_next_x96 = get_next_sqrt_price_from_output(
+                sqrt_price_current_x96, liquidity, amount_out, zero_for_one
+            )
+        if zero_for_one:
+            amount_in = get_amount0_delta(
+                sqrt_price_next_x96, sqrt_price_current_x96, liquidity, True
+            )
+        else:
+            amount_in = get_amount1_delta(
+                sqrt_price_current_x96, sqrt_price_next_x96, liquidity, True
+            )
+        fee_amount = mul_div_rounding_up(amount_in, fee_pips, MAX_SWAP_FEE - fee_pips)
+
+    return sqrt_price_next_x96, amount_in, amount_out, fee_amount
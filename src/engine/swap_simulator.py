@@ -0,0 +1,143 @@
+"""
+Tick-walking swap simulator mirroring Uniswap v4 Pool.swap for our pool
+(static LP fee, no protocol fee, no hooks).
+"""
+
+from dataclasses import dataclass
+
+from engine.swap_math import compute_swap_step, get_sqrt_price_target
+from engine.tick_math import (
+    MAX_SQRT_PRICE,
+    MAX_TICK,
+    MIN_SQRT_PRICE,
+    MIN_TICK,
+    sqrt_price_table,
+)
+from state.pool import Pool
+from state.ticks import TickStore
+
+POOL_FEE_PIPS = 500
+TICK_SPACING = 10
+
+
+@dataclass(slots=True)
+class SwapResult:
+    """Outcome of a simulated swap, amounts are positive and in raw units."""
+
+    amount_in: int  # including fee
+    amount_out: int
+    fee_amount: int
+    sqrt_price_x96: int
+    tick: int
+    liquidity: int
+    ticks_crossed: int = 0
+
+
+def simulate_swap(
+    sqrt_price_x96: int,
+    tick: int,
+    liquidity: int,
+    ticks: TickStore,
+    zero_for_one: bool,
+    amount_specified: int,
+    sqrt_price_limit_x96: int | None = None,
+    fee_pips: int = POOL_FEE_PIPS,
+    tick_spacing: int = TICK_SPACING,
+) -> SwapResult:
+    """
+    Simulates Pool.swap from the given slot0 state.
+    Steps end at bitmap word boundaries like nextInitializedTickWithinOneWord,
+    so their rounding matches the on-chain loop exactly.
+    amount_specified < 0 is exact input, > 0 exact output (v4 sign convention).
+    Raises ValueError where the pool would revert.
+    """
+    if sqrt_price_limit_x96 is None:
+        sqrt_price_limit_x96 = (
+            MIN_SQRT_PRICE + 1 if zero_for_one else MAX_SQRT_PRICE - 1
+        )
+    if zero_for_one:
+        if sqrt_price_limit_x96 >= sqrt_price_x96:
+            raise ValueError("Price limit already exceeded")
+        if sqrt_price_limit_x96 <= MIN_SQRT_PRICE:
+            raise ValueError("Price limit out of bounds")
+    else:
+        if sqrt_price_limit_x96 <= sqrt_price_x96:
+            raise ValueError("Price limit already exceeded")
+        if sqrt_price_limit_x96 >= MAX_SQRT_PRICE:
+            raise ValueError("Price limit out of bounds")
+
+    exact_in = amount_specified < 0
+    remaining = amount_specified
+    amount_in = amount_out = fee_total = crossed = 0
+
+    while remaining != 0 and sqrt_price_x96 != sqrt_price_limit_x96:
+        price_start = sqrt_price_x96
+        tick_next, initialized = ticks.next_initialized_tick_within_one_word(
+            tick, tick_spacing, zero_for_one
+        )
+        if tick_next <= MIN_TICK:
+            tick_next = MIN_TICK
+        elif tick_next >= MAX_TICK:
+            tick_next = MAX_TICK
+        price_next = sqrt_price_table.get(tick_next)
+
+        sqrt_price_x96, step_in, step_out, step_fee = compute_swap_step(
+            sqrt_price_x96,
+            get_sqrt_price_target(zero_for_one, price_next, sqrt_price_limit_x96),
+            liquidity,
+            remaining,
+            fee_pips,
+        )
+        if exact_in:
+            remaining += step_in + step_fee
+        else:
+            remaining -= step_out
+        amount_in += step_in + step_fee
+        amount_out += step_out
+        fee_total += step_fee
+
+        if sqrt_price_x96 == price_next:
+            if initialized:
+                liquidity_net = ticks.liquidity_net(tick_next)
+                liquidity += -liquidity_net if zero_for_one else liquidity_net
+                crossed += 1
+            tick = tick_next - 1 if zero_for_one else tick_next
+        elif sqrt_price_x96 != price_start:
+            tick = sqrt_price_table.tick_at_sqrt_price(sqrt_price_x96)
+
+    return SwapResult(
+        amount_in=amount_in,
+        amount_out=amount_out,
+        fee_amount=fee_total,
+        sqrt_price_x96=sqrt_price_x96,
+        tick=tick,
+        liquidity=liquidity,
+        ticks_crossed=crossed,
+    )
+
+
+def swap_to_price(
+    pool: Pool,
+    target_sqrt_price_x96: int,
+    max_amount_in: int | None = None,
+) -> SwapResult:
+    """
+    Exact input swap moving the pool price to target_sqrt_price_x96
+    (direction implied by the target), optionally capped at max_amount_in.
+    Returns an empty result if the pool already is at the target.
+    """
+    zero_for_one = target_sqrt_price_x96 < pool.sqrt_price_x96
+    if target_sqrt_price_x96 == pool.sqrt_price_x96:
+        return SwapResult(
+            0, 0, 0, pool.sqrt_price_x96, pool.current_tick, pool.active_liquidity
+        )
+    amount_specified = -(max_amount_in if max_amount_in is not None else 2**255 - 1)
+    return simulate_swap(
+        pool.sqrt_price_x96,
+        pool.current_tick,
+        pool.active_liquidity,
+        pool.ticks,
+        zero_for_one,
+        amount_specified,
+        target_sqrt_price_x96,
+    )
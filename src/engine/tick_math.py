@@ -0,0 +1,150 @@
+"""
+Integer-exact port of Uniswap v4 TickMath, plus a cached sqrt price table.
+"""
+
+import math
+from bisect import bisect_left, bisect_right
+from typing import Iterable
+
+MIN_TICK = -887272
+MAX_TICK = 887272
+MIN_SQRT_PRICE = 4295128739
+MAX_SQRT_PRICE = 1461446703485210103287273052203988822378723970342
+
+Q96 = 2**96
+_UINT256_MAX = 2**256 - 1
+_LOG_SQRT_1_0001 = math.log(1.0001) / 2
+
+# ratio multipliers 2^128 / sqrt(1.0001)^(2^i) for bit i of |tick|
+_RATIOS = (
+    0xFFF97272373D413259A46990580E213A,
+    0xFFF2E50F5F656932EF12357CF3C7FDCC,
+    0xFFE5CACA7E10E4E61C3624EAA0941CD0,
+    0xFFCB9843D60F6159C9DB58835C926644,
+    0xFF973B41FA98C081472E6896DFB254C0,
+    0xFF2EA16466C96A3843EC78B326B52861,
+    0xFE5DEE046A99A2A811C461F1969C3053,
+    0xFCBE86C7900A88AEDCFFC83B479AA3A4,
+    0xF987A7253AC413176F2B074CF7815E54,
+    0xF3392B0822B70005940C7A398E4B70F3,
+    0xE7159475A2C29B7443B29C7FA6E889D9,
+    0xD097F3BDFD2022B8845AD8F792AA5825,
+    0xA9F746462D870FDF8A65DC1F90E061E5,
+    0x70D869A156D2A1B890BB3DF62BAF32F7,
+    0x31BE135F97D08FD981231505542FCFA6,
+    0x9AA508B5B7A84E1C677DE54F3E99BC9,
+    0x5D6AF8DEDB81196699C329225EE604,
+    0x2216E584F5FA1EA926041BEDFE98,
+    0x48A170391F7DC42444E8FA2,
+)
+
+
+def get_sqrt_price_at_tick(tick: int) -> int:
+    """Returns sqrt(1.0001^tick) * 2^96 as in TickMath.getSqrtPriceAtTick"""
+    abs_tick = -tick if tick < 0 else tick
+    if abs_tick > MAX_TICK:
+        raise ValueError(f"Invalid tick {tick}")
+
+    ratio = (
+        0xFFFCB933BD6FAD37AA2D162D1A594001
+        if abs_tick & 0x1
+        else 0x100000000000000000000000000000000
+    )
+    bit = 0x2
+    for multiplier in _RATIOS:
+        if abs_tick & bit:
+            ratio = (ratio * multiplier) >> 128
+        bit <<= 1
+
+    if tick > 0:
+        ratio = _UINT256_MAX // ratio
+
+    # Q128.128 -> Q64.96, rounding up
+    return (ratio >> 32) + (0 if ratio % (1 << 32) == 0 else 1)
+
+
+def get_tick_at_sqrt_price(sqrt_price_x96: int) -> int:
+    """
+    Returns the greatest tick with get_sqrt_price_at_tick(tick) <= sqrt_price_x96,
+    as in TickMath.getTickAtSqrtPrice (float estimate + exact correction).
+    """
+    if not MIN_SQRT_PRICE <= sqrt_price_x96 < MAX_SQRT_PRICE:
+        raise ValueError(f"Invalid sqrt price {sqrt_price_x96}")
+
+    tick = math.floor(math.log(sqrt_price_x96 / Q96) / _LOG_SQRT_1_0001)
+    tick = min(max(tick, MIN_TICK), MAX_TICK)
+    while get_sqrt_price_at_tick(tick) > sqrt_price_x96:
+        tick -= 1
+    while tick < MAX_TICK and get_sqrt_price_at_tick(tick + 1) <= sqrt_price_x96:
+        tick += 1
+    return tick
+
+
+class SqrtPriceTable:
+    """
+    Cache of get_sqrt_price_at_tick keyed on tick. Entries are also kept as
+    sorted parallel lists (prices are monotonic in tick), so the inverse
+    lookup bisects the table before falling back to TickMath.
+    """
+
+    __slots__ = ("_prices", "_ticks", "_sorted_prices")
+
+    def __init__(self):
+        self._prices: dict[int, int] = {}
+        self._ticks: list[int] = []
+        self._sorted_prices: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self._ticks)
+
+    def __contains__(self, tick: int) -> bool:
+        return tick in self._prices
+
+    def get(self, tick: int) -> int:
+        """get_sqrt_price_at_tick, computed and stored on first use"""
+        price = self._prices.get(tick)
+        if price is None:
+            price = self._prices[tick] = get_sqrt_price_at_tick(tick)
+            i = bisect_left(self._ticks, tick)
+            self._ticks.insert(i, tick)
+            self._sorted_prices.insert(i, price)
+        return price
+
+    def prefill(self, ticks: Iterable[int]) -> None:
+        """Adds all missing ticks in one pass"""
+        prices = self._prices
+        for tick in ticks:
+            if tick not in prices:
+                prices[tick] = get_sqrt_price_at_tick(tick)
+        self._ticks = sorted(prices)
+        self._sorted_prices = [prices[tick] for tick in self._ticks]
+
+    def tick_at_sqrt_price(self, sqrt_price_x96: int) -> int:
+        """get_tick_at_sqrt_price, bracketed by the cached ticks"""
+        if not MIN_SQRT_PRICE <= sqrt_price_x96 < MAX_SQRT_PRICE:
+            raise ValueError(f"Invalid sqrt price {sqrt_price_x96}")
+        prices = self._sorted_prices
+        i = bisect_right(prices, sqrt_price_x96)
+        lo = self._ticks[i - 1] if i > 0 else MIN_TICK
+        hi = self._ticks[i] if i < len(prices) else MAX_TICK
+        if (i > 0 and prices[i - 1] == sqrt_price_x96) or hi - lo <= 1:
+            return lo
+        # answer lies in [lo, hi - 1]: float estimate, then exact correction
+        tick = math.floor(math.log(sqrt_price_x96 / Q96) / _LOG_SQRT_1_0001)
+        tick = min(max(tick, lo), hi - 1)
+        cached = self._prices.get
+        while (
+            tick > lo
+            and (cached(tick) or get_sqrt_price_at_tick(tick)) > sqrt_price_x96
+        ):
+            tick -= 1
+        while (
+            tick < hi - 1
+            and (cached(tick + 1) or get_sqrt_price_at_tick(tick + 1)) <= sqrt_price_x96
+        ):
+            tick += 1
+        return tick
+
+
+# process-wide table, prefilled on snapshot
+sqrt_price_table = SqrtPriceTable()
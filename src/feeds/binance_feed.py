@@ -1,5 +1,7 @@
 import struct
+from typing import Callable
 from state.orderbook import OrderBook
+from infra.latency import latency
 
 
 _BBA_STRUCT = struct.Struct("<qqbbqqqq")  # offset=8
@@ -15,26 +17,55 @@ class BinanceDepthFeed:
     __slots__ = (
         "orderbook",
         "logger",
+        "on_quote_change",
     )
 
-    def __init__(self, orderbook: OrderBook, logger):
+    def __init__(
+        self,
+        orderbook: OrderBook,
+        logger,
+        on_quote_change: Callable[[], None] | None = None,
+    ):
         self.orderbook = orderbook
         self.logger = logger
+        # called when bid or ask price changed (qty-only updates are ignored)
+        self.on_quote_change = on_quote_change
 
     def process(self, raw_msg: bytes):
         """Process a raw message from main.feed_loop and updates order book"""
         ob = self.orderbook
         (
-            ob.bid_price,
-            ob.ask_price,
-            ob.bid_qty,
-            ob.ask_qty,
-        ) = self.decode_best_bid_ask(raw_msg)
+            price_exp,
+            qty_exp,
+            bid_mantissa,
+            bid_qty_mantissa,
+            ask_mantissa,
+            ask_qty_mantissa,
+        ) = self.decode_best_bid_ask_raw(raw_msg)
+        changed = (
+            bid_mantissa != ob.bid_mantissa
+            or ask_mantissa != ob.ask_mantissa
+            or price_exp != ob.price_exp
+        )
+        ob.bid_mantissa = bid_mantissa
+        ob.ask_mantissa = ask_mantissa
+        ob.price_exp = price_exp
+        price_factor = 10.0**price_exp
+        qty_factor = 10.0**qty_exp
+        ob.bid_price = bid_mantissa * price_factor
+        ob.ask_price = ask_mantissa * price_factor
+        ob.bid_qty = bid_qty_mantissa * qty_factor
+        ob.ask_qty = ask_qty_mantissa * qty_factor
+        if latency.enabled:
+            latency.record("b_decode")
+        # qty-only updates are ignored
+        if changed and self.on_quote_change is not None:
+            self.on_quote_change()
 
     @staticmethod
-    def decode_best_bid_ask(raw: bytes):
+    def decode_best_bid_ask_raw(raw: bytes):
         """
-        Decode byte stream, ref.:
+        Decode byte stream into integer (exponent, mantissa) fields, ref.:
         https://github.com/binance/binance-spot-api-docs/blob/master/sbe/schemas/stream_1_0.xml#L71
         """
         (
@@ -47,6 +78,26 @@ class BinanceDepthFeed:
             ask_mantissa,  # int64
             ask_qty_mantissa,  # int64
         ) = _BBA_STRUCT.unpack_from(raw, 8)
+        return (
+            price_exp,
+            qty_exp,
+            bid_mantissa,
+            bid_qty_mantissa,
+            ask_mantissa,
+            ask_qty_mantissa,
+        )
+
+    @staticmethod
+    def decode_best_bid_ask(raw: bytes):
+        """Decode byte stream into float bid/ask price and qty"""
+        (
+            price_exp,
+            qty_exp,
+            bid_mantissa,
+            bid_qty_mantissa,
+            ask_mantissa,
+            ask_qty_mantissa,
+        ) = BinanceDepthFeed.decode_best_bid_ask_raw(raw)
 
         price_factor = 10.0**price_exp
         qty_factor = 10.0**qty_exp
@@ -0,0 +1,99 @@
+"""
+Fixed-layout decoders for PoolManager event data.
+
+Swap and ModifyLiquidity only contain static 32-byte words, so the generic
+eth_abi type-string parsing can be replaced by precomputed slices.
+"""
+
+_WORD_HEX = 64  # hex chars per 32-byte word
+_INT256_SIGN = 1 << 255
+_INT256_MOD = 1 << 256
+
+# Swap(int128 amount0, int128 amount1, uint160 sqrtPriceX96, uint128 liquidity,
+#      int24 tick, int24 fee)
+SWAP_WORDS = 6
+# ModifyLiquidity(int24 tickLower, int24 tickUpper, int256 liquidityDelta,
+#                 bytes32 salt)
+MODIFY_LIQUIDITY_WORDS = 4
+
+
+def _hex_slices(n_words: int) -> tuple[slice, ...]:
+    """Slices of each word in a '0x' prefixed hex string"""
+    return tuple(
+        slice(2 + i * _WORD_HEX, 2 + (i + 1) * _WORD_HEX) for i in range(n_words)
+    )
+
+
+def _byte_slices(n_words: int) -> tuple[slice, ...]:
+    """Slices of each word in raw bytes"""
+    return tuple(slice(i * 32, (i + 1) * 32) for i in range(n_words))
+
+
+_SWAP_HEX = _hex_slices(SWAP_WORDS)
+_SWAP_BYTES = _byte_slices(SWAP_WORDS)
+_MODIFY_HEX = _hex_slices(MODIFY_LIQUIDITY_WORDS)
+_MODIFY_BYTES = _byte_slices(MODIFY_LIQUIDITY_WORDS)
+
+
+def _signed(word: int) -> int:
+    """Two's complement of a 256-bit word (sign-extended int<N> as well)"""
+    return word - _INT256_MOD if word >= _INT256_SIGN else word
+
+
+def _check_length(data, n_words: int) -> None:
+    if isinstance(data, (bytes, bytearray)):
+        expected = n_words * 32
+    else:
+        expected = 2 + n_words * _WORD_HEX
+    if len(data) != expected:
+        raise ValueError(f"Invalid event data length {len(data)}, expected {expected}")
+
+
+def decode_swap_data(data) -> tuple[int, int, int, int, int, int]:
+    """
+    Decode Swap event data given as '0x' hex string or bytes.
+    Returns (amount0, amount1, sqrt_price_x96, liquidity, tick, fee)
+    """
+    _check_length(data, SWAP_WORDS)
+    if isinstance(data, (bytes, bytearray)):
+        s0, s1, s2, s3, s4, s5 = _SWAP_BYTES
+        return (
+            int.from_bytes(data[s0], "big", signed=True),
+            int.from_bytes(data[s1], "big", signed=True),
+            int.from_bytes(data[s2], "big"),
+            int.from_bytes(data[s3], "big"),
+            int.from_bytes(data[s4], "big", signed=True),
+            int.from_bytes(data[s5], "big", signed=True),
+        )
+    s0, s1, s2, s3, s4, s5 = _SWAP_HEX
+    return (
+        _signed(int(data[s0], 16)),
+        _signed(int(data[s1], 16)),
+        int(data[s2], 16),
+        int(data[s3], 16),
+        _signed(int(data[s4], 16)),
+        _signed(int(data[s5], 16)),
+    )
+
+
+def decode_modify_liquidity_data(data) -> tuple[int, int, int, bytes]:
+    """
+    Decode ModifyLiquidity event data given as '0x' hex string or bytes.
+    Returns (tick_lower, tick_upper, liquidity_delta, salt)
+    """
+    _check_length(data, MODIFY_LIQUIDITY_WORDS)
+    if isinstance(data, (bytes, bytearray)):
+        s0, s1, s2, s3 = _MODIFY_BYTES
+        return (
+            int.from_bytes(data[s0], "big", signed=True),
+            int.from_bytes(data[s1], "big", signed=True),
+            int.from_bytes(data[s2], "big", signed=True),
+            bytes(data[s3]),
+        )
+    s0, s1, s2, s3 = _MODIFY_HEX
+    return (
+        _signed(int(data[s0], 16)),
+        _signed(int(data[s1], 16)),
+        _signed(int(data[s2], 16)),
+        bytes.fromhex(data[s3]),
+    )
@@ -1,5 +1,7 @@
 import asyncio
+import re
 from logging import Logger
+from typing import Callable
 import orjson
 import brotli
 from eth_abi import decode as abi_decode
@@ -7,11 +9,21 @@ from eth_abi import decode as abi_decode
 from config import (
     UNICHAIN_POOL_MANAGER,
     UNISWAP_POOL_ID,
+    WALLET_ADDRESS,
+    UNICHAIN_RPC_URL,
+    ALCHEMY_API_KEY,
+    GAP_RECOVERY_MAX_BLOCKS,
+    GAP_RECOVERY_TIMEOUT,
 )
-from clients.uniswap.snapshot import snapshot_once
-from state.pool import Pool, Tick
+from clients.uniswap.snapshot import snapshot_once, fetch_pool_logs
+from feeds.event_decoder import decode_swap_data, decode_modify_liquidity_data
+from state.pool import Pool
+from state.pool_cache import PoolCheckpoint
 from state.flashblocks import FlashblockBuffer
 from engine.detector import ArbDetector
+from engine.tick_math import sqrt_price_table
+from infra.latency import latency
+from infra.web3 import connect_web3_async
 
 SWAP_TOPIC = "0x40e9cecb9f5f1f1c5b9c97dec2917b7ee92e57ba5563708daca94dd84ad7112f"
 MODIFY_LIQ_TOPIC = "0xf208f4912782fd25c7f114ca3723a2d5dd6f3bcc3ac8db5af63baa85f711d5ec"
@@ -19,6 +31,16 @@ DONATE_TOPIC = "0x29ef05caaff9404b7cb6d1c0e9bbae9eaa7ab2541feba1a9c4248594c08156
 
 pool_manager = UNICHAIN_POOL_MANAGER.lower()
 pool_id = UNISWAP_POOL_ID.lower()
+wallet = (WALLET_ADDRESS or "").lower()
+
+# byte-level prefilter: every relevant event carries our pool id as topic[1],
+# our own txs additionally reference our wallet (e.g. in Transfer topics)
+_RELEVANT_NEEDLES = tuple(
+    needle.removeprefix("0x").encode() for needle in (pool_id, wallet) if needle
+)
+# top-level "index" and "metadata.block_number" are the only unquoted ints
+_INDEX_RE = re.compile(rb'"index"\s*:\s*(\d+)')
+_BLOCK_NUMBER_RE = re.compile(rb'"block_number"\s*:\s*(\d+)')
 
 # sqrt_price_x96
 Q96 = 2**96
@@ -39,7 +61,15 @@ class UnichainFlashFeed:
         "last_block",
         "last_flashblock_index",
         "on_flashblock_done",
+        "on_sync_lost",
         "flashblock_buffer",
+        "verify_decoding",
+        "snapshot_count",
+        "ticks_complete",
+        "_applied_block",
+        "_applied_txs",
+        "_recovery",
+        "_w3",
     )
 
     def __init__(
@@ -48,22 +78,61 @@ class UnichainFlashFeed:
         logger: Logger,
         on_flashblock_done: ArbDetector.on_flashblock_done,
         flashblock_buffer: FlashblockBuffer,
+        verify_decoding: bool = False,
+        on_sync_lost: Callable[[], None] | None = None,
     ):
         self.pool = pool
         self.logger = logger
         self.on_flashblock_done = on_flashblock_done
+        # called when the pool state stops following the chain
+        self.on_sync_lost = on_sync_lost
         self.flashblock_buffer = flashblock_buffer
+        # cross-check fast decoder against eth_abi for every event
+        self.verify_decoding = verify_decoding
 
         self.snapshot_block_number: int | None = None
         self.buffer: list[tuple] = []
         self.last_block: int | None = None
         self.last_flashblock_index: int | None = None
-
-    def create_snapshot(self, ticks_raw, snapshot_block_number: int):
-        """Loads snapshot + set block number"""
+        # incremented per snapshot, background tick chunks are merged only
+        # into the snapshot they belong to
+        self.snapshot_count = 0
+        # False while a progressive snapshot still fills outer ticks
+        self.ticks_complete = True
+        # txs with pool events applied from flashblocks of _applied_block,
+        # skipped when that block is partially refetched in a gap recovery
+        self._applied_block: int | None = None
+        self._applied_txs: set[str] = set()
+        self._recovery: asyncio.Task | None = None
+        self._w3 = None
+
+    def create_snapshot(
+        self,
+        ticks_raw,
+        snapshot_block_number: int,
+        slot0: tuple[int, int, int] | None = None,
+        complete: bool = True,
+    ):
+        """Loads snapshot + set block number, slot0 = (sqrt_price, liquidity, tick)"""
         self.pool.load_ticks(ticks_raw)
+        self.snapshot_count += 1
+        self.ticks_complete = complete
+        if slot0 is not None:
+            self._process_swap_event(*slot0)
         self.set_snapshot_block(snapshot_block_number)
 
+    def merge_ticks(self, ticks_raw, generation: int) -> bool:
+        """
+        Adds ticks read at the snapshot block on top of the liquidity changes
+        applied since. Returns 'False' if a newer snapshot replaced the ticks
+        """
+        if generation != self.snapshot_count:
+            return False
+        ticks = self.pool.ticks
+        for tick, liquidity_gross, liquidity_net in ticks_raw:
+            ticks.update(int(tick), int(liquidity_gross), int(liquidity_net))
+        return True
+
     def set_snapshot_block(self, block_number: int):
         """Sets the snapshot block number and flushes any buffered messages."""
         self.snapshot_block_number = block_number
@@ -79,22 +148,110 @@ class UnichainFlashFeed:
     def process(self, raw_msg: bytes) -> None:
         """Process a raw message from main.feed_loop"""
         raw = brotli.decompress(raw_msg)
+        self._process_raw(raw)
+        # counts towards own tx inclusion timeouts
+        self.flashblock_buffer.on_flashblock()
+
+    def _process_raw(self, raw: bytes) -> None:
+        """Decodes a decompressed flashblock and applies it"""
+        # fast path: skip full JSON parse for flashblocks not touching our pool
+        if not self._is_relevant(raw):
+            header = self._extract_header(raw)
+            if header is not None:
+                if latency.enabled:
+                    latency.record("u_decode")
+                self._process_irrelevant(*header)
+                return
+
         payload = orjson.loads(raw)
+        if latency.enabled:
+            latency.record("u_decode")
 
         block_number = payload.get("metadata", {}).get("block_number", None)
         index = payload.get("index", None)
         self._check_for_gap(block_number, index)
+        own = bool(wallet) and wallet[2:].encode() in raw
+        if own or self.flashblock_buffer.waiters:
+            # independent of pool state, also while waiting for a snapshot
+            self._resolve_own_txs(payload, block_number, index, own)
 
         if self.snapshot_block_number is None:
             self.buffer.append((block_number, index, payload))
             return
         self._process_block(payload, block_number, index)
 
+    def _is_relevant(self, raw: bytes) -> bool:
+        """Returns 'True' if the decompressed payload may contain our events"""
+        for needle in _RELEVANT_NEEDLES:
+            if needle in raw:
+                return True
+        # own txs without pool events (e.g. reverted) must still resolve
+        for tx_hash in self.flashblock_buffer.waiters:
+            if tx_hash.encode() in raw:
+                return True
+        return False
+
+    def _resolve_own_txs(
+        self, payload: dict, block_number: int, index: int, own: bool
+    ) -> None:
+        """
+        Resolves own txs in this flashblock: waited for tx hashes and, if our
+        wallet occurs in the payload (own=True), txs with our wallet in a log
+        topic, e.g. Transfers of our swaps seen before their waiter exists.
+        Receipts carry no sender, reverted txs only resolve by hash.
+        """
+        receipts = payload.get("metadata", {}).get("receipts", {})
+        waiters = self.flashblock_buffer.waiters
+        own_txs = [tx_hash for tx_hash in waiters if tx_hash in receipts]
+        if own:
+            own_txs += [
+                tx_hash
+                for tx_hash, receipt in receipts.items()
+                if tx_hash not in waiters and self._references_wallet(receipt)
+            ]
+        for tx_hash in own_txs:
+            ((_tx_type, tx_data),) = receipts[tx_hash].items()
+            success = tx_data.get("status") == "0x1"
+            self.flashblock_buffer.resolve_tx(
+                tx_hash, block_number, index, success, receipt=tx_data
+            )
+
+    @staticmethod
+    def _references_wallet(receipt: dict) -> bool:
+        """True if a log topic (e.g. Transfer from/to) is our wallet"""
+        ((_tx_type, tx_data),) = receipt.items()
+        address = wallet[2:]
+        for log in tx_data.get("logs", ()):
+            for topic in log["topics"][1:]:
+                if topic.endswith(address):
+                    return True
+        return False
+
+    @staticmethod
+    def _extract_header(raw: bytes) -> tuple[int, int] | None:
+        """Returns (block_number, index) without parsing the payload"""
+        block_match = _BLOCK_NUMBER_RE.search(raw)
+        index_match = _INDEX_RE.search(raw)
+        if block_match is None or index_match is None:
+            return None
+        return int(block_match.group(1)), int(index_match.group(1))
+
+    def _process_irrelevant(self, block_number: int, index: int) -> None:
+        """Gap check + hook for a flashblock without pool events"""
+        self._check_for_gap(block_number, index)
+        if self.snapshot_block_number is None:
+            # nothing to buffer, no events to apply after snapshot
+            return
+        self.on_flashblock_done(block_number, index)
+
     def _process_block(self, payload: dict, block_number: int, index: int) -> None:
         """Filters a block's transactions and applies relevant events."""
         try:
             receipts = payload.get("metadata", {}).get("receipts", {})
             swap_tx_hashes: list[str] = []
+            if block_number != self._applied_block:
+                self._applied_block = block_number
+                self._applied_txs = set()
 
             for tx_hash, receipt in receipts.items():
                 ((_tx_type, tx_data),) = receipt.items()  # only one tx_type per receipt
@@ -114,6 +271,8 @@ class UnichainFlashFeed:
                     topics = log.get("topics")
                     if not topics:
                         continue
+                    if len(topics) > 1 and topics[1] == pool_id:
+                        self._applied_txs.add(tx_hash)
                     if self._process_event(log.get("data", ""), topics):
                         swap_in_tx = True
                         break
@@ -141,17 +300,21 @@ class UnichainFlashFeed:
         """
         if topics[0] == SWAP_TOPIC and topics[1] == pool_id:
             # SWAP event
-            _amount0, _amount1, sqrt_price_x96, liquidity, tick, _fee = (
-                self.decode_swap(data)
-            )
+            decoded = self.decode_swap(data)
+            if self.verify_decoding:
+                self._verify_decoded(decoded, self.decode_swap_abi(data), data)
+            _amount0, _amount1, sqrt_price_x96, liquidity, tick, _fee = decoded
             self._process_swap_event(sqrt_price_x96, liquidity, tick)
             return True
 
         elif topics[0] == MODIFY_LIQ_TOPIC and topics[1] == pool_id:
             # MODIFY_LIQUIDITY event
-            tick_lower, tick_upper, liq_delta, _salt = self.decode_modify_liquidity(
-                data
-            )
+            decoded = self.decode_modify_liquidity(data)
+            if self.verify_decoding:
+                self._verify_decoded(
+                    decoded, self.decode_modify_liquidity_abi(data), data
+                )
+            tick_lower, tick_upper, liq_delta, _salt = decoded
             self._process_modify_liquidity_event(tick_lower, tick_upper, liq_delta)
             return False
 
@@ -185,37 +348,16 @@ class UnichainFlashFeed:
 
         tick_lower = int(tick_lower)
         tick_upper = int(tick_upper)
-        delta_abs = abs(liq_delta)
-        ticks = self.pool.ticks
-
-        def get_or_create_tick(idx: int) -> Tick:
-            t = ticks.get(idx)
-            if t is None:
-                t = Tick(liquidity_gross=0, liquidity_net=0)
-                ticks[idx] = t
-            return t
-
-        lower_tick = get_or_create_tick(tick_lower)
-        upper_tick = get_or_create_tick(tick_upper)
-
-        # Update lower tick: +|ΔL| gross, +ΔL net
-        lower_tick.liquidity_gross += delta_abs
-        lower_tick.liquidity_net += liq_delta
-
-        # Update upper tick: +|ΔL| gross, -ΔL net
-        upper_tick.liquidity_gross += delta_abs
-        upper_tick.liquidity_net -= liq_delta
-
-        if lower_tick.liquidity_gross == 0:
-            del ticks[tick_lower]
-
-        if upper_tick.liquidity_gross == 0 and tick_upper in ticks:
-            del ticks[tick_upper]
+        self.pool.update_liquidity(tick_lower, tick_upper, liq_delta)
+        # extend sqrt price cache with new tick boundaries
+        sqrt_price_table.get(tick_lower)
+        sqrt_price_table.get(tick_upper)
 
     def _check_for_gap(self, block_number: int, index: int) -> None:
         """Checks for gaps in block numbers and flashblock indices."""
         if self.last_flashblock_index is None:
             self.last_flashblock_index = index
+            self.last_block = block_number
             return
 
         # 0 = new block, 1-5 = flashblocks
@@ -226,7 +368,7 @@ class UnichainFlashFeed:
                     self.last_flashblock_index,
                     index,
                 )
-                self.request_resync()
+                self._on_gap(block_number, index)
                 return
         self.last_flashblock_index = index
 
@@ -242,22 +384,175 @@ class UnichainFlashFeed:
                 self.last_block,
                 block_number,
             )
+            self._on_gap(block_number, index)
+            return
+        self.last_block = block_number
+
+    def _on_gap(self, block_number: int, index: int) -> None:
+        """
+        Recovers the flashblocks missed before (block_number, index) from
+        eth_getLogs, full resync if that's not possible
+        """
+        resume = self._resume_point()
+        if resume is None or self.last_block is None or block_number < self.last_block:
             self.request_resync()
             return
+
+        from_block, skip_txs = resume
         self.last_block = block_number
+        self.last_flashblock_index = index
+        to_block = self.live_block()
+        if to_block - from_block + 1 > GAP_RECOVERY_MAX_BLOCKS:
+            self.request_resync()
+            return
+        if to_block < from_block:
+            return
+        # buffers flashblocks until the recovered state is at to_block
+        self._lose_sync()
+        self._recovery = asyncio.create_task(
+            self._recover_gap(from_block, to_block, skip_txs)
+        )
+
+    def _resume_point(self) -> tuple[int, set[str]] | None:
+        """
+        (first block not fully in state, its txs already applied),
+        None while not synced
+        """
+        if self.snapshot_block_number is None:
+            return None
+        # last_block may be partially applied, events up to the snapshot are in state
+        from_block = self.snapshot_block_number + 1
+        if self.last_block is not None and self.last_block > from_block:
+            from_block = self.last_block
+        skip_txs = self._applied_txs if self._applied_block == from_block else set()
+        return from_block, set(skip_txs)
+
+    def live_block(self) -> int:
+        """Last block fully before the latest flashblock seen"""
+        # a new block's index 0 means the previous one is complete
+        if self.last_flashblock_index == 0:
+            return self.last_block - 1
+        return self.last_block
+
+    def checkpoint(self) -> PoolCheckpoint | None:
+        """Current pool state for a warm restart, None while not synced"""
+        resume = self._resume_point()
+        if resume is None or not self.ticks_complete:
+            return None
+        pool = self.pool
+        return PoolCheckpoint(
+            from_block=resume[0],
+            applied_txs=resume[1],
+            sqrt_price_x96=pool.sqrt_price_x96,
+            active_liquidity=pool.active_liquidity,
+            current_tick=pool.current_tick,
+            ticks=list(pool.ticks.items()),
+        )
+
+    def restore(self, checkpoint: PoolCheckpoint) -> None:
+        """Loads a checkpoint into the pool, catch_up() applies what followed"""
+        self.pool.ticks.load(checkpoint.ticks)
+        if checkpoint.sqrt_price_x96 is not None:
+            self._process_swap_event(
+                checkpoint.sqrt_price_x96,
+                checkpoint.active_liquidity,
+                checkpoint.current_tick,
+            )
+        sqrt_price_table.prefill(self.pool.ticks)
+
+    async def catch_up(
+        self, from_block: int, skip_txs: set[str], max_blocks: int
+    ) -> None:
+        """
+        Applies pool logs from from_block up to the live feed, then the buffer.
+        Requires a received flashblock, full resync if the range is too large
+        """
+        to_block = max(self.live_block(), from_block - 1)
+        if to_block - from_block + 1 > max_blocks:
+            self.request_resync()
+            return
+        self._recovery = asyncio.create_task(
+            self._recover_gap(from_block, to_block, skip_txs)
+        )
+        # a resync cancels the recovery, not the caller
+        await asyncio.wait([self._recovery])
+
+    async def _recover_gap(
+        self, from_block: int, to_block: int, skip_txs: set[str]
+    ) -> None:
+        """Applies pool logs of [from_block, to_block], then the buffer"""
+        if self._w3 is None:
+            self._w3 = connect_web3_async(UNICHAIN_RPC_URL + ALCHEMY_API_KEY)
+        try:
+            logs = await asyncio.wait_for(
+                fetch_pool_logs(self._w3, from_block, to_block), GAP_RECOVERY_TIMEOUT
+            )
+        except Exception:
+            self.logger.exception(
+                "Gap recovery for blocks %s-%s failed", from_block, to_block
+            )
+            self._recovery = None
+            self.request_resync()
+            return
+        self._recovery = None
+
+        logs = [log for log in logs if log[0] not in skip_txs]
+        for _tx_hash, _data, topics in logs:
+            if topics[0] not in (SWAP_TOPIC, MODIFY_LIQ_TOPIC):
+                # e.g. DONATE, not tracked
+                self.logger.warning("Unhandled event %s in gap", topics[0])
+                self.request_resync()
+                return
+        for _tx_hash, data, topics in logs:
+            self._process_event(data, topics)
+
+        self.logger.warning(
+            "Recovered gap from logs: blocks %s-%s, %s events",
+            from_block,
+            to_block,
+            len(logs),
+        )
+        self.set_snapshot_block(to_block)
 
     def request_resync(self):
         """Request new snapshot"""
-        self.snapshot_block_number = None
+        if self._recovery is not None:
+            self._recovery.cancel()
+            self._recovery = None
+        self._lose_sync()
         self.last_block = None
         self.last_flashblock_index = None
 
         self.logger.warning("Detected diverging local state, resyncing...")
         asyncio.create_task(snapshot_once(self, self.logger))
 
+    def _lose_sync(self) -> None:
+        """Buffers flashblocks until set_snapshot_block, detection pauses"""
+        self.snapshot_block_number = None
+        if self.on_sync_lost is not None:
+            self.on_sync_lost()
+
+    def _verify_decoded(self, fast: tuple, reference: tuple, data) -> None:
+        """Raises if fast decoder and eth_abi disagree"""
+        if tuple(fast) != tuple(reference):
+            self.logger.error(
+                "Decoder mismatch: fast=%s, eth_abi=%s, data=%s", fast, reference, data
+            )
+            raise ValueError("Fast event decoder diverged from eth_abi")
+
     @staticmethod
     def decode_swap(data_hex: str):
-        """Decode Swap event data."""
+        """Decode Swap event data (hot path)."""
+        return decode_swap_data(data_hex)
+
+    @staticmethod
+    def decode_modify_liquidity(data_hex: str):
+        """Decode ModifyLiquidity event data (hot path)."""
+        return decode_modify_liquidity_data(data_hex)
+
+    @staticmethod
+    def decode_swap_abi(data_hex: str):
+        """Decode Swap event data via eth_abi (verification)."""
         data_bytes = bytes.fromhex(data_hex[2:])
         return abi_decode(
             [
@@ -272,8 +567,8 @@ class UnichainFlashFeed:
         )
 
     @staticmethod
-    def decode_modify_liquidity(data_hex: str):
-        """Decode ModifyLiquidity event data"""
+    def decode_modify_liquidity_abi(data_hex: str):
+        """Decode ModifyLiquidity event data via eth_abi (verification)."""
         data_bytes = bytes.fromhex(data_hex[2:])  # strip '0x'
         return abi_decode(
             [
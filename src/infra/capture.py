@@ -0,0 +1,96 @@
+import os
+import time
+import struct
+import asyncio
+from typing import Iterator
+
+# file header + per-frame record header:
+# channel (uint8), flags (uint8), monotonic receive time ns (uint64), length (uint32)
+CAPTURE_MAGIC = b"DXARBCAP"
+_RECORD = struct.Struct("<BBQI")
+_FLAG_TEXT = 0x01
+
+# channel ids
+CHANNEL_UNICHAIN = 0
+CHANNEL_BINANCE = 1
+
+
+class FrameRecorder:
+    """Appends raw WebSocket frames to an append-only binary log"""
+
+    __slots__ = ("path", "_file")
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        is_new = not os.path.isfile(path) or os.path.getsize(path) == 0
+        self._file = open(path, "ab")  # pylint: disable=consider-using-with
+        if is_new:
+            self._file.write(CAPTURE_MAGIC)
+
+    def record(self, channel: int, recv_ns: int, frame: bytes | str) -> None:
+        """Appends a single frame, text frames are stored utf-8 encoded"""
+        flags = 0
+        if isinstance(frame, str):
+            frame = frame.encode()
+            flags = _FLAG_TEXT
+        self._file.write(_RECORD.pack(channel, flags, recv_ns, len(frame)))
+        self._file.write(frame)
+
+    def close(self) -> None:
+        """Flushes and closes the log file"""
+        if not self._file.closed:
+            self._file.close()
+
+
+def read_frames(path: str) -> Iterator[tuple[int, int, bytes | str]]:
+    """Yields (channel, recv_ns, frame) from a capture file in order"""
+    with open(path, "rb") as f:
+        if f.read(len(CAPTURE_MAGIC)) != CAPTURE_MAGIC:
+            raise ValueError(f"Not a frame capture: {path}")
+        while True:
+            header = f.read(_RECORD.size)
+            if len(header) < _RECORD.size:
+                return  # EOF or truncated tail of a crashed writer
+            channel, flags, recv_ns, length = _RECORD.unpack(header)
+            frame = f.read(length)
+            if len(frame) < length:
+                return
+            yield channel, recv_ns, frame.decode() if flags & _FLAG_TEXT else frame
+
+
+async def replay_frames(
+    path: str, queues: dict[int, asyncio.Queue], realtime: bool = True
+) -> int:
+    """
+    Pushes captured frames into the per-channel queues consumed by feed_loop,
+    stamped with the replay receive time.
+    realtime=True keeps the original inter-arrival times, otherwise max speed
+    with each frame processed before the next one is pushed, so channels
+    interleave in recorded order.
+    Returns number of replayed frames.
+    """
+    first_recv_ns = None
+    start_ns = 0
+    count = 0
+    for channel, recv_ns, frame in read_frames(path):
+        queue = queues.get(channel)
+        if queue is None:
+            continue
+        if realtime:
+            if first_recv_ns is None:
+                first_recv_ns = recv_ns
+                start_ns = time.monotonic_ns()
+            delay_ns = (recv_ns - first_recv_ns) - (time.monotonic_ns() - start_ns)
+            if delay_ns > 0:
+                await asyncio.sleep(delay_ns / 1e9)
+        await queue.put((time.monotonic_ns(), frame))
+        if not realtime:
+            # put doesn't yield while the queue has room
+            await queue.join()
+        count += 1
+    for queue in queues.values():
+        await queue.join()
+    return count
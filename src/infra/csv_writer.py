@@ -0,0 +1,141 @@
+import os
+import csv
+import time
+import queue
+import atexit
+import logging
+import threading
+from typing import TextIO
+from config import CSV_FLUSH_ROWS, CSV_FLUSH_INTERVAL
+
+_STOP = object()
+
+
+class CsvWriter:
+    """
+    Appends rows to csv files from a background thread. append() only
+    enqueues, files stay open and are flushed every flush_rows rows or
+    flush_interval seconds after the first unflushed row, and on close().
+    """
+
+    __slots__ = (
+        "directory",
+        "flush_rows",
+        "flush_interval",
+        "_queue",
+        "_thread",
+        "_lock",
+        "_files",
+    )
+
+    def __init__(
+        self,
+        directory: str = "out",
+        flush_rows: int = CSV_FLUSH_ROWS,
+        flush_interval: float = CSV_FLUSH_INTERVAL,
+    ):
+        self.directory = directory
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self._queue = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        # filename -> (file, DictWriter), writer thread only
+        self._files: dict[str, tuple[TextIO, csv.DictWriter]] = {}
+
+    def append(self, filename: str, row: dict) -> None:
+        """Queues a row for filename in directory, header taken from the first row"""
+        if self._thread is None:
+            self._start()
+        self._queue.put((filename, row))
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Blocks until all rows queued so far are written and flushed"""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        """Flushes and closes all files, stops the thread"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join()
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            self._thread = threading.Thread(
+                target=self._run, name="csv-writer", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        pending = 0
+        deadline = None
+        while True:
+            timeout = None
+            if deadline is not None:
+                timeout = max(deadline - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None  # flush_interval elapsed
+
+            if item is None or isinstance(item, threading.Event):
+                self._flush_all()
+                pending, deadline = 0, None
+                if item is not None:
+                    item.set()
+            elif item is _STOP:
+                self._flush_all()
+                for f, _writer in self._files.values():
+                    f.close()
+                self._files.clear()
+                return
+            else:
+                self._write(*item)
+                pending += 1
+                if pending >= self.flush_rows:
+                    self._flush_all()
+                    pending, deadline = 0, None
+                elif deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+    def _write(self, filename: str, row: dict) -> None:
+        try:
+            entry = self._files.get(filename)
+            if entry is None:
+                entry = self._open(filename, row)
+            entry[1].writerow(row)
+        except (OSError, ValueError):
+            logging.getLogger().exception("Failed to write row to %s", filename)
+
+    def _open(self, filename: str, row: dict) -> tuple[TextIO, csv.DictWriter]:
+        path = os.path.join(self.directory, filename)
+        is_new = not os.path.isfile(path) or os.path.getsize(path) == 0
+        # pylint: disable-next=consider-using-with
+        f = open(path, mode="a", newline="", encoding="utf-8")
+        writer = csv.DictWriter(f, fieldnames=row.keys())
+        if is_new:
+            writer.writeheader()
+        self._files[filename] = (f, writer)
+        return f, writer
+
+    def _flush_all(self) -> None:
+        for filename, (f, _writer) in self._files.items():
+            try:
+                f.flush()
+            except OSError:
+                logging.getLogger().exception("Failed to flush %s", filename)
+
+
+# process-wide writer for out/, used via infra.monitoring.append_row_to_csv
+csv_writer = CsvWriter()
+atexit.register(csv_writer.close)
@@ -0,0 +1,168 @@
+import time
+import asyncio
+from logging import Logger
+
+# pipeline stages, each measured from the WebSocket receive of the triggering frame
+STAGES = (
+    "b_decode",  # BinanceDepthFeed.process done
+    "u_decode",  # UnichainFlashFeed.process payload decoded
+    "detect",  # ArbDetector.on_flashblock_done
+    "sign",  # tx signed
+    "bundle",  # eth_sendBundle response
+    "binance",  # Binance order response
+)
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+# log-linear buckets (HDR style): 16 sub-buckets per power of two -> <= 6.25% error
+_SUB_BITS = 4
+_SUB_COUNT = 1 << _SUB_BITS
+_MAX_BITS = 40  # ~12.7 days in us, larger values are clamped
+_N_BUCKETS = (_MAX_BITS - _SUB_BITS) * _SUB_COUNT
+
+
+def _bucket_index(value: int) -> int:
+    if value < _SUB_COUNT:
+        return max(value, 0)
+    shift = value.bit_length() - _SUB_BITS - 1
+    index = shift * _SUB_COUNT + (value >> shift)
+    return index if index < _N_BUCKETS else _N_BUCKETS - 1
+
+
+def _bucket_upper(index: int) -> int:
+    """Highest value counted in bucket 'index'"""
+    if index < _SUB_COUNT:
+        return index
+    shift = index // _SUB_COUNT - 1
+    top = index - shift * _SUB_COUNT
+    return ((top + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of latencies in microseconds"""
+
+    __slots__ = ("counts", "count", "max")
+
+    def __init__(self):
+        self.counts = [0] * _N_BUCKETS
+        self.count = 0
+        self.max = 0
+
+    def record(self, value_us: int) -> None:
+        """Adds a single value"""
+        self.counts[_bucket_index(value_us)] += 1
+        self.count += 1
+        if value_us > self.max:
+            self.max = value_us
+
+    def percentile(self, q: float) -> int:
+        """Returns upper bound of the bucket holding quantile q (0..1)"""
+        if self.count == 0:
+            return 0
+        rank = max(1, int(q * self.count + 0.5))
+        seen = 0
+        for index, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return min(_bucket_upper(index), self.max)
+        return self.max
+
+
+class LatencyTracker:
+    """
+    Per-stage latency histograms relative to the WebSocket receive time.
+    Call sites check 'enabled' before stamping, so disabled cost is one
+    attribute lookup.
+    """
+
+    __slots__ = ("enabled", "origin_ns", "histograms")
+
+    def __init__(self, stages: tuple[str, ...] = STAGES, enabled: bool = False):
+        self.enabled = enabled
+        # receive time of the frame currently processed by feed_loop
+        self.origin_ns = 0
+        self.histograms = {stage: LatencyHistogram() for stage in stages}
+
+    def record(self, stage: str, origin_ns: int | None = None) -> None:
+        """Records now - origin_ns (default: current frame) for stage"""
+        if origin_ns is None:
+            origin_ns = self.origin_ns
+        if origin_ns == 0:
+            return
+        self.histograms[stage].record((time.monotonic_ns() - origin_ns) // 1000)
+
+    def summary(self) -> dict[str, dict]:
+        """Returns count, quantiles and max per recorded stage (us)"""
+        out = {}
+        for stage, h in self.histograms.items():
+            if h.count == 0:
+                continue
+            out[stage] = {
+                "count": h.count,
+                **{f"p{q * 100:g}": h.percentile(q) for q in QUANTILES},
+                "max": h.max,
+            }
+        return out
+
+    def render_metrics(self) -> str:
+        """Prometheus text exposition of all stages"""
+        lines = []
+        for stage, h in self.histograms.items():
+            for q in QUANTILES:
+                lines.append(
+                    f'latency_us{{stage="{stage}",quantile="{q}"}} {h.percentile(q)}'
+                )
+            lines.append(f'latency_us_max{{stage="{stage}"}} {h.max}')
+            lines.append(f'latency_us_count{{stage="{stage}"}} {h.count}')
+        return "\n".join(lines) + "\n"
+
+
+# process-wide tracker, enabled in main.py
+latency = LatencyTracker()
+
+
+async def log_latency(tracker: LatencyTracker, logger: Logger, interval=60):
+    """Periodically logs per-stage percentiles"""
+    while True:
+        await asyncio.sleep(interval)
+        for stage, s in tracker.summary().items():
+            logger.info(
+                "Latency %s [us]: n=%s p50=%s p90=%s p99=%s p99.9=%s max=%s",
+                stage,
+                s["count"],
+                s["p50"],
+                s["p90"],
+                s["p99"],
+                s["p99.9"],
+                s["max"],
+            )
+
+
+async def start_metrics_server(
+    tracker: LatencyTracker, host: str, port: int
+) -> asyncio.Server:
+    """Starts the metrics endpoint, port 0 binds a free port"""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            await reader.readuntil(b"\r\n\r\n")
+            body = tracker.render_metrics().encode()
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: text/plain; version=0.0.4\r\n"
+                b"Content-Length: " + str(len(body)).encode() + b"\r\n"
+                b"Connection: close\r\n\r\n" + body
+            )
+            await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
+
+
+async def serve_metrics(tracker: LatencyTracker, host: str, port: int) -> None:
+    """Serves render_metrics() on a local HTTP endpoint"""
+    server = await start_metrics_server(tracker, host, port)
+    async with server:
+        await server.serve_forever()
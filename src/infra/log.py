@@ -0,0 +1,76 @@
+import queue
+import logging
+from logging.handlers import QueueHandler, QueueListener
+from config import LOG_LEVEL, QUOTE_LOG_EVERY, QUOTE_LOG_LEVEL
+
+LOG_FORMAT = "%(asctime)s %(levelname)s: %(message)s"
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Enqueues records as they are, %-formatting of msg/args happens in the
+    listener thread. Args must not be mutated after logging.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def setup_logging(level: str = LOG_LEVEL, fmt: str = LOG_FORMAT) -> QueueListener:
+    """
+    Routes the root logger through a queue to a stream handler running on a
+    listener thread. Returns the started listener, stop() it on shutdown.
+    """
+    # not used by fmt, skips collecting them per record (findCaller walks the stack)
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    logging._srcfile = None  # pylint: disable=protected-access
+
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(fmt))
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, handler, respect_handler_level=True)
+
+    root = logging.getLogger()
+    for h in root.handlers[:]:
+        root.removeHandler(h)
+    root.addHandler(DeferredQueueHandler(log_queue))
+    root.setLevel(level)
+    listener.start()
+    return listener
+
+
+class SampledLogger:
+    """
+    Emits every n-th record of a per-event log line at a fixed level.
+    Check due() before computing args, skipped calls cost a counter increment.
+    """
+
+    __slots__ = ("logger", "level", "every", "_count")
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        level: str | int = QUOTE_LOG_LEVEL,
+        every: int = QUOTE_LOG_EVERY,
+    ):
+        self.logger = logger
+        self.level = logging.getLevelName(level) if isinstance(level, str) else level
+        # <= 0 disables the line
+        self.every = every
+        self._count = 0
+
+    def due(self) -> bool:
+        """True on every n-th call if the level is enabled"""
+        if self.every <= 0:
+            return False
+        self._count += 1
+        if self._count < self.every:
+            return False
+        self._count = 0
+        return self.logger.isEnabledFor(self.level)
+
+    def log(self, msg: str, *args) -> None:
+        """Logs at the configured level, formatted lazily"""
+        self.logger.log(self.level, msg, *args)
@@ -1,8 +1,7 @@
-import os
-import csv
 import asyncio
 import aiohttp
 from telegram.ext import ApplicationBuilder
+from infra.csv_writer import csv_writer
 from config import (
     TELEGRAM_TOKEN,
     TELEGRAM_CHAT_ID,
@@ -52,12 +51,5 @@ async def monitor_ip_change(logger, interval=300):
 
 
 def append_row_to_csv(filename: str, row: dict) -> None:
-    """Appends trades to csv file in out/, adds current CET timestamp"""
-    out_path = os.path.join("out", filename)
-    os.makedirs("out", exist_ok=True)
-    file_exists = os.path.isfile(out_path)
-    with open(out_path, mode="a", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=row.keys())
-        if not file_exists:
-            writer.writeheader()
-        writer.writerow(row)
+    """Appends row to csv file in out/, written in the background (see csv_writer)"""
+    csv_writer.append(filename, row)
@@ -1,20 +1,86 @@
+import time
 import asyncio
 import websockets
 from websockets.exceptions import ConnectionClosedError
 
 from feeds.flashblock_feed import UnichainFlashFeed
 from feeds.binance_feed import BinanceDepthFeed
+from infra.capture import FrameRecorder
+from infra.latency import latency
+
+
+class LatestValueSlot:
+    """
+    Conflating single-slot channel with the asyncio.Queue interface used by
+    ws_reader/feed_loop: put never blocks and replaces an unconsumed item,
+    so the consumer only ever decodes the newest frame.
+    """
+
+    __slots__ = ("_item", "_has_item", "_ready", "_idle", "_unfinished", "dropped")
+
+    def __init__(self):
+        self._item = None
+        self._has_item = False
+        self._ready = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._unfinished = 0
+        self.dropped = 0  # superseded items never seen by the consumer
+
+    def empty(self) -> bool:
+        """Returns 'True' if no item is waiting"""
+        return not self._has_item
+
+    def put_nowait(self, item) -> None:
+        """Stores item, replacing (and counting) an unconsumed one"""
+        if self._has_item:
+            self.dropped += 1
+        else:
+            self._unfinished += 1
+            self._idle.clear()
+        self._item = item
+        self._has_item = True
+        self._ready.set()
+
+    async def put(self, item) -> None:
+        """Same as put_nowait, awaitable for drop-in use"""
+        self.put_nowait(item)
+
+    async def get(self):
+        """Returns the latest item, waits if the slot is empty"""
+        while not self._has_item:
+            self._ready.clear()
+            await self._ready.wait()
+        item = self._item
+        self._item = None
+        self._has_item = False
+        return item
+
+    def task_done(self) -> None:
+        """Marks the last item returned by get as processed"""
+        self._unfinished -= 1
+        if self._unfinished == 0:
+            self._idle.set()
+
+    async def join(self) -> None:
+        """Returns when all stored items were processed"""
+        await self._idle.wait()
 
 
 async def ws_reader(
     url,
-    queue: asyncio.Queue,
+    queue: asyncio.Queue | LatestValueSlot,
     headers=None,
     ping_interval=None,
     ping_timeout=None,
     reconnect_delay: float = 5.0,
+    recorder: FrameRecorder | None = None,
+    channel: int = 0,
 ):
-    """Pushes raw_msg from a WebSocket connection to the provided buffer."""
+    """
+    Pushes (recv_ns, raw_msg) from a WebSocket connection to the provided buffer.
+    If a recorder is given, every frame is captured under 'channel' first.
+    """
     while True:
         try:
             async with websockets.connect(
@@ -25,13 +91,33 @@ async def ws_reader(
                 ping_timeout=ping_timeout,
             ) as ws:
                 async for raw_msg in ws:
-                    await queue.put(raw_msg)
+                    recv_ns = time.monotonic_ns()
+                    if recorder is not None:
+                        recorder.record(channel, recv_ns, raw_msg)
+                    await queue.put((recv_ns, raw_msg))
         except (ConnectionResetError, ConnectionClosedError):
             await asyncio.sleep(reconnect_delay)
 
 
-async def feed_loop(queue: asyncio.Queue, feed: UnichainFlashFeed | BinanceDepthFeed):
+async def feed_loop(
+    queue: asyncio.Queue | LatestValueSlot, feed: UnichainFlashFeed | BinanceDepthFeed
+):
     """Passes new Flashblocks to feed"""
     while True:
-        raw = await queue.get()
+        recv_ns, raw = await queue.get()
+        latency.origin_ns = recv_ns
         feed.process(raw)
+        queue.task_done()
+
+
+async def monitor_dropped(slot: LatestValueSlot, name: str, logger, interval=60):
+    """Logs frames conflated away since the last interval"""
+    last = 0
+    while True:
+        await asyncio.sleep(interval)
+        dropped = slot.dropped
+        if dropped != last:
+            logger.info(
+                "%s: %s frames conflated (total %s)", name, dropped - last, dropped
+            )
+            last = dropped
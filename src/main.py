@@ -2,34 +2,47 @@ import asyncio
 import logging
 
 from clients.binance.client import BinanceClient
+from clients.binance.ws_client import BinanceWsClient
 from clients.uniswap.client import UniswapClient
-from clients.uniswap.snapshot import snapshot_once
+from clients.uniswap.snapshot import warm_start
 from feeds.flashblock_feed import UnichainFlashFeed
 from feeds.binance_feed import BinanceDepthFeed
 from infra.monitoring import TelegramBot
 from infra.monitoring import monitor_ip_change
-from infra.ws import ws_reader, feed_loop
+from infra.ws import ws_reader, feed_loop, LatestValueSlot, monitor_dropped
+from infra.capture import FrameRecorder, CHANNEL_UNICHAIN, CHANNEL_BINANCE
+from infra.latency import latency, log_latency, serve_metrics
+from infra.csv_writer import csv_writer
+from infra.log import setup_logging
 from state.orderbook import OrderBook
 from state.pool import Pool
 from state.balances import Balances
 from state.flashblocks import FlashblockBuffer
+from state.pool_cache import persist_loop, save_checkpoint
 from engine.detector import ArbDetector
 from engine.executor import Executor
+from engine.sizing import TradeSizer
 from config import (
     UNICHAIN_FLASHBLOCKS_WS_URL,
     BINANCE_URI_SBE,
     BINANCE_API_KEY_ED25519,
+    BINANCE_ORDER_ENTRY,
+    CAPTURE_PATH,
+    LATENCY_ENABLED,
+    LATENCY_LOG_INTERVAL,
+    METRICS_HOST,
+    METRICS_PORT,
+    POOL_CACHE_PATH,
+    POOL_CACHE_INTERVAL,
 )
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(levelname)s: %(message)s",
-)
 logger = logging.getLogger()
 
 
 async def fetch_balances(
-    balances: Balances, binance_client: BinanceClient, uniswap_client: UniswapClient
+    balances: Balances,
+    binance_client: BinanceClient | BinanceWsClient,
+    uniswap_client: UniswapClient,
 ):
     """Updates balances"""
     balances.b_eth, balances.b_usdc = await binance_client.get_balances()
@@ -55,7 +68,10 @@ async def main(telegram_bot: TelegramBot):
     flashblock_buffer = FlashblockBuffer()
 
     # clients
-    binance_client = BinanceClient()
+    if BINANCE_ORDER_ENTRY == "ws":
+        binance_client = BinanceWsClient()
+    else:
+        binance_client = BinanceClient()
     uniswap_client = UniswapClient()
 
     # engine
@@ -69,37 +85,79 @@ async def main(telegram_bot: TelegramBot):
         telegram_bot,
         fatal_error,
     )
-    detector = ArbDetector(pool, orderbook, executor, logger)
+    sizer = TradeSizer(pool, orderbook, balances)
+    detector = ArbDetector(pool, orderbook, executor, sizer, logger)
 
     # feeds
     u_queue = asyncio.Queue(maxsize=1024)
     u_feed = UnichainFlashFeed(
-        pool, logger, detector.on_flashblock_done, flashblock_buffer
+        pool,
+        logger,
+        detector.on_flashblock_done,
+        flashblock_buffer,
+        on_sync_lost=detector.on_sync_lost,
     )
-    b_queue = asyncio.Queue(maxsize=1024)
-    b_feed = BinanceDepthFeed(orderbook, logger)
+    # top-of-book stream: only the newest quote is relevant, conflate bursts
+    b_queue = LatestValueSlot()
+    b_feed = BinanceDepthFeed(orderbook, logger, detector.on_quote_change)
     b_url = f"{BINANCE_URI_SBE}/ws/ethusdc@bestBidAsk"
     b_headers = [("X-MBX-APIKEY", BINANCE_API_KEY_ED25519)]
 
+    # optional raw frame capture for offline replay (see replay.py)
+    recorder = FrameRecorder(CAPTURE_PATH) if CAPTURE_PATH else None
+
     tasks = [
         fetch_balances(balances, binance_client, uniswap_client),
         # Unichain
-        ws_reader(UNICHAIN_FLASHBLOCKS_WS_URL, u_queue),
+        ws_reader(
+            UNICHAIN_FLASHBLOCKS_WS_URL,
+            u_queue,
+            recorder=recorder,
+            channel=CHANNEL_UNICHAIN,
+        ),
         feed_loop(u_queue, u_feed),
-        snapshot_once(u_feed, logger),
+        warm_start(u_feed, logger),
         uniswap_client.keep_connection_hot(ping_interval=30),
         # Binance
-        ws_reader(b_url, b_queue, headers=b_headers, ping_interval=20, ping_timeout=60),
+        ws_reader(
+            b_url,
+            b_queue,
+            headers=b_headers,
+            ping_interval=20,
+            ping_timeout=60,
+            recorder=recorder,
+            channel=CHANNEL_BINANCE,
+        ),
         feed_loop(b_queue, b_feed),
+        monitor_dropped(b_queue, "bestBidAsk", logger),
         binance_client.keep_connection_hot(ping_interval=30),
         monitor_ip_change(logger),
         fatal_error,
     ]
+    if POOL_CACHE_PATH:
+        tasks.append(
+            persist_loop(
+                u_feed.checkpoint, POOL_CACHE_PATH, POOL_CACHE_INTERVAL, logger
+            )
+        )
+    if LATENCY_ENABLED:
+        latency.enabled = True
+        tasks += [
+            log_latency(latency, logger, LATENCY_LOG_INTERVAL),
+            serve_metrics(latency, METRICS_HOST, METRICS_PORT),
+        ]
 
     try:
         await asyncio.gather(*tasks)
     finally:
+        if recorder is not None:
+            recorder.close()
+        checkpoint = u_feed.checkpoint() if POOL_CACHE_PATH else None
+        if checkpoint is not None:
+            save_checkpoint(POOL_CACHE_PATH, checkpoint)
         await binance_client.close()
+        uniswap_client.close()
+        csv_writer.close()
 
 
 async def entry():
@@ -113,4 +171,8 @@ async def entry():
 
 
 if __name__ == "__main__":
-    asyncio.run(entry())
+    log_listener = setup_logging()
+    try:
+        asyncio.run(entry())
+    finally:
+        log_listener.stop()
@@ -0,0 +1,129 @@
+"""
+Replays a raw frame capture (CAPTURE_PATH) through the feeds and detector.
+
+Usage: python src/replay.py out/capture.bin [--max-speed]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+from feeds.flashblock_feed import UnichainFlashFeed
+from feeds.binance_feed import BinanceDepthFeed
+from infra.capture import replay_frames, CHANNEL_UNICHAIN, CHANNEL_BINANCE
+from infra.ws import feed_loop, LatestValueSlot
+from infra.log import setup_logging
+from state.orderbook import OrderBook
+from state.pool import Pool
+from state.flashblocks import FlashblockBuffer
+from engine.detector import ArbDetector
+from engine.sizing import TradePlan, TradeSizer
+
+logger = logging.getLogger()
+
+
+class ReplayFlashFeed(UnichainFlashFeed):
+    """Flashblock feed that keeps local state on gaps instead of resyncing"""
+
+    __slots__ = ()
+
+    def request_resync(self):
+        """Capture gaps (e.g. reconnects) can't be re-snapshotted offline"""
+        self.last_block = None
+        self.last_flashblock_index = None
+        self.logger.warning("Gap in capture, continuing with local state")
+
+
+class DryRunExecutor:
+    """Logs detected opportunities instead of executing them"""
+
+    __slots__ = ("logger",)
+
+    def __init__(self, logger):
+        self.logger = logger
+
+    def swap_pending(self, _zero_for_one: bool) -> bool:
+        """No own swaps in a replay"""
+        return False
+
+    def execute_b_sell_u_buy(
+        self, plan: TradePlan, detected_block: int, detected_fb_index: int
+    ):
+        """Logs B sell / U buy"""
+        self.logger.info(
+            "[dry-run] b_sell_u_buy %s #%s-%s",
+            plan,
+            detected_block,
+            detected_fb_index,
+        )
+
+    def execute_b_buy_u_sell(
+        self, plan: TradePlan, detected_block: int, detected_fb_index: int
+    ):
+        """Logs B buy / U sell"""
+        self.logger.info(
+            "[dry-run] b_buy_u_sell %s #%s-%s",
+            plan,
+            detected_block,
+            detected_fb_index,
+        )
+
+
+async def replay(path: str, realtime: bool) -> None:
+    """Feeds the capture through feed_loop into both feeds"""
+    pool = Pool()
+    orderbook = OrderBook()
+    # balances unknown offline: sizes are only capped by book qty and max size
+    sizer = TradeSizer(pool, orderbook, None)
+    detector = ArbDetector(pool, orderbook, DryRunExecutor(logger), sizer, logger)
+
+    u_feed = ReplayFlashFeed(
+        pool,
+        logger,
+        detector.on_flashblock_done,
+        FlashblockBuffer(),
+        on_sync_lost=detector.on_sync_lost,
+    )
+    # no snapshot offline: start from empty ticks, price is set by first Swap
+    u_feed.set_snapshot_block(0)
+    b_feed = BinanceDepthFeed(orderbook, logger, detector.on_quote_change)
+
+    u_queue = asyncio.Queue(maxsize=1024)
+    # conflate like production, except at max speed where every quote counts
+    b_queue = LatestValueSlot() if realtime else asyncio.Queue(maxsize=1024)
+    consumers = [
+        asyncio.create_task(feed_loop(u_queue, u_feed)),
+        asyncio.create_task(feed_loop(b_queue, b_feed)),
+    ]
+    start = time.perf_counter()
+    producer = asyncio.create_task(
+        replay_frames(
+            path, {CHANNEL_UNICHAIN: u_queue, CHANNEL_BINANCE: b_queue}, realtime
+        )
+    )
+    try:
+        # a feed exception ends its consumer early, surface it instead of hanging
+        await asyncio.wait([producer, *consumers], return_when=asyncio.FIRST_COMPLETED)
+        for task in consumers:
+            if task.done():
+                task.result()
+        count = await producer
+    finally:
+        for task in [producer, *consumers]:
+            task.cancel()
+    logger.info("Replayed %s frames in %.3f s", count, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", help="capture file written via CAPTURE_PATH")
+    parser.add_argument(
+        "--max-speed", action="store_true", help="ignore original frame timing"
+    )
+    args = parser.parse_args()
+    log_listener = setup_logging()
+    try:
+        asyncio.run(replay(args.path, realtime=not args.max_speed))
+    finally:
+        log_listener.stop()
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
 @dataclass(slots=True)
@@ -9,3 +9,26 @@ class Balances:
     b_usdc: float | None = None
     u_eth: float | None = None
     u_usdc: float | None = None
+    # amounts held by in-flight executions, per balance name
+    reserved: dict[str, float] = field(
+        default_factory=lambda: {
+            "b_eth": 0.0,
+            "b_usdc": 0.0,
+            "u_eth": 0.0,
+            "u_usdc": 0.0,
+        }
+    )
+
+    def available(self, name: str) -> float:
+        """Balance minus in-flight reservations, 0.0 if not fetched yet"""
+        return (getattr(self, name) or 0.0) - self.reserved[name]
+
+    def reserve(self, amounts: dict[str, float]) -> None:
+        """Holds amounts for an execution until release()"""
+        for name, amount in amounts.items():
+            self.reserved[name] += amount
+
+    def release(self, amounts: dict[str, float]) -> None:
+        """Frees amounts held by reserve()"""
+        for name, amount in amounts.items():
+            self.reserved[name] -= amount
@@ -13,15 +13,35 @@ class Flashblock:
     tx_hashes: List[str]
 
 
+# (block_number, index, success) of an own tx, None if not included in time
+Inclusion = Optional[Tuple[int, int, bool]]
+
+
 class FlashblockBuffer:
-    """Holds recent flashblocks in memory and allows lookup by tx_hash"""
+    """
+    Holds recent flashblocks in memory and allows lookup by tx_hash.
+    Own txs are tracked via per-hash futures resolved by the flashblock feed.
+    """
 
-    __slots__ = ("_blocks", "_by_tx", "_new_block")
+    __slots__ = (
+        "_blocks",
+        "_by_tx",
+        "waiters",
+        "_flashblock_count",
+        "_receipts",
+        "_seen",
+    )
 
     def __init__(self, size: int = 20):
         self._blocks: Deque[Flashblock] = deque(maxlen=size)
         self._by_tx: Dict[str, Tuple[int, int]] = {}
-        self._new_block: asyncio.Event = asyncio.Event()
+        # tx_hash -> (future, expiry flashblock count)
+        self.waiters: Dict[str, Tuple[asyncio.Future, int]] = {}
+        self._flashblock_count = 0
+        # flashblock receipts of own txs, consumed by the executor
+        self._receipts: Dict[str, dict] = {}
+        # own txs resolved before their waiter registered, latest `size` kept
+        self._seen: Dict[str, Tuple[int, int, bool]] = {}
 
     def add_block(self, block_number: int, index: int, tx_hashes: List[str]) -> None:
         """Adds block and remove oldest entry"""
@@ -36,9 +56,6 @@ class FlashblockBuffer:
         for h in tx_hashes:
             self._by_tx[h] = (block_number, index)
 
-        # publisher
-        self._new_block.set()
-
     def get_block(self, block_number: int, index: int) -> Optional[Flashblock]:
         """Returns 'Flashblock' given (block_number, index)"""
         for fb in self._blocks:
@@ -55,7 +72,66 @@ class FlashblockBuffer:
         """Returns (block_number, index) for given tx_hash"""
         return self._by_tx.get(tx_hash)
 
-    async def wait_for_new_block(self) -> None:
-        """Returns when new block"""
-        await self._new_block.wait()
-        self._new_block.clear()
+    def wait_for_tx(self, tx_hash: str, max_flashblocks: int) -> asyncio.Future:
+        """
+        Returns a future resolved with (block_number, index, success) once
+        tx_hash shows up in a flashblock, or None after max_flashblocks.
+        """
+        tx_hash = tx_hash.lower()  # receipts are keyed by lowercase hash
+        entry = self.waiters.get(tx_hash)
+        if entry is not None:
+            return entry[0]
+        future = asyncio.get_running_loop().create_future()
+        seen = self._seen.pop(tx_hash, None)
+        if seen is not None:
+            future.set_result(seen)
+            return future
+        # swap of ours not matched by the feed, e.g. no wallet configured
+        fb_info = self._by_tx.get(tx_hash)
+        if fb_info is not None:
+            future.set_result((*fb_info, True))
+            return future
+        self.waiters[tx_hash] = (future, self._flashblock_count + max_flashblocks)
+        return future
+
+    def resolve_tx(
+        self,
+        tx_hash: str,
+        block_number: int,
+        index: int,
+        success: bool,
+        receipt: dict | None = None,
+    ) -> None:
+        """
+        Resolves the waiter of tx_hash (publisher: flashblock feed) and
+        retains its receipt for pop_receipt. Without a waiter the inclusion
+        is kept for a later wait_for_tx.
+        """
+        if receipt is not None:
+            self._receipts[tx_hash] = receipt
+        entry = self.waiters.pop(tx_hash, None)
+        if entry is None:
+            self._seen[tx_hash] = (block_number, index, success)
+            if len(self._seen) > self._blocks.maxlen:
+                oldest = next(iter(self._seen))
+                del self._seen[oldest]
+                self._receipts.pop(oldest, None)
+            return
+        if not entry[0].done():
+            entry[0].set_result((block_number, index, success))
+
+    def pop_receipt(self, tx_hash: str) -> dict | None:
+        """Returns and removes the retained flashblock receipt of an own tx"""
+        return self._receipts.pop(tx_hash.lower(), None)
+
+    def on_flashblock(self) -> None:
+        """Counts a processed flashblock and expires overdue waiters"""
+        self._flashblock_count += 1
+        if not self.waiters:
+            return
+        count = self._flashblock_count
+        expired = [h for h, (_f, expiry) in self.waiters.items() if expiry <= count]
+        for h in expired:
+            future, _expiry = self.waiters.pop(h)
+            if not future.done():
+                future.set_result(None)
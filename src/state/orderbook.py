@@ -10,9 +10,15 @@ class OrderBook:
         - example: 3_000.05
     bid_qty / ask_qty: base asset quantity (ETH)
         - example: 0.5
+    bid_mantissa / ask_mantissa / price_exp: SBE integer price encoding,
+    price = mantissa * 10**price_exp
+        - example: 300005, -2
     """
 
     bid_price: float | None = None
     ask_price: float | None = None
     bid_qty: float | None = None
     ask_qty: float | None = None
+    bid_mantissa: int | None = None
+    ask_mantissa: int | None = None
+    price_exp: int | None = None
@@ -1,13 +1,6 @@
-from typing import Dict
 from dataclasses import dataclass, field
 
-
-@dataclass(slots=True)
-class Tick:
-    """Holds the liquidity state of a Unichain pool tick."""
-
-    liquidity_gross: int
-    liquidity_net: int
+from state.ticks import Tick, TickStore  # pylint: disable=unused-import
 
 
 @dataclass(slots=True)
@@ -18,14 +11,14 @@ class Pool:
     price: float | None = None
     active_liquidity: int | None = None
     current_tick: int | None = None
-    ticks: Dict[int, Tick] = field(default_factory=dict)
+    ticks: TickStore = field(default_factory=TickStore)
 
     def load_ticks(self, ticks_raw):
-        """Loads tick for pool"""
-        self.ticks = {
-            int(idx): Tick(
-                liquidity_gross=int(liq_gross),
-                liquidity_net=int(liq_net),
-            )
-            for (idx, liq_gross, liq_net, _fee0, _fee1) in ticks_raw
-        }
+        """Loads tick for pool from (index, liquidityGross, liquidityNet, ...) rows"""
+        self.ticks.load((int(row[0]), int(row[1]), int(row[2])) for row in ticks_raw)
+
+    def update_liquidity(self, tick_lower: int, tick_upper: int, liq_delta: int):
+        """Applies a ModifyLiquidity position change to both boundary ticks"""
+        # lower tick: +ΔL gross, +ΔL net; upper tick: +ΔL gross, -ΔL net
+        self.ticks.update(tick_lower, liq_delta, liq_delta)
+        self.ticks.update(tick_upper, liq_delta, -liq_delta)
@@ -0,0 +1,150 @@
+import os
+import struct
+import asyncio
+from array import array
+from dataclasses import dataclass, field
+from logging import Logger
+from typing import Callable
+
+from config import UNISWAP_POOL_ID
+
+MAGIC = b"POOL"
+VERSION = 1
+# magic, version, pool id, from_block, has price, sqrt_price_x96 (uint160),
+# active_liquidity (uint128), current_tick, applied tx count, tick count
+_HEADER = struct.Struct("<4sB32sQB20s16siII")
+
+
+@dataclass(slots=True)
+class PoolCheckpoint:
+    """Pool state plus the block the feed has to resume from"""
+
+    # first block not fully contained in the state
+    from_block: int
+    # txs of from_block already applied
+    applied_txs: set[str] = field(default_factory=set)
+    sqrt_price_x96: int | None = None
+    active_liquidity: int | None = None
+    current_tick: int | None = None
+    # (tick, liquidity_gross, liquidity_net)
+    ticks: list[tuple[int, int, int]] = field(default_factory=list)
+
+
+def encode_checkpoint(checkpoint: PoolCheckpoint, pool_id: str = UNISWAP_POOL_ID):
+    """Binary encoding, ticks as three packed columns"""
+    has_price = checkpoint.sqrt_price_x96 is not None
+    header = _HEADER.pack(
+        MAGIC,
+        VERSION,
+        bytes.fromhex(pool_id.removeprefix("0x")),
+        checkpoint.from_block,
+        has_price,
+        (checkpoint.sqrt_price_x96 or 0).to_bytes(20, "little"),
+        (checkpoint.active_liquidity or 0).to_bytes(16, "little"),
+        checkpoint.current_tick or 0,
+        len(checkpoint.applied_txs),
+        len(checkpoint.ticks),
+    )
+    txs = b"".join(
+        bytes.fromhex(tx_hash.removeprefix("0x"))
+        for tx_hash in sorted(checkpoint.applied_txs)
+    )
+    ticks = array("i", (tick for tick, _gross, _net in checkpoint.ticks)).tobytes()
+    gross = b"".join(g.to_bytes(16, "little") for _t, g, _n in checkpoint.ticks)
+    net = b"".join(
+        n.to_bytes(16, "little", signed=True) for _t, _g, n in checkpoint.ticks
+    )
+    return header + txs + ticks + gross + net
+
+
+def decode_checkpoint(data: bytes, pool_id: str = UNISWAP_POOL_ID) -> PoolCheckpoint:
+    """Inverse of encode_checkpoint, ValueError if data is not for pool_id"""
+    if len(data) < _HEADER.size:
+        raise ValueError("Truncated pool checkpoint")
+    (
+        magic,
+        version,
+        raw_pool_id,
+        from_block,
+        has_price,
+        sqrt_price_x96,
+        active_liquidity,
+        current_tick,
+        n_txs,
+        n_ticks,
+    ) = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Unknown pool checkpoint format {magic!r} v{version}")
+    if raw_pool_id != bytes.fromhex(pool_id.removeprefix("0x")):
+        raise ValueError(f"Pool checkpoint is for pool 0x{raw_pool_id.hex()}")
+    if len(data) != _HEADER.size + 32 * n_txs + 36 * n_ticks:
+        raise ValueError("Truncated pool checkpoint")
+
+    offset = _HEADER.size
+    applied_txs = {
+        "0x" + data[offset + 32 * i : offset + 32 * (i + 1)].hex() for i in range(n_txs)
+    }
+    offset += 32 * n_txs
+    ticks = array("i")
+    ticks.frombytes(data[offset : offset + 4 * n_ticks])
+    offset += 4 * n_ticks
+    gross = [
+        int.from_bytes(data[offset + 16 * i : offset + 16 * (i + 1)], "little")
+        for i in range(n_ticks)
+    ]
+    offset += 16 * n_ticks
+    net = [
+        int.from_bytes(
+            data[offset + 16 * i : offset + 16 * (i + 1)], "little", signed=True
+        )
+        for i in range(n_ticks)
+    ]
+    return PoolCheckpoint(
+        from_block=from_block,
+        applied_txs=applied_txs,
+        sqrt_price_x96=int.from_bytes(sqrt_price_x96, "little") if has_price else None,
+        active_liquidity=(
+            int.from_bytes(active_liquidity, "little") if has_price else None
+        ),
+        current_tick=current_tick if has_price else None,
+        ticks=list(zip(ticks, gross, net)),
+    )
+
+
+def save_checkpoint(path: str, checkpoint: PoolCheckpoint) -> None:
+    """Writes the checkpoint atomically (temp file + rename)"""
+    data = encode_checkpoint(checkpoint)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path: str) -> PoolCheckpoint | None:
+    """Reads a checkpoint, None if missing or not usable"""
+    try:
+        with open(path, "rb") as f:
+            return decode_checkpoint(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+async def persist_loop(
+    checkpoint: Callable[[], PoolCheckpoint | None],
+    path: str,
+    interval: float,
+    logger: Logger,
+) -> None:
+    """Saves checkpoint() every interval seconds, skipped while not synced"""
+    while True:
+        await asyncio.sleep(interval)
+        state = checkpoint()
+        if state is None:
+            continue
+        try:
+            await asyncio.to_thread(save_checkpoint, path, state)
+        except OSError:
+            logger.exception("Saving pool checkpoint to %s failed", path)
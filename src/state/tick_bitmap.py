@@ -0,0 +1,96 @@
+from typing import Iterable, Iterator
+
+
+def least_significant_bit(x: int) -> int:
+    """Index of the lowest set bit of x > 0"""
+    return (x & -x).bit_length() - 1
+
+
+def most_significant_bit(x: int) -> int:
+    """Index of the highest set bit of x > 0"""
+    return x.bit_length() - 1
+
+
+def compress(tick: int, tick_spacing: int) -> int:
+    """Tick index in units of tick_spacing, rounded towards negative infinity"""
+    return tick // tick_spacing
+
+
+def position(compressed: int) -> tuple[int, int]:
+    """(word position, bit position) of a compressed tick"""
+    return compressed >> 8, compressed & 0xFF
+
+
+def word_ticks(word_pos: int, word: int, tick_spacing: int) -> Iterator[int]:
+    """Yields the initialized ticks of a bitmap word in ascending order"""
+    base = word_pos << 8
+    while word:
+        yield (base + least_significant_bit(word)) * tick_spacing
+        # clear the lowest set bit
+        word &= word - 1
+
+
+class TickBitmap:
+    """
+    Local mirror of a v4 pool tickBitmap: word position -> 256-bit word,
+    one bit per initialized tick (compressed by tick_spacing).
+    """
+
+    __slots__ = ("tick_spacing", "_words")
+
+    def __init__(self, tick_spacing: int, ticks: Iterable[int] = ()):
+        self.tick_spacing = tick_spacing
+        self._words: dict[int, int] = {}
+        for tick in ticks:
+            self.flip_tick(tick)
+
+    def flip_tick(self, tick: int) -> None:
+        """Flips the initialized state of tick, ValueError if not on the spacing"""
+        if tick % self.tick_spacing:
+            raise ValueError(f"Tick {tick} not a multiple of {self.tick_spacing}")
+        word_pos, bit_pos = position(tick // self.tick_spacing)
+        word = self._words.get(word_pos, 0) ^ (1 << bit_pos)
+        if word:
+            self._words[word_pos] = word
+        else:
+            del self._words[word_pos]
+
+    def is_initialized(self, tick: int) -> bool:
+        """True if the bit of tick is set"""
+        if tick % self.tick_spacing:
+            return False
+        word_pos, bit_pos = position(tick // self.tick_spacing)
+        return (self._words.get(word_pos, 0) >> bit_pos) & 1 == 1
+
+    def word(self, word_pos: int) -> int:
+        """Bitmap word at word_pos, 0 if no tick in it is initialized"""
+        return self._words.get(word_pos, 0)
+
+    def next_initialized_tick_within_one_word(
+        self, tick: int, lte: bool
+    ) -> tuple[int, bool]:
+        """
+        Returns (next tick, initialized) within the current bitmap word,
+        as TickBitmap.nextInitializedTickWithinOneWord
+        """
+        tick_spacing = self.tick_spacing
+        compressed = compress(tick, tick_spacing)
+        if lte:
+            word_pos, bit_pos = position(compressed)
+            # all bits at or below bit_pos
+            masked = self._words.get(word_pos, 0) & ((2 << bit_pos) - 1)
+            if masked:
+                return (
+                    compressed - (bit_pos - most_significant_bit(masked))
+                ) * tick_spacing, True
+            return (compressed - bit_pos) * tick_spacing, False
+
+        compressed += 1
+        word_pos, bit_pos = position(compressed)
+        # all bits at or above bit_pos
+        masked = self._words.get(word_pos, 0) >> bit_pos << bit_pos
+        if masked:
+            return (
+                compressed + (least_significant_bit(masked) - bit_pos)
+            ) * tick_spacing, True
+        return (compressed + (255 - bit_pos)) * tick_spacing, False
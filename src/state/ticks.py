@@ -0,0 +1,123 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+from state.tick_bitmap import TickBitmap
+
+
+@dataclass(slots=True)
+class Tick:
+    """Holds the liquidity state of a Unichain pool tick."""
+
+    liquidity_gross: int
+    liquidity_net: int
+
+
+class TickStore:
+    """
+    Initialized ticks of a pool as sorted parallel arrays:
+    tick index (int32), liquidityGross and liquidityNet (Python ints, > 64 bit).
+    Neighbour lookups are O(log n), range iteration touches only the ticks in range.
+    Next-tick lookups within a bitmap word use a TickBitmap mirror, built on
+    first use for the requested tick spacing and kept in sync by update().
+    """
+
+    __slots__ = ("_ticks", "_gross", "_net", "_bitmap")
+
+    def __init__(self, items: Iterable[tuple[int, int, int]] = ()):
+        self._ticks = array("i")
+        self._gross: list[int] = []
+        self._net: list[int] = []
+        self._bitmap: TickBitmap | None = None
+        self.load(items)
+
+    def load(self, items: Iterable[tuple[int, int, int]]) -> None:
+        """Replaces all ticks with (tick, liquidity_gross, liquidity_net) items"""
+        rows = sorted(row for row in items if row[1] != 0)
+        self._ticks = array("i", (row[0] for row in rows))
+        self._gross = [row[1] for row in rows]
+        self._net = [row[2] for row in rows]
+        self._bitmap = None
+
+    def update(self, tick: int, gross_delta: int, net_delta: int) -> None:
+        """Applies a liquidity change, inserting/removing the tick as needed"""
+        ticks = self._ticks
+        i = bisect_left(ticks, tick)
+        if i < len(ticks) and ticks[i] == tick:
+            gross = self._gross[i] + gross_delta
+            if gross == 0:
+                del ticks[i]
+                del self._gross[i]
+                del self._net[i]
+                if self._bitmap is not None:
+                    self._bitmap.flip_tick(tick)
+            else:
+                self._gross[i] = gross
+                self._net[i] += net_delta
+        elif gross_delta != 0:
+            ticks.insert(i, tick)
+            self._gross.insert(i, gross_delta)
+            self._net.insert(i, net_delta)
+            if self._bitmap is not None:
+                self._bitmap.flip_tick(tick)
+
+    def __len__(self) -> int:
+        return len(self._ticks)
+
+    def __contains__(self, tick: int) -> bool:
+        i = bisect_left(self._ticks, tick)
+        return i < len(self._ticks) and self._ticks[i] == tick
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._ticks)
+
+    def get(self, tick: int) -> Tick | None:
+        """Returns a copy of the tick state, None if not initialized"""
+        i = bisect_left(self._ticks, tick)
+        if i < len(self._ticks) and self._ticks[i] == tick:
+            return Tick(liquidity_gross=self._gross[i], liquidity_net=self._net[i])
+        return None
+
+    def liquidity_net(self, tick: int) -> int:
+        """liquidityNet of an initialized tick, KeyError otherwise"""
+        i = bisect_left(self._ticks, tick)
+        if i < len(self._ticks) and self._ticks[i] == tick:
+            return self._net[i]
+        raise KeyError(tick)
+
+    def next_below(self, tick: int) -> int | None:
+        """Greatest initialized tick <= tick"""
+        i = bisect_right(self._ticks, tick)
+        return self._ticks[i - 1] if i > 0 else None
+
+    def next_above(self, tick: int) -> int | None:
+        """Smallest initialized tick > tick"""
+        i = bisect_right(self._ticks, tick)
+        return self._ticks[i] if i < len(self._ticks) else None
+
+    def next_initialized_tick_within_one_word(
+        self, tick: int, tick_spacing: int, lte: bool
+    ) -> tuple[int, bool]:
+        """
+        Returns (next tick, initialized) within the current bitmap word,
+        as TickBitmap.nextInitializedTickWithinOneWord
+        """
+        bitmap = self._bitmap
+        if bitmap is None or bitmap.tick_spacing != tick_spacing:
+            bitmap = self._bitmap = TickBitmap(tick_spacing, self._ticks)
+        return bitmap.next_initialized_tick_within_one_word(tick, lte)
+
+    def items(self) -> Iterator[tuple[int, int, int]]:
+        """Yields (tick, liquidity_gross, liquidity_net) for all ticks"""
+        return zip(self._ticks, self._gross, self._net)
+
+    def iter_range(
+        self, tick_lower: int, tick_upper: int
+    ) -> Iterator[tuple[int, int, int]]:
+        """Yields (tick, liquidity_gross, liquidity_net) for lower <= tick <= upper"""
+        lo = bisect_left(self._ticks, tick_lower)
+        hi = bisect_right(self._ticks, tick_upper)
+        ticks, gross, net = self._ticks, self._gross, self._net
+        for i in range(lo, hi):
+            yield ticks[i], gross[i], net[i]
@@ -0,0 +1,288 @@
+import base64
+import asyncio
+from http import HTTPStatus
+import orjson
+import pytest
+from websockets.asyncio.server import serve
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+from clients.binance.ws_client import BinanceWsClient, BinanceWsError
+
+API_KEY = "test-api-key"
+
+FILL = {"price": "3000.00", "qty": "0.0100", "commission": "0", "tradeId": 1}
+
+
+class StandInServer:
+    """Local WebSocket API stand-in, checks logon and answers by request id"""
+
+    def __init__(self, private_key: Ed25519PrivateKey):
+        self.public_key = private_key.public_key()
+        self.logons = 0
+        self.requests = []
+        self.connections = []
+        # response held back until the next request was answered
+        self.held = None
+        # pings answered by closing the connection
+        self.close_on_ping = 0
+        # handshakes rejected with 503
+        self.reject_connects = 0
+        # logon answered asynchronously after this delay (s)
+        self.logon_delay = 0
+        self.logged_on = set()
+
+    def verify(self, params: dict) -> bool:
+        """Ed25519 signature over the sorted payload without signature"""
+        signature = base64.b64decode(params["signature"])
+        payload = "&".join(
+            f"{k}={v}" for k, v in sorted(params.items()) if k != "signature"
+        )
+        try:
+            self.public_key.verify(signature, payload.encode())
+        except InvalidSignature:
+            return False
+        return True
+
+    def result(self, method: str, params: dict):
+        """Response status and result of a request"""
+        if method == "session.logon":
+            if params["apiKey"] != API_KEY or not self.verify(params):
+                return 401, {
+                    "code": -1022,
+                    "msg": "Signature for this request is not valid.",
+                }
+            self.logons += 1
+            return 200, {"apiKey": API_KEY}
+        if method == "ping":
+            return 200, {}
+        if method == "unauthorized":
+            return 401, {
+                "code": -1002,
+                "msg": "You are not authorized to execute this request.",
+            }
+        if method == "account.status":
+            return 200, {
+                "balances": [
+                    {"asset": "ETH", "free": "1.5", "locked": "0"},
+                    {"asset": "USDC", "free": "2500.25", "locked": "0"},
+                ]
+            }
+        if method == "order.place":
+            if float(params["quantity"]) <= 0:
+                return 400, {"code": -1013, "msg": "Invalid quantity."}
+            return 200, {
+                "symbol": params["symbol"],
+                "side": params["side"],
+                "type": params["type"],
+                "status": "FILLED",
+                "executedQty": params["quantity"],
+                "fills": [FILL],
+            }
+        return 400, {"code": -1100, "msg": f"Unknown method {method}"}
+
+    def process_request(self, connection, _request):
+        """Rejects the handshake while reject_connects is set"""
+        if self.reject_connects:
+            self.reject_connects -= 1
+            return connection.respond(HTTPStatus.SERVICE_UNAVAILABLE, "maintenance\n")
+        return None
+
+    def respond(self, ws, request_id: int, method: str, params: dict) -> bytes:
+        """Response frame, a successful logon authenticates the connection"""
+        status, body = self.result(method, params)
+        if method == "session.logon" and status == 200:
+            self.logged_on.add(ws)
+        key = "result" if status == 200 else "error"
+        return orjson.dumps({"id": request_id, "status": status, key: body})
+
+    async def delayed_logon(self, ws, request: dict):
+        """Logon processed while later requests on the connection arrive"""
+        await asyncio.sleep(self.logon_delay)
+        await ws.send(
+            self.respond(ws, request["id"], "session.logon", request["params"])
+        )
+
+    async def handler(self, ws):
+        """Answers requests, a 'hold' side order is answered after the next one"""
+        self.connections.append(ws)
+        async for raw_msg in ws:
+            request = orjson.loads(raw_msg)
+            self.requests.append(request)
+            method, params = request["method"], request["params"]
+            if method == "ping" and self.close_on_ping:
+                self.close_on_ping -= 1
+                await ws.close()
+                return
+            if method == "session.logon" and self.logon_delay:
+                asyncio.create_task(self.delayed_logon(ws, request))
+                continue
+            if method not in ("session.logon", "ping") and ws not in self.logged_on:
+                method = "unauthorized"
+            response = self.respond(ws, request["id"], method, params)
+            if method == "order.place" and params.get("side") == "HOLD":
+                self.held = response
+                continue
+            await ws.send(response)
+            if self.held is not None:
+                held, self.held = self.held, None
+                await ws.send(held)
+
+
+def run_with_server(test, private_key: Ed25519PrivateKey | None = None):
+    """Runs test(client, server) against a stand-in on a free local port"""
+    private_key = private_key or Ed25519PrivateKey.generate()
+    server = StandInServer(private_key)
+
+    async def run():
+        async with serve(
+            server.handler, "127.0.0.1", 0, process_request=server.process_request
+        ) as ws_server:
+            port = ws_server.sockets[0].getsockname()[1]
+            client = BinanceWsClient(
+                uri=f"ws://127.0.0.1:{port}",
+                api_key=API_KEY,
+                private_key=private_key,
+                timeout=2,
+            )
+            try:
+                return await test(client, server)
+            finally:
+                await client.close()
+
+    return asyncio.run(run())
+
+
+class TestBinanceWsClient:
+    """Order entry over the WebSocket API"""
+
+    def test_logon_and_order_shape(self):
+        """Session is logged on once, order returns the REST-like result"""
+
+        async def test(client, server):
+            first = await client.execute_trade("buy", 0.01)
+            second = await client.execute_trade("SELL", 0.01)
+            return first, second, server
+
+        first, second, server = run_with_server(test)
+        assert server.logons == 1
+        assert [r["method"] for r in server.requests] == [
+            "session.logon",
+            "order.place",
+            "order.place",
+        ]
+        params = server.requests[1]["params"]
+        assert params["symbol"] == "ETHUSDC"
+        assert params["side"] == "BUY"
+        assert params["type"] == "MARKET"
+        assert params["quantity"] == "0.01"
+        assert params["newOrderRespType"] == "FULL"
+        assert "signature" not in params
+        assert first["fills"] == [FILL]
+        assert first["executedQty"] == "0.01"
+        assert second["side"] == "SELL"
+
+    def test_get_balances(self):
+        """Free ETH and USDC as floats"""
+
+        async def test(client, _server):
+            return await client.get_balances()
+
+        assert run_with_server(test) == (1.5, 2500.25)
+
+    def test_responses_matched_by_id(self):
+        """Out of order responses resolve the request they belong to"""
+
+        async def test(client, _server):
+            await client.connect()
+            held = asyncio.create_task(client.execute_trade("hold", 0.02))
+            await asyncio.sleep(0.05)
+            balances = await client.get_balances()
+            return await held, balances
+
+        held, balances = run_with_server(test)
+        assert held["side"] == "HOLD"
+        assert held["executedQty"] == "0.02"
+        assert balances == (1.5, 2500.25)
+
+    def test_error_response_raises(self):
+        """Non-200 status raises with the API error code"""
+
+        async def test(client, _server):
+            with pytest.raises(BinanceWsError) as exc_info:
+                await client.execute_trade("buy", 0)
+            return exc_info.value
+
+        error = run_with_server(test)
+        assert error.status == 400
+        assert error.code == -1013
+
+    def test_logon_with_wrong_key_fails(self):
+        """A key not matching the registered one is rejected on logon"""
+
+        async def test(client, _server):
+            client.private_key = Ed25519PrivateKey.generate()
+            with pytest.raises(BinanceWsError) as exc_info:
+                await client.get_balances()
+            return exc_info.value
+
+        assert run_with_server(test).code == -1022
+
+    def test_reconnects_after_drop(self):
+        """A dropped connection is re-established and logged on again"""
+
+        async def test(client, server):
+            await client.get_balances()
+            await server.connections[0].close()
+            await asyncio.sleep(0.05)
+            order = await client.execute_trade("buy", 0.01)
+            return order, server
+
+        order, server = run_with_server(test)
+        assert order["status"] == "FILLED"
+        assert server.logons == 2
+        assert len(server.connections) == 2
+
+    def test_keep_hot_survives_close_mid_ping(self):
+        """Close mid-ping and a rejected reconnect are retried until logged on"""
+
+        async def test(client, server):
+            await client.connect()
+            server.close_on_ping = 1
+            server.reject_connects = 1
+            task = asyncio.create_task(
+                client.keep_connection_hot(ping_interval=0.01, retry_delay=0.01)
+            )
+            for _ in range(100):
+                await asyncio.sleep(0.01)
+                if server.logons == 2:
+                    break
+            await asyncio.sleep(0.05)
+            running = not task.done()
+            task.cancel()
+            return running, server
+
+        running, server = run_with_server(test)
+        assert running
+        assert server.logons == 2
+        pings = [r for r in server.requests if r["method"] == "ping"]
+        assert len(pings) >= 2
+
+    def test_request_waits_for_logon(self):
+        """A request racing connect() is only sent on the logged on session"""
+
+        async def test(client, server):
+            server.logon_delay = 0.05
+            connect = asyncio.create_task(client.connect())
+            while not server.requests:
+                await asyncio.sleep(0.001)
+            balances = await client.get_balances()
+            await connect
+            return balances, server
+
+        balances, server = run_with_server(test)
+        assert balances == (1.5, 2500.25)
+        assert server.logons == 1
+        assert [r["method"] for r in server.requests] == [
+            "session.logon",
+            "account.status",
+        ]
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# src/ modules import each other from the src root (see startTrading.sh)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
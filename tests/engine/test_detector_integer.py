@@ -0,0 +1,123 @@
+import random
+from fractions import Fraction
+import pytest
+from config import BINANCE_FEE
+from engine import detector as detector_module
+from engine.detector import ArbDetector, UNI_FEE_BPS, UNI_FEE_DEN
+from state.orderbook import OrderBook
+from state.pool import Pool
+from tests.utils.dummy_logger import DummyLogger
+
+
+class RecordingSizer:
+    """Records solve calls, never sizes a trade"""
+
+    def __init__(self):
+        self.calls = []
+
+    def solve(self, zero_for_one, target_sqrt_price_x96):
+        """Records direction and target"""
+        self.calls.append((zero_for_one, target_sqrt_price_x96))
+
+
+class IdleExecutor:
+    """No own swaps in flight"""
+
+    def swap_pending(self, _zero_for_one):
+        """Never pending"""
+        return False
+
+
+def make_detector(mode: str, sqrt_price_x96: int, bid_m: int, ask_m: int):
+    """Detector on a pool at sqrt_price_x96 and a quote with exponent -2"""
+    pool = Pool(sqrt_price_x96=sqrt_price_x96)
+    pool.price = (sqrt_price_x96 / 2**96) ** 2 * 10**12
+    orderbook = OrderBook(
+        bid_price=bid_m / 100,
+        ask_price=ask_m / 100,
+        bid_mantissa=bid_m,
+        ask_mantissa=ask_m,
+        price_exp=-2,
+    )
+    sizer = RecordingSizer()
+    detector = ArbDetector(
+        pool, orderbook, IdleExecutor(), sizer, DummyLogger(), mode=mode
+    )
+    return detector, sizer
+
+
+def reference_edge(sqrt_price_x96: int, bid_m: int, ask_m: int):
+    """Exact rational edge decision"""
+    b_fee = Fraction(str(BINANCE_FEE))
+    u_fee = Fraction(UNI_FEE_BPS, UNI_FEE_DEN)
+    u_price = Fraction(sqrt_price_x96**2, 2**192) * 10**12
+    if Fraction(bid_m, 100) * (1 - b_fee) > u_price / (1 - u_fee):
+        return False
+    if u_price * (1 - u_fee) > Fraction(ask_m, 100) * (1 + b_fee):
+        return True
+    return None
+
+
+class TestIntegerMode:
+    """Exact sqrtPriceX96 edge comparison"""
+
+    def test_matches_float_mode(self):
+        """Same decisions and targets as the float path away from the boundary"""
+        rng = random.Random(5)
+        for _ in range(500):
+            u_price = rng.uniform(3000, 5000)
+            sqrt_price = ArbDetector._price_to_sqrt_x96(u_price)
+            bid_m = round(u_price * rng.uniform(0.99, 1.01) * 100)
+            ask_m = bid_m + 1
+            d_int, s_int = make_detector("integer", sqrt_price, bid_m, ask_m)
+            d_float, s_float = make_detector("float", sqrt_price, bid_m, ask_m)
+            d_int._detect_int(1, 0)
+            d_float._detect_float(1, 0)
+            assert [c[0] for c in s_int.calls] == [c[0] for c in s_float.calls]
+            for (_, t_int), (_, t_float) in zip(s_int.calls, s_float.calls):
+                assert abs(t_int - t_float) / t_int < 1e-12
+
+    @pytest.mark.parametrize("zero_for_one", [False, True])
+    def test_exact_at_threshold(self, zero_for_one):
+        """The target is the last sqrt price with an edge, one unit further has none"""
+        bid_m, ask_m = 400000, 400001
+        detector, sizer = make_detector("integer", 2**96, bid_m, ask_m)
+        detector._detect_int(1, 0)
+        inside = detector._target(zero_for_one)
+        outside = inside - 1 if zero_for_one else inside + 1
+        assert reference_edge(inside, bid_m, ask_m) is zero_for_one
+        assert reference_edge(outside, bid_m, ask_m) is None
+        for sqrt_price, expected in ((inside, [zero_for_one]), (outside, [])):
+            detector, sizer = make_detector("integer", sqrt_price, bid_m, ask_m)
+            detector._detect_int(1, 0)
+            assert [c[0] for c in sizer.calls] == expected
+
+    def test_thresholds_per_quote_side(self, monkeypatch):
+        """Only a changed side is rescaled, the factors once per exponent"""
+        detector, _ = make_detector("integer", 2**96, 400000, 400001)
+        calls = []
+        monkeypatch.setattr(
+            detector_module,
+            "price_factors",
+            lambda exp: calls.append(exp) or (3, 5, 1),
+        )
+        for _ in range(3):
+            detector._detect_int(1, 0)
+        detector.orderbook.bid_mantissa = 400002
+        detector._detect_int(1, 0)
+        assert calls == [-2]
+        assert detector._sell_val == 400002 * 3
+        assert detector._buy_val == 400001 * 5
+
+    def test_unknown_mode(self):
+        """Mode is validated"""
+        with pytest.raises(ValueError):
+            make_detector("decimal", 2**96, 400000, 400001)
+
+    def test_price_factors_exact(self):
+        """Factors reproduce the fee-adjusted price without rounding"""
+        sell_num, _, den = detector_module.price_factors(-2)
+        x = Fraction(400000 * sell_num, den)
+        b_fee = Fraction(str(BINANCE_FEE))
+        u_fee = Fraction(UNI_FEE_BPS, UNI_FEE_DEN)
+        assert x == Fraction(4000) * (1 - b_fee) * (1 - u_fee) * 2**192 / 10**12
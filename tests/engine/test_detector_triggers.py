@@ -0,0 +1,166 @@
+import asyncio
+import pytest
+from engine import detector as detector_module
+from engine.detector import ArbDetector
+from engine.sizing import TradeSizer
+from engine.tick_math import get_tick_at_sqrt_price
+from feeds.binance_feed import BinanceDepthFeed, _BBA_STRUCT
+from state.orderbook import OrderBook
+from state.pool import Pool
+from tests.utils.dummy_logger import DummyLogger
+
+
+class RecordingExecutor:
+    """Collects execute calls, swaps stay pending until settled"""
+
+    def __init__(self):
+        self.calls = []
+        self.pending = set()
+
+    def swap_pending(self, zero_for_one):
+        """Own swap in this direction not yet included"""
+        return zero_for_one in self.pending
+
+    def settle(self, zero_for_one):
+        """Own swap included"""
+        self.pending.discard(zero_for_one)
+
+    def execute_b_sell_u_buy(self, plan, detected_block, detected_fb_index):
+        """B sell / U buy"""
+        self.pending.add(False)
+        self.calls.append(("b_sell_u_buy", detected_block, detected_fb_index))
+
+    def execute_b_buy_u_sell(self, plan, detected_block, detected_fb_index):
+        """B buy / U sell"""
+        self.pending.add(True)
+        self.calls.append(("b_buy_u_sell", detected_block, detected_fb_index))
+
+
+def bba_frame(bid_mantissa: int, ask_mantissa: int, qty_mantissa: int = 100) -> bytes:
+    """bestBidAsk SBE frame with price exponent -2, qty exponent -4"""
+    return b"\x00" * 8 + _BBA_STRUCT.pack(
+        0, 0, -2, -4, bid_mantissa, qty_mantissa, ask_mantissa, qty_mantissa
+    )
+
+
+@pytest.fixture(name="setup")
+def fixture_setup(monkeypatch):
+    """Pool at 4000 USDC/ETH, detector wired to a Binance feed"""
+    monkeypatch.setattr(detector_module, "append_row_to_csv", lambda *_: None)
+    sqrt_price = ArbDetector._price_to_sqrt_x96(4000.0)
+    pool = Pool(
+        sqrt_price_x96=sqrt_price,
+        price=4000.0,
+        active_liquidity=10**15,
+        current_tick=get_tick_at_sqrt_price(sqrt_price),
+    )
+    orderbook = OrderBook()
+    executor = RecordingExecutor()
+    sizer = TradeSizer(pool, orderbook, None)
+    detector = ArbDetector(pool, orderbook, executor, sizer, DummyLogger())
+    feed = BinanceDepthFeed(detector.orderbook, DummyLogger(), detector.on_quote_change)
+    return detector, feed, executor
+
+
+class TestQuoteTrigger:
+    """Detection on Binance bid/ask changes"""
+
+    def test_only_price_changes_trigger(self):
+        """Quantity-only updates don't call the hook"""
+        calls = []
+        feed = BinanceDepthFeed(OrderBook(), DummyLogger(), lambda: calls.append(1))
+        feed.process(bba_frame(400000, 400001))
+        feed.process(bba_frame(400000, 400001, qty_mantissa=9))
+        feed.process(bba_frame(400000, 400002))
+        assert len(calls) == 2
+
+    def test_burst_coalesced(self, setup, monkeypatch):
+        """Many quotes in one loop turn evaluate once, after the burst"""
+        detector, feed, _executor = setup
+        seen = []
+        monkeypatch.setattr(
+            ArbDetector,
+            "_detect",
+            lambda self, *args, **kwargs: seen.append(self.orderbook.bid_price),
+        )
+
+        async def run():
+            detector.last_block, detector.last_flashblock_index = 100, 1
+            for bid in range(390000, 390010):
+                feed.process(bba_frame(bid, bid + 1))
+            await asyncio.sleep(0)
+
+        asyncio.run(run())
+        assert seen == [3900.09]
+
+    def test_executes_on_quote_move(self, setup):
+        """Edge appearing between flashblocks is traded on the quote"""
+        detector, feed, executor = setup
+
+        async def run():
+            feed.process(bba_frame(400000, 400001))
+            detector.on_flashblock_done(100, 1)
+            assert not executor.calls
+            feed.process(bba_frame(410000, 410001))
+            await asyncio.sleep(0)
+
+        asyncio.run(run())
+        assert executor.calls == [("b_sell_u_buy", 100, 1)]
+
+    def test_no_duplicate_for_same_pool_state(self, setup):
+        """Further quotes on the same flashblock state don't re-execute"""
+        detector, feed, executor = setup
+
+        async def run():
+            feed.process(bba_frame(410000, 410001))
+            detector.on_flashblock_done(100, 1)
+            feed.process(bba_frame(411000, 411001))
+            await asyncio.sleep(0)
+
+        asyncio.run(run())
+        assert executor.calls == [("b_sell_u_buy", 100, 1)]
+
+    def test_no_refire_while_swap_pending(self, setup):
+        """Unchanged pool doesn't re-fire across flashblocks until our swap lands"""
+        detector, feed, executor = setup
+
+        async def run():
+            feed.process(bba_frame(410000, 410001))
+            for index in range(1, 4):
+                detector.on_flashblock_done(100, index)
+            executor.settle(False)
+            detector.on_flashblock_done(100, 4)
+
+        asyncio.run(run())
+        assert executor.calls == [("b_sell_u_buy", 100, 1), ("b_sell_u_buy", 100, 4)]
+
+    def test_no_quote_execution_while_resyncing(self, setup):
+        """Quotes don't trade against stale pool state until the next flashblock"""
+        detector, feed, executor = setup
+
+        async def run():
+            detector.on_flashblock_done(100, 1)
+            feed.process(bba_frame(410000, 410001))
+            # resync requested in the same loop turn as the quote
+            detector.on_sync_lost()
+            await asyncio.sleep(0)
+            feed.process(bba_frame(411000, 411001))
+            await asyncio.sleep(0)
+            assert not executor.calls
+            detector.on_flashblock_done(101, 0)
+
+        asyncio.run(run())
+        assert executor.calls == [("b_sell_u_buy", 101, 0)]
+
+    def test_flashblock_supersedes_pending_quote(self, setup):
+        """A flashblock in the same loop turn cancels the quote evaluation"""
+        detector, feed, executor = setup
+
+        async def run():
+            detector.on_flashblock_done(100, 1)
+            feed.process(bba_frame(410000, 410001))
+            detector.on_flashblock_done(100, 2)
+            await asyncio.sleep(0)
+
+        asyncio.run(run())
+        assert executor.calls == [("b_sell_u_buy", 100, 2)]
@@ -0,0 +1,439 @@
+import asyncio
+import threading
+from decimal import Decimal
+import pytest
+from hexbytes import HexBytes
+from web3.datastructures import AttributeDict
+from clients.uniswap.nonce import NonceManager
+from engine.executor import ExecutionLegs, Executor, TRANSFER_TOPIC
+from engine.sizing import TradePlan
+from state.balances import Balances
+from state.flashblocks import FlashblockBuffer
+from tests.utils.dummy_logger import DummyLogger
+from config import BINANCE_FEE
+
+RESPONSE_BINANCE = {
+    "side": "SELL",
+    "fills": [{"price": "4200.00000000", "qty": "0.00200000"}],
+}
+USDC_IN = 8_149_764  # 8.149764 USDC
+GAS_USED = 100_000
+GAS_PRICE = 2_000_258
+L1_FEE = 1_234_567
+
+
+def expected_pnl() -> Decimal:
+    """B sell 0.002 ETH @ 4200, U buy for 8.149764 USDC"""
+    notional = Decimal("4200") * Decimal("0.002")
+    b_fee = notional * Decimal(BINANCE_FEE)
+    gas_eth = Decimal(GAS_USED * GAS_PRICE + L1_FEE) / Decimal(10**18)
+    return notional - (
+        Decimal(USDC_IN) / Decimal(10**6) + b_fee + gas_eth * Decimal("4200")
+    )
+
+
+class TestCalculatePnl:
+    """calculate_pnl on web3 and flashblock receipts"""
+
+    def test_web3_receipt(self):
+        """Formatted receipt from eth_getTransactionReceipt"""
+        receipt = AttributeDict(
+            {
+                "logs": [
+                    AttributeDict(
+                        {
+                            "topics": [HexBytes(TRANSFER_TOPIC)],
+                            "data": HexBytes(USDC_IN.to_bytes(32, "big")),
+                        }
+                    )
+                ],
+                "gasUsed": GAS_USED,
+                "effectiveGasPrice": GAS_PRICE,
+                "l1Fee": hex(L1_FEE),
+            }
+        )
+        pnl = Executor.calculate_pnl(RESPONSE_BINANCE, receipt)
+        assert pnl == pytest.approx(expected_pnl())
+
+    def test_flashblock_receipt(self):
+        """Raw flashblock receipt with hex string quantities"""
+        receipt = {
+            "status": "0x1",
+            "logs": [
+                {"topics": ["0x" + "ab" * 32], "data": "0x" + "00" * 32},
+                {
+                    "topics": [TRANSFER_TOPIC.upper().replace("0X", "0x")],
+                    "data": "0x" + USDC_IN.to_bytes(32, "big").hex(),
+                },
+            ],
+            "gasUsed": hex(GAS_USED),
+            "effectiveGasPrice": hex(GAS_PRICE),
+            "l1Fee": hex(L1_FEE),
+        }
+        pnl = Executor.calculate_pnl(RESPONSE_BINANCE, receipt)
+        assert pnl == pytest.approx(expected_pnl())
+
+
+class FakeUniswapClient:
+    """Local nonces, bundle hash derived from the nonce"""
+
+    def __init__(self, nonce: int, account_nonce: int):
+        self.nonces = NonceManager(nonce)
+        self.account_nonce = account_nonce
+        self.fetch_allowed = threading.Event()
+        self.fetch_allowed.set()
+        self.signed = []
+        self.events = []
+
+    @property
+    def nonce(self):
+        """Next nonce"""
+        return self.nonces.next_nonce
+
+    def sign_tx(
+        self, zero_for_one, amount_token0, amount_limit, nonce, expected_amount1
+    ):
+        """Records the nonce"""
+        self.signed.append(nonce)
+        return f"raw-{nonce}"
+
+    async def post_bundle(self, raw_tx):
+        """Bundle hash = tx hash"""
+        tx_hash = "0x" + raw_tx.split("-")[1]
+        self.events.append(("bundle", tx_hash))
+        return tx_hash
+
+    def fetch_nonce(self):
+        """get_transaction_count, blocks until allowed"""
+        self.fetch_allowed.wait(2)
+        return self.account_nonce
+
+    def reconcile_nonce(self, account_nonce):
+        """Resets local nonce"""
+        return self.nonces.reconcile(account_nonce)
+
+
+class FakeBinanceClient:
+    """Records orders, fills at fill_price"""
+
+    def __init__(self, events: list):
+        self.orders = []
+        self.events = events
+        self.fill_price = "4000.00"
+
+    async def execute_trade(self, side, qty):
+        """Fills immediately"""
+        self.orders.append((side, qty))
+        self.events.append(("binance", side))
+        return {"side": side, "fills": [{"price": self.fill_price, "qty": str(qty)}]}
+
+
+def sell_plan(qty: float = 0.01) -> TradePlan:
+    """U sell / B buy at 4000"""
+    return TradePlan(True, qty, int(qty * 1e18), 0, 0, 4000.0, 0.1, 0)
+
+
+@pytest.fixture(name="executor")
+def fixture_executor(monkeypatch):
+    """Executor with fake clients, post-execute hook and receipt stubbed"""
+
+    async def post_execute_hook(self, _plan, legs, *_args):
+        self.logger.info("done %s", legs.u_bundle_hash)
+
+    async def get_own_receipt(_self, _tx_hash):
+        return {}
+
+    monkeypatch.setattr(Executor, "_post_execute_hook", post_execute_hook)
+    monkeypatch.setattr(Executor, "_get_own_receipt", get_own_receipt)
+    return make_executor("sequential")
+
+
+def make_executor(strategy: str) -> Executor:
+    """Executor with fake clients sharing one event list"""
+    uniswap_client = FakeUniswapClient(7, 7)
+    return Executor(
+        Balances(b_eth=1.0, b_usdc=100.0, u_eth=1.0, u_usdc=100.0),
+        DummyLogger(),
+        None,
+        FakeBinanceClient(uniswap_client.events),
+        uniswap_client,
+        FlashblockBuffer(),
+        None,
+        max_in_flight=3,
+        strategy=strategy,
+    )
+
+
+async def settle():
+    """Lets pending execution tasks run until they wait"""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestPipelinedExecution:
+    """Several executions in flight with local nonces"""
+
+    def test_nonces_and_reservations(self, executor):
+        """Sequential nonces, third execution exceeds the unreserved USDC"""
+
+        async def run():
+            for _ in range(3):
+                executor.execute_b_buy_u_sell(sell_plan(), 100, 1)
+            await settle()
+            assert executor.uniswap_client.signed == [7, 8]
+            assert executor.balances.available("b_usdc") == pytest.approx(20.0)
+            assert executor.balances.available("u_eth") == pytest.approx(0.98)
+            for nonce in (8, 7):
+                executor.flashblock_buffer.resolve_tx(f"0x{nonce}", 101, 0, True)
+            await settle()
+
+        asyncio.run(run())
+        assert executor.binance_client.orders == [("BUY", 0.01), ("BUY", 0.01)]
+        assert executor.balances.available("b_usdc") == pytest.approx(100.0)
+        assert executor.uniswap_client.nonce == 9
+        assert executor.uniswap_client.nonces.in_flight == 0
+        assert "insufficient Balance b_usdc" in executor.logger.get_logs("warning")[0]
+
+    def test_max_in_flight(self, executor):
+        """Executions beyond max_in_flight are skipped"""
+
+        async def run():
+            for _ in range(4):
+                executor.execute_b_buy_u_sell(sell_plan(0.001), 100, 1)
+            await settle()
+
+        asyncio.run(run())
+        assert executor.uniswap_client.signed == [7, 8, 9]
+        assert "3 executions in flight" in executor.logger.get_logs("warning")[0]
+
+    def test_swap_pending_until_included(self, executor):
+        """Direction stays pending until the last own swap is included"""
+
+        async def run():
+            executor.execute_b_buy_u_sell(sell_plan(), 100, 1)
+            executor.execute_b_buy_u_sell(sell_plan(), 100, 1)
+            await settle()
+            assert executor.swap_pending(True) and not executor.swap_pending(False)
+            executor.flashblock_buffer.resolve_tx("0x7", 101, 0, True)
+            await settle()
+            assert executor.swap_pending(True)
+            executor.flashblock_buffer.resolve_tx("0x8", 101, 1, True)
+            await settle()
+
+        asyncio.run(run())
+        assert not executor.swap_pending(True)
+
+    def test_expiry_reconciles_once_drained(self, executor):
+        """No new nonces after an expiry until the account nonce is re-read"""
+        client = executor.uniswap_client
+        client.account_nonce = 8
+        client.fetch_allowed.clear()
+
+        async def run():
+            executor.execute_b_buy_u_sell(sell_plan(), 100, 1)
+            executor.execute_b_buy_u_sell(sell_plan(), 100, 1)
+            await settle()
+            executor.flashblock_buffer.resolve_tx("0x7", 101, 0, True)
+            for _ in range(50):
+                executor.flashblock_buffer.on_flashblock()
+            await settle()
+            executor.execute_b_buy_u_sell(sell_plan(), 100, 2)
+            client.fetch_allowed.set()
+            await asyncio.sleep(0.1)
+            executor.execute_b_buy_u_sell(sell_plan(), 100, 3)
+            await settle()
+
+        asyncio.run(run())
+        assert client.signed == [7, 8, 8]
+        warnings = executor.logger.get_logs("warning")
+        assert any("Tx not included: 0x8" in w for w in warnings)
+        assert any("reconciliation pending" in w for w in warnings)
+
+
+def usdc_receipt(amount1: int) -> dict:
+    """Flashblock receipt with a USDC transfer of amount1"""
+    return {
+        "logs": [
+            {
+                "topics": [TRANSFER_TOPIC],
+                "data": "0x" + amount1.to_bytes(32, "big").hex(),
+            }
+        ],
+        "gasUsed": hex(GAS_USED),
+        "effectiveGasPrice": hex(GAS_PRICE),
+        "l1Fee": hex(L1_FEE),
+    }
+
+
+def record_post_execute(monkeypatch) -> list:
+    """Replaces _post_execute_hook, returns the recorded (legs, u_receipt)"""
+    rows = []
+
+    async def post_execute_hook(_self, _plan, legs, u_receipt, *_args):
+        rows.append((legs, u_receipt))
+
+    monkeypatch.setattr(Executor, "_post_execute_hook", post_execute_hook)
+    return rows
+
+
+class TestExecutionStrategies:
+    """Leg order per strategy, unwinds and metrics"""
+
+    @pytest.mark.parametrize(
+        "strategy, before_inclusion, after_inclusion",
+        [
+            ("sequential", [("bundle", "0x7")], [("binance", "BUY")]),
+            ("parallel", [("bundle", "0x7"), ("binance", "BUY")], []),
+            ("binance_first", [("binance", "BUY"), ("bundle", "0x7")], []),
+        ],
+    )
+    def test_leg_order(
+        self, strategy, before_inclusion, after_inclusion, executor, monkeypatch
+    ):
+        """Binance order relative to bundle and inclusion"""
+        executor = make_executor(strategy)
+        rows = record_post_execute(monkeypatch)
+        events = executor.uniswap_client.events
+
+        async def run():
+            executor.execute_b_buy_u_sell(sell_plan(), 100, 1)
+            await settle()
+            assert sorted(events) == sorted(before_inclusion)
+            executor.flashblock_buffer.resolve_tx("0x7", 101, 0, True)
+            await settle()
+
+        asyncio.run(run())
+        assert events[len(before_inclusion) :] == after_inclusion
+        legs, _u_receipt = rows[0]
+        assert legs.u_success and legs.b_filled
+
+    @pytest.mark.parametrize("strategy", ["parallel", "binance_first"])
+    def test_unwind_on_missed_bundle(self, strategy, executor, monkeypatch):
+        """Binance fill is reversed when the bundle isn't included"""
+        executor = make_executor(strategy)
+        rows = record_post_execute(monkeypatch)
+
+        async def run():
+            executor.execute_b_buy_u_sell(sell_plan(), 100, 1)
+            await settle()
+            for _ in range(50):
+                executor.flashblock_buffer.on_flashblock()
+            await settle()
+
+        asyncio.run(run())
+        assert executor.binance_client.orders == [("BUY", 0.01), ("SELL", 0.01)]
+        legs, u_receipt = rows[0]
+        assert legs.unwind_response is not None and u_receipt is None
+
+    def test_bundle_error_after_binance_fill(self, executor, monkeypatch):
+        """post_bundle raising after the fill still unwinds and logs"""
+        executor = make_executor("binance_first")
+        rows = record_post_execute(monkeypatch)
+
+        async def post_bundle(_raw_tx):
+            raise OSError("builder down")
+
+        executor.uniswap_client.post_bundle = post_bundle
+
+        async def run():
+            executor.execute_b_buy_u_sell(sell_plan(), 100, 1)
+            await settle()
+
+        asyncio.run(run())
+        assert executor.binance_client.orders == [("BUY", 0.01), ("SELL", 0.01)]
+        legs, u_receipt = rows[0]
+        assert isinstance(legs.u_error, OSError) and u_receipt is None
+        assert legs.unwind_response is not None
+        assert not executor.swap_pending(True)
+
+    def test_binance_error_after_inclusion(self, executor, monkeypatch):
+        """execute_trade raising after the bundle landed still logs"""
+        executor = make_executor("sequential")
+        rows = record_post_execute(monkeypatch)
+
+        async def execute_trade(_side, _qty):
+            raise TimeoutError("binance timeout")
+
+        executor.binance_client.execute_trade = execute_trade
+
+        async def run():
+            executor.execute_b_buy_u_sell(sell_plan(), 100, 1)
+            await settle()
+            executor.flashblock_buffer.resolve_tx("0x7", 101, 0, True)
+            await settle()
+
+        asyncio.run(run())
+        legs, _u_receipt = rows[0]
+        assert legs.u_success and not legs.b_filled
+        assert isinstance(legs.b_error, TimeoutError)
+        assert legs.unwind_response is None
+        assert any(
+            "Binance leg not filled" in e for e in executor.logger.get_logs("error")
+        )
+
+    def test_binance_first_unfilled_keeps_nonce(self, executor, monkeypatch):
+        """No nonce is used up when Binance doesn't fill"""
+        executor = make_executor("binance_first")
+        record_post_execute(monkeypatch)
+        nonces = executor.uniswap_client.nonces
+
+        async def execute_trade(side, _qty):
+            return {"side": side, "fills": []}
+
+        executor.binance_client.execute_trade = execute_trade
+
+        async def run():
+            executor.execute_b_buy_u_sell(sell_plan(), 100, 1)
+            await settle()
+
+        asyncio.run(run())
+        assert executor.uniswap_client.signed == []
+        assert nonces.available and nonces.in_flight == 0
+        assert nonces.acquire() == 7
+
+    def test_unsent_nonce_released(self, executor, monkeypatch):
+        """sign_tx raising releases the last nonce without a reconciliation"""
+        executor = make_executor("sequential")
+        record_post_execute(monkeypatch)
+        client = executor.uniswap_client
+
+        def sign_tx(*_args):
+            raise ValueError("signer unavailable")
+
+        client.sign_tx = sign_tx
+
+        async def run():
+            executor.execute_b_buy_u_sell(sell_plan(), 100, 1)
+            await settle()
+
+        asyncio.run(run())
+        assert client.nonces.available and client.nonce == 7
+        assert executor.binance_client.orders == []
+
+    def test_metrics(self, executor):
+        """Adverse slippage is positive for both legs and sides"""
+        plan = TradePlan(True, 0.01, 10**16, 39_000_000, 40_000_000, 4000.0, 0.5, 0)
+        legs = ExecutionLegs(
+            start_ns=0,
+            inclusion=(101, 0, True),
+            u_done_ns=300_000_000,
+            b_response={"side": "BUY", "fills": [{"price": "4002", "qty": "0.01"}]},
+            b_done_ns=320_000_000,
+        )
+        metrics = executor._execution_metrics(plan, legs, usdc_receipt(39_960_000))
+        assert metrics["strategy"] == "sequential"
+        assert metrics["u_latency_ms"] == 300.0
+        assert metrics["leg_gap_ms"] == 20.0
+        assert metrics["b_slippage_bps"] == pytest.approx(5.0)
+        assert metrics["u_slippage_bps"] == pytest.approx(10.0)
+
+        plan.zero_for_one = False
+        legs.b_response["fills"][0]["price"] = "3998"
+        metrics = executor._execution_metrics(plan, legs, usdc_receipt(40_040_000))
+        assert metrics["b_slippage_bps"] == pytest.approx(5.0)
+        assert metrics["u_slippage_bps"] == pytest.approx(10.0)
+
+    def test_unknown_strategy(self):
+        """Strategy name is validated"""
+        with pytest.raises(ValueError):
+            make_executor("random")
@@ -0,0 +1,109 @@
+import pytest
+from config import BINANCE_FEE
+from engine.detector import ArbDetector, UNI_FEE
+from engine.sizing import MAX_LOT_QTY, STEP_WEI, TradeSizer
+from engine.tick_math import get_tick_at_sqrt_price
+from state.balances import Balances
+from state.orderbook import OrderBook
+from state.pool import Pool
+from state.ticks import TickStore
+
+L_NARROW = 5 * 10**14
+L_WIDE = 10**14
+
+
+def make_pool() -> Pool:
+    """Pool at 4000 USDC/ETH, narrow position ±30 ticks inside a wide one"""
+    sqrt_price = ArbDetector._price_to_sqrt_x96(4000.0)
+    tick = get_tick_at_sqrt_price(sqrt_price)
+    base = tick // 10 * 10
+    return Pool(
+        sqrt_price_x96=sqrt_price,
+        price=4000.0,
+        active_liquidity=L_NARROW + L_WIDE,
+        current_tick=tick,
+        ticks=TickStore(
+            [
+                (base - 2000, L_WIDE, L_WIDE),
+                (base - 30, L_NARROW, L_NARROW),
+                (base + 30, L_NARROW, -L_NARROW),
+                (base + 2000, L_WIDE, -L_WIDE),
+            ]
+        ),
+    )
+
+
+def target(zero_for_one: bool, ob: OrderBook) -> int:
+    """Detector's target price: marginal prices after fees are equal"""
+    if zero_for_one:
+        p_t = ob.ask_price * (1 + BINANCE_FEE) / (1 - UNI_FEE)
+    else:
+        p_t = ob.bid_price * (1 - BINANCE_FEE) * (1 - UNI_FEE)
+    return ArbDetector._price_to_sqrt_x96(p_t)
+
+
+def brute_force(sizer: TradeSizer, zero_for_one: bool, ob: OrderBook, max_lots: int):
+    """Best plan over every lot size"""
+    b_price = ob.ask_price if zero_for_one else ob.bid_price
+    plans = [
+        sizer._evaluate(zero_for_one, lots * STEP_WEI, b_price)
+        for lots in range(1, max_lots + 1)
+    ]
+    plans = [p for p in plans if p is not None]
+    return max(plans, key=lambda p: p.expected_profit) if plans else None
+
+
+class TestTradeSizer:
+    """Profit-maximizing size across ticks, capped by book and balances"""
+
+    @pytest.mark.parametrize(
+        "zero_for_one, ob",
+        [
+            (False, OrderBook(4040.0, 4040.1, 10.0, 10.0)),
+            (True, OrderBook(3959.9, 3960.0, 10.0, 10.0)),
+        ],
+    )
+    def test_optimum_across_ticks(self, zero_for_one, ob):
+        """Equals the brute-force optimum, crossing the narrow position"""
+        sizer = TradeSizer(make_pool(), ob, None, max_qty=1.0)
+        plan = sizer.solve(zero_for_one, target(zero_for_one, ob))
+        assert plan is not None
+        assert plan.ticks_crossed == 1
+        assert plan == brute_force(sizer, zero_for_one, ob, 1000)
+
+    def test_capped_by_binance_qty(self):
+        """Top-of-book quantity bounds the size"""
+        ob = OrderBook(4040.0, 4040.1, 0.0123, 10.0)
+        plan = TradeSizer(make_pool(), ob, None).solve(False, target(False, ob))
+        assert plan.qty == 0.0123
+        assert plan.amount_token0 == 123 * STEP_WEI
+
+    def test_capped_by_max_qty(self):
+        """Trades above the max size all use the lot pre-signed by the client"""
+        ob = OrderBook(4400.0, 4400.1, 10.0, 10.0)
+        plan = TradeSizer(make_pool(), ob, None).solve(False, target(False, ob))
+        assert plan.qty == MAX_LOT_QTY
+
+    def test_capped_by_balances(self):
+        """U sell is bounded by Uniswap ETH less gas reserve"""
+        ob = OrderBook(3959.9, 3960.0, 10.0, 10.0)
+        balances = Balances(b_eth=1.0, b_usdc=10_000.0, u_eth=0.01, u_usdc=10_000.0)
+        plan = TradeSizer(make_pool(), ob, balances).solve(True, target(True, ob))
+        assert plan.qty == 0.0099
+
+    def test_limits_at_break_even(self):
+        """Expected amounts satisfy the min-out/max-in limits"""
+        ob = OrderBook(3959.9, 3960.0, 10.0, 10.0)
+        sell = TradeSizer(make_pool(), ob, None).solve(True, target(True, ob))
+        assert sell.expected_amount1 > sell.amount_limit
+        ob = OrderBook(4040.0, 4040.1, 10.0, 10.0)
+        buy = TradeSizer(make_pool(), ob, None).solve(False, target(False, ob))
+        assert buy.expected_amount1 < buy.amount_limit
+
+    def test_no_profitable_size(self):
+        """Edge smaller than gas and min notional yields no plan"""
+        ob = OrderBook(4004.5, 4004.6, 10.0, 10.0)
+        sizer = TradeSizer(make_pool(), ob, None, gas_cost=0.01)
+        assert sizer.solve(False, target(False, ob)) is None
+        sizer = TradeSizer(make_pool(), OrderBook(4040.0, 4040.1, 0.001, 0.001), None)
+        assert sizer.solve(False, target(False, sizer.orderbook)) is None
@@ -0,0 +1,178 @@
+import random
+import pytest
+from engine.tick_math import (
+    MAX_SQRT_PRICE,
+    MAX_TICK,
+    MIN_SQRT_PRICE,
+    MIN_TICK,
+    Q96,
+    SqrtPriceTable,
+    get_sqrt_price_at_tick,
+    get_tick_at_sqrt_price,
+)
+from engine.swap_math import compute_swap_step
+
+# encodePriceSqrt from the Uniswap test suites
+PRICE_1_1 = Q96
+PRICE_101_100 = 79623317895830914510639640423
+PRICE_1000_100 = 250541448375047931186413801569
+PRICE_10000_100 = 792281625142643375935439503360
+
+
+class TestTickMath:
+    """Golden values from the Uniswap TickMath test suite"""
+
+    @pytest.mark.parametrize(
+        "tick, expected",
+        [
+            (MIN_TICK, MIN_SQRT_PRICE),
+            (MIN_TICK + 1, 4295343490),
+            (0, Q96),
+            (MAX_TICK - 1, 1461373636630004318706518188784493106690254656249),
+            (MAX_TICK, MAX_SQRT_PRICE),
+        ],
+    )
+    def test_sqrt_price_at_tick(self, tick, expected):
+        """Exact sqrt prices at the boundaries"""
+        assert get_sqrt_price_at_tick(tick) == expected
+
+    def test_tick_out_of_range(self):
+        """|tick| > MAX_TICK is rejected"""
+        with pytest.raises(ValueError):
+            get_sqrt_price_at_tick(MAX_TICK + 1)
+        with pytest.raises(ValueError):
+            get_sqrt_price_at_tick(MIN_TICK - 1)
+
+    def test_tick_at_sqrt_price_boundaries(self):
+        """Inverse at the price bounds"""
+        assert get_tick_at_sqrt_price(MIN_SQRT_PRICE) == MIN_TICK
+        assert get_tick_at_sqrt_price(MAX_SQRT_PRICE - 1) == MAX_TICK - 1
+        with pytest.raises(ValueError):
+            get_tick_at_sqrt_price(MAX_SQRT_PRICE)
+        with pytest.raises(ValueError):
+            get_tick_at_sqrt_price(MIN_SQRT_PRICE - 1)
+
+    def test_tick_at_sqrt_price_inverse(self):
+        """Greatest tick whose price is <= the given price"""
+        rng = random.Random(3)
+        for _ in range(500):
+            tick = rng.randint(MIN_TICK + 1, MAX_TICK - 1)
+            price = get_sqrt_price_at_tick(tick)
+            assert get_tick_at_sqrt_price(price) == tick
+            assert get_tick_at_sqrt_price(price - 1) == tick - 1
+
+
+class TestSqrtPriceTable:
+    """Cached table is exact against the reference TickMath"""
+
+    def test_get_and_prefill(self):
+        """Prefilled and lazily added entries equal get_sqrt_price_at_tick"""
+        table = SqrtPriceTable()
+        table.prefill(range(-199500, -198500, 10))
+        assert len(table) == 100
+        for tick in (-199500, -198510, MIN_TICK, MAX_TICK, 7):
+            assert table.get(tick) == get_sqrt_price_at_tick(tick)
+        assert len(table) == 103
+        assert 7 in table
+
+    def test_inverse_matches_reference(self):
+        """Bisection over the table agrees with get_tick_at_sqrt_price"""
+        rng = random.Random(5)
+        table = SqrtPriceTable()
+        assert table.tick_at_sqrt_price(Q96) == 0  # empty table
+        table.prefill(range(-200000, -198000, 10))
+        prices = [get_sqrt_price_at_tick(t) for t in range(-200010, -197990, 7)]
+        prices += [rng.randint(MIN_SQRT_PRICE, MAX_SQRT_PRICE - 1) for _ in range(300)]
+        prices += [MIN_SQRT_PRICE, MAX_SQRT_PRICE - 1]
+        for price in prices:
+            for p in (price - 1, price, price + 1):
+                if MIN_SQRT_PRICE <= p < MAX_SQRT_PRICE:
+                    assert table.tick_at_sqrt_price(p) == get_tick_at_sqrt_price(p)
+        with pytest.raises(ValueError):
+            table.tick_at_sqrt_price(MAX_SQRT_PRICE)
+
+
+class TestComputeSwapStep:
+    """
+    Vectors from the Uniswap SwapMath test suites, amount_remaining < 0 is
+    exact input (v4 sign convention)
+    """
+
+    def test_exact_in_capped_at_price_target(self):
+        """One for zero, target reached before input is spent"""
+        price, amount_in, amount_out, fee = compute_swap_step(
+            PRICE_1_1, PRICE_101_100, 2 * 10**18, -(10**18), 600
+        )
+        assert price == PRICE_101_100
+        assert amount_in == 9975124224178055
+        assert amount_out == 9925619580021728
+        assert fee == 5988667735148
+
+    def test_exact_out_capped_at_price_target(self):
+        """Same amounts as the exact input case"""
+        price, amount_in, amount_out, fee = compute_swap_step(
+            PRICE_1_1, PRICE_101_100, 2 * 10**18, 10**18, 600
+        )
+        assert price == PRICE_101_100
+        assert amount_in == 9975124224178055
+        assert amount_out == 9925619580021728
+        assert fee == 5988667735148
+
+    def test_exact_in_fully_spent(self):
+        """Input less fee is used up before the target"""
+        price, amount_in, amount_out, fee = compute_swap_step(
+            PRICE_1_1, PRICE_1000_100, 2 * 10**18, -(10**18), 600
+        )
+        assert price < PRICE_1000_100
+        assert amount_in == 999400000000000000
+        assert amount_out == 666399946655997866
+        assert fee == 600000000000000
+        assert amount_in + fee == 10**18
+
+    def test_exact_out_fully_received(self):
+        """Output is received before the target"""
+        price, amount_in, amount_out, fee = compute_swap_step(
+            PRICE_1_1, PRICE_10000_100, 2 * 10**18, 10**18, 600
+        )
+        assert price < PRICE_10000_100
+        assert amount_in == 2 * 10**18
+        assert amount_out == 10**18
+        assert fee == 1200720432259356
+
+    def test_amount_out_capped_at_desired(self):
+        """Exact output never exceeds the requested amount"""
+        assert compute_swap_step(
+            417332158212080721273783715441582,
+            1452870262520218020823638996,
+            159344665391607089467575320103,
+            1,
+            1,
+        ) == (417332158212080721273783715441581, 1, 1, 1)
+
+    def test_target_price_of_one_partial_input(self):
+        """Only part of the input is needed to reach the target"""
+        assert compute_swap_step(2, 1, 1, -3915081100057732413702495386755767, 1) == (
+            1,
+            39614081257132168796771975168,
+            0,
+            39614120871253040049813,
+        )
+
+    def test_exact_in_dust_consumed(self):
+        """v4 keeps the input less fee as amountIn even if price does not move"""
+        assert compute_swap_step(
+            2413, 79887613182836312, 1985041575832132834610021537970, -10, 1872
+        ) == (2413, 9, 0, 1)
+
+    def test_insufficient_liquidity_exact_output(self):
+        """Both directions with tiny liquidity"""
+        price = 20282409603651670423947251286016
+        target = price * 11 // 10
+        assert compute_swap_step(price, target, 1024, 4, 3000) == (target, 26215, 0, 79)
+        target = price * 9 // 10
+        assert compute_swap_step(price, target, 1024, 263000, 3000) == (
+            target,
+            1,
+            26214,
+            1,
+        )
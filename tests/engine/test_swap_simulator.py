@@ -0,0 +1,133 @@
+import pytest
+from engine.swap_math import compute_swap_step
+from engine.swap_simulator import POOL_FEE_PIPS, simulate_swap, swap_to_price
+from engine.tick_math import get_sqrt_price_at_tick
+from state.pool import Pool
+from state.ticks import TickStore
+
+L_OUTER = 5 * 10**17
+L_INNER = 10**18
+
+
+def make_pool() -> Pool:
+    """Two nested positions around tick -199000, price slightly above it"""
+    ticks = TickStore(
+        [
+            (-199500, L_OUTER, L_OUTER),
+            (-199010, L_INNER, L_INNER),
+            (-198990, L_INNER, -L_INNER),
+            (-198000, L_OUTER, -L_OUTER),
+        ]
+    )
+    return Pool(
+        sqrt_price_x96=get_sqrt_price_at_tick(-199000) + 12345,
+        current_tick=-199000,
+        active_liquidity=L_OUTER + L_INNER,
+        ticks=ticks,
+    )
+
+
+class TestSimulateSwap:
+    """Tick-walking swap loop"""
+
+    def test_single_range_equals_swap_step(self):
+        """Small swap stays in the active range"""
+        pool = make_pool()
+        result = simulate_swap(
+            pool.sqrt_price_x96,
+            pool.current_tick,
+            pool.active_liquidity,
+            pool.ticks,
+            False,
+            -(10**6),
+        )
+        price, amount_in, amount_out, fee = compute_swap_step(
+            pool.sqrt_price_x96,
+            get_sqrt_price_at_tick(-198990),
+            pool.active_liquidity,
+            -(10**6),
+            POOL_FEE_PIPS,
+        )
+        assert result.sqrt_price_x96 == price
+        assert result.amount_in == amount_in + fee == 10**6
+        assert result.amount_out == amount_out
+        assert result.fee_amount == fee
+        assert result.ticks_crossed == 0
+
+    def test_crossing_matches_chained_steps(self):
+        """Crossing -199010 switches to the outer liquidity only"""
+        pool = make_pool()
+        target = get_sqrt_price_at_tick(-199300)
+        result = swap_to_price(pool, target)
+
+        boundary = get_sqrt_price_at_tick(-199010)
+        remaining = -(2**255 - 1)
+        p1, in1, out1, fee1 = compute_swap_step(
+            pool.sqrt_price_x96, boundary, L_OUTER + L_INNER, remaining, POOL_FEE_PIPS
+        )
+        assert p1 == boundary
+        remaining += in1 + fee1
+        p2, in2, out2, fee2 = compute_swap_step(
+            boundary, target, L_OUTER, remaining, POOL_FEE_PIPS
+        )
+        assert result.sqrt_price_x96 == p2 == target
+        assert result.amount_in == in1 + fee1 + in2 + fee2
+        assert result.amount_out == out1 + out2
+        assert result.liquidity == L_OUTER
+        assert result.tick == -199300
+        assert result.ticks_crossed == 1
+
+    def test_crossing_upwards(self):
+        """One for zero crosses -198990 and -198000"""
+        pool = make_pool()
+        result = swap_to_price(pool, get_sqrt_price_at_tick(-197500))
+        assert result.ticks_crossed == 2
+        assert result.liquidity == 0
+        assert result.tick == -197500
+
+    def test_max_amount_in(self):
+        """Capped input is fully spent before the target"""
+        pool = make_pool()
+        target = get_sqrt_price_at_tick(-199300)
+        result = swap_to_price(pool, target, 10**15)
+        assert result.amount_in == 10**15
+        assert target < result.sqrt_price_x96 < pool.sqrt_price_x96
+
+    def test_exact_output_round_trip(self):
+        """Exact output of an exact input swap's output needs no more input"""
+        pool = make_pool()
+        state = (pool.sqrt_price_x96, pool.current_tick, pool.active_liquidity)
+        exact_in = simulate_swap(*state, pool.ticks, True, -(10**18))
+        exact_out = simulate_swap(*state, pool.ticks, True, exact_in.amount_out)
+        assert exact_out.amount_out == exact_in.amount_out
+        assert exact_out.amount_in <= exact_in.amount_in
+
+    def test_sees_liquidity_updates(self):
+        """Positions added after the snapshot take part in the swap"""
+        pool = make_pool()
+        target = get_sqrt_price_at_tick(-199300)
+        before = swap_to_price(pool, target)
+        pool.update_liquidity(-199200, -199100, L_INNER)
+        after = swap_to_price(pool, target)
+        assert after.ticks_crossed == before.ticks_crossed + 2
+        assert after.amount_in > before.amount_in
+
+    def test_at_target(self):
+        """Nothing to do at the target price"""
+        pool = make_pool()
+        result = swap_to_price(pool, pool.sqrt_price_x96)
+        assert (result.amount_in, result.amount_out) == (0, 0)
+
+    def test_price_limit_exceeded(self):
+        """Limit on the wrong side reverts"""
+        pool = make_pool()
+        with pytest.raises(ValueError):
+            simulate_swap(
+                pool.sqrt_price_x96,
+                pool.current_tick,
+                pool.active_liquidity,
+                pool.ticks,
+                True,
+                -1,
+                pool.sqrt_price_x96 + 1,
+            )
@@ -0,0 +1,89 @@
+import asyncio
+from infra.capture import FrameRecorder, read_frames, replay_frames
+from infra.ws import feed_loop
+
+
+class RecordingFeed:
+    """Collects processed frames, optionally into a list shared across feeds"""
+
+    def __init__(self, frames: list | None = None):
+        self.frames = [] if frames is None else frames
+
+    def process(self, raw_msg):
+        """Stores raw_msg"""
+        self.frames.append(raw_msg)
+
+
+class TestCapture:
+    """Test for frame capture and replay"""
+
+    def test_roundtrip(self, tmp_path):
+        """Frames are read back in order with channel, timestamp and type"""
+        path = str(tmp_path / "capture.bin")
+        recorder = FrameRecorder(path)
+        recorder.record(0, 10, b"\x1b\x00flashblock")
+        recorder.record(1, 20, b"sbe")
+        recorder.record(1, 30, "text frame")
+        recorder.close()
+
+        assert list(read_frames(path)) == [
+            (0, 10, b"\x1b\x00flashblock"),
+            (1, 20, b"sbe"),
+            (1, 30, "text frame"),
+        ]
+
+    def test_append_and_truncated_tail(self, tmp_path):
+        """Reopening appends, a partially written record is ignored"""
+        path = str(tmp_path / "capture.bin")
+        recorder = FrameRecorder(path)
+        recorder.record(0, 1, b"a")
+        recorder.close()
+        recorder = FrameRecorder(path)
+        recorder.record(0, 2, b"b")
+        recorder.close()
+        with open(path, "ab") as f:
+            f.write(b"\x00\x00\x03")
+
+        assert [frame for _, _, frame in read_frames(path)] == [b"a", b"b"]
+
+    def test_replay_through_feed_loop(self, tmp_path):
+        """Replay dispatches per channel and waits until frames are processed"""
+        path = str(tmp_path / "capture.bin")
+        recorder = FrameRecorder(path)
+        for i in range(50):
+            recorder.record(i % 2, i * 1_000, bytes([i]))
+        recorder.close()
+
+        async def run():
+            feeds = {0: RecordingFeed(), 1: RecordingFeed()}
+            queues = {0: asyncio.Queue(maxsize=4), 1: asyncio.Queue(maxsize=4)}
+            tasks = [asyncio.create_task(feed_loop(queues[c], feeds[c])) for c in feeds]
+            count = await replay_frames(path, queues, realtime=True)
+            for task in tasks:
+                task.cancel()
+            return count, feeds
+
+        count, feeds = asyncio.run(run())
+        assert count == 50
+        assert feeds[0].frames == [bytes([i]) for i in range(0, 50, 2)]
+        assert feeds[1].frames == [bytes([i]) for i in range(1, 50, 2)]
+
+    def test_max_speed_keeps_cross_channel_order(self, tmp_path):
+        """At max speed frames of both channels are processed in recorded order"""
+        path = str(tmp_path / "capture.bin")
+        recorder = FrameRecorder(path)
+        for i in range(20):
+            recorder.record(i % 2, i * 1_000, bytes([i]))
+        recorder.close()
+
+        async def run():
+            processed = []
+            feeds = {0: RecordingFeed(processed), 1: RecordingFeed(processed)}
+            queues = {0: asyncio.Queue(maxsize=1024), 1: asyncio.Queue(maxsize=1024)}
+            tasks = [asyncio.create_task(feed_loop(queues[c], feeds[c])) for c in feeds]
+            await replay_frames(path, queues, realtime=False)
+            for task in tasks:
+                task.cancel()
+            return processed
+
+        assert asyncio.run(run()) == [bytes([i]) for i in range(20)]
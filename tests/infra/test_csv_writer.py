@@ -0,0 +1,78 @@
+import time
+from infra.csv_writer import CsvWriter
+
+
+def read(path) -> str:
+    """File content, empty if missing"""
+    return path.read_text(encoding="utf-8") if path.exists() else ""
+
+
+def wait_for(predicate, timeout: float = 2.0) -> bool:
+    """Polls predicate until true or timeout"""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+class TestCsvWriter:
+    """Background csv writer"""
+
+    def test_header_once_and_close_flushes(self, tmp_path):
+        """Header on new files only, rows are on disk after close"""
+        writer = CsvWriter(str(tmp_path), flush_rows=1000, flush_interval=60)
+        writer.append("edges.csv", {"block": 1, "edge": 0.5})
+        writer.append("edges.csv", {"block": 2, "edge": 0.25})
+        writer.close()
+        writer.append("edges.csv", {"block": 3, "edge": 0.125})
+        writer.close()
+        assert read(tmp_path / "edges.csv").splitlines() == [
+            "block,edge",
+            "1,0.5",
+            "2,0.25",
+            "3,0.125",
+        ]
+
+    def test_per_file_handles(self, tmp_path):
+        """Rows are routed to their file, each with its own header"""
+        writer = CsvWriter(str(tmp_path))
+        writer.append("a.csv", {"x": 1})
+        writer.append("b.csv", {"y": 2})
+        writer.append("a.csv", {"x": 3})
+        assert writer.flush(timeout=2)
+        assert read(tmp_path / "a.csv").splitlines() == ["x", "1", "3"]
+        assert read(tmp_path / "b.csv").splitlines() == ["y", "2"]
+        writer.close()
+
+    def test_flush_on_row_threshold(self, tmp_path):
+        """flush_rows rows are flushed without waiting for the interval"""
+        writer = CsvWriter(str(tmp_path), flush_rows=3, flush_interval=60)
+        for i in range(3):
+            writer.append("edges.csv", {"i": i})
+        assert wait_for(lambda: read(tmp_path / "edges.csv").count("\n") == 4)
+        writer.close()
+
+    def test_flush_on_interval(self, tmp_path):
+        """A single row is flushed once flush_interval has passed"""
+        writer = CsvWriter(str(tmp_path), flush_rows=1000, flush_interval=0.05)
+        writer.append("edges.csv", {"i": 0})
+        assert wait_for(lambda: read(tmp_path / "edges.csv") == "i\n0\n")
+        writer.close()
+
+    def test_append_does_not_touch_filesystem(self, tmp_path, monkeypatch):
+        """append() only enqueues"""
+        writer = CsvWriter(str(tmp_path))
+        writer.append("edges.csv", {"i": 0})
+        writer.flush(timeout=2)
+
+        def fail(*_args, **_kwargs):
+            raise AssertionError("filesystem access on the caller thread")
+
+        monkeypatch.setattr("builtins.open", fail)
+        monkeypatch.setattr("os.makedirs", fail)
+        writer.append("edges.csv", {"i": 1})
+        monkeypatch.undo()
+        writer.close()
+        assert read(tmp_path / "edges.csv").splitlines() == ["i", "0", "1"]
@@ -0,0 +1,61 @@
+import asyncio
+import time
+from infra.latency import (
+    LatencyHistogram,
+    LatencyTracker,
+    start_metrics_server,
+    _bucket_index,
+    _bucket_upper,
+)
+
+
+class TestLatency:
+    """Test for latency histograms"""
+
+    def test_buckets_are_contiguous(self):
+        """Every value maps to a bucket whose bounds contain it (<= 6.25% wide)"""
+        for value in list(range(5_000)) + [
+            2**k + d for k in range(12, 39) for d in (-1, 0, 1)
+        ]:
+            index = _bucket_index(value)
+            assert _bucket_upper(index - 1) < value <= _bucket_upper(index)
+            assert _bucket_upper(index) - value <= max(1, value // 16)
+
+    def test_percentiles(self):
+        """Percentiles within bucket precision"""
+        h = LatencyHistogram()
+        for value in range(1, 10_001):
+            h.record(value)
+        assert h.count == 10_000
+        assert h.max == 10_000
+        assert abs(h.percentile(0.5) - 5_000) <= 5_000 / 16
+        assert abs(h.percentile(0.99) - 9_900) <= 9_900 / 16
+        assert h.percentile(1.0) == 10_000
+
+    def test_tracker_summary_and_metrics(self):
+        """Stages are measured from the origin timestamp"""
+        tracker = LatencyTracker(("decode",), enabled=True)
+        tracker.origin_ns = time.monotonic_ns() - 2_000_000  # 2 ms ago
+        tracker.record("decode")
+        summary = tracker.summary()["decode"]
+        assert summary["count"] == 1
+        assert 2_000 <= summary["p50"] <= summary["max"]
+        assert 'latency_us_count{stage="decode"} 1' in tracker.render_metrics()
+
+    def test_serve_metrics(self):
+        """Endpoint returns the rendered metrics"""
+        tracker = LatencyTracker(("decode",), enabled=True)
+
+        async def run():
+            server = await start_metrics_server(tracker, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.write(b"GET /metrics HTTP/1.1\r\nHost: localhost\r\n\r\n")
+                response = await reader.read()
+                writer.close()
+            return response
+
+        response = asyncio.run(run())
+        assert response.startswith(b"HTTP/1.1 200 OK")
+        assert b'latency_us_count{stage="decode"} 0' in response
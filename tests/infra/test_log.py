@@ -0,0 +1,95 @@
+import logging
+import queue
+import threading
+from infra.log import DeferredQueueHandler, SampledLogger
+from logging.handlers import QueueListener
+
+
+class ThreadRecordingHandler(logging.Handler):
+    """Records formatted messages with the formatting thread"""
+
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        """Formats in the handler thread"""
+        self.messages.append((self.format(record), threading.current_thread().name))
+
+
+class LazyArg:
+    """Counts str() calls"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __str__(self):
+        self.calls += 1
+        return "lazy"
+
+
+class TestDeferredQueueHandler:
+    """Queue handler without eager formatting"""
+
+    def test_formatted_on_listener_thread(self):
+        """The caller only enqueues, msg % args runs in the listener"""
+        log_queue = queue.SimpleQueue()
+        handler = ThreadRecordingHandler()
+        logger = logging.getLogger("test_log.deferred")
+        logger.propagate = False
+        logger.addHandler(DeferredQueueHandler(log_queue))
+        arg = LazyArg()
+
+        logger.warning("#%s-%s: %s", 1, 2, arg)
+        record = log_queue.get_nowait()
+        assert arg.calls == 0
+        assert (record.msg, record.args) == ("#%s-%s: %s", (1, 2, arg))
+
+        listener = QueueListener(log_queue, handler)
+        log_queue.put(record)
+        listener.start()
+        listener.stop()
+        assert arg.calls == 1
+        assert handler.messages[0][0] == "#1-2: lazy"
+        assert handler.messages[0][1] != threading.current_thread().name
+
+
+class RecordingLogger:
+    """Minimal logger with a threshold"""
+
+    def __init__(self, threshold=logging.INFO):
+        self.threshold = threshold
+        self.records = []
+
+    def isEnabledFor(self, level):  # pylint: disable=invalid-name
+        """Level check"""
+        return level >= self.threshold
+
+    def log(self, level, msg, *args):
+        """Stores the record"""
+        self.records.append((level, msg % args))
+
+
+class TestSampledLogger:
+    """Sampled per-event log lines"""
+
+    def test_every_nth(self):
+        """One in every records is logged, at the configured level"""
+        logger = RecordingLogger()
+        sampled = SampledLogger(logger, "INFO", every=3)
+        for i in range(9):
+            if sampled.due():
+                sampled.log("#%s", i)
+        assert logger.records == [
+            (logging.INFO, "#2"),
+            (logging.INFO, "#5"),
+            (logging.INFO, "#8"),
+        ]
+
+    def test_level_disabled_or_off(self):
+        """Disabled level or every <= 0 never logs"""
+        for sampled in (
+            SampledLogger(RecordingLogger(), "DEBUG", every=1),
+            SampledLogger(RecordingLogger(), logging.INFO, every=0),
+        ):
+            assert not any(sampled.due() for _ in range(5))
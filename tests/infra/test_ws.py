@@ -0,0 +1,65 @@
+import asyncio
+from infra.ws import LatestValueSlot, feed_loop
+
+
+class RecordingFeed:
+    """Collects processed frames"""
+
+    def __init__(self):
+        self.frames = []
+
+    def process(self, raw_msg):
+        """Stores raw_msg"""
+        self.frames.append(raw_msg)
+
+
+class TestLatestValueSlot:
+    """Test for the conflating bestBidAsk channel"""
+
+    def test_newest_wins(self):
+        """A burst is conflated to the last frame and counted as dropped"""
+
+        async def run():
+            slot = LatestValueSlot()
+            for i in range(5):
+                await slot.put((i, i))
+            item = await slot.get()
+            slot.task_done()
+            return slot, item
+
+        slot, item = asyncio.run(run())
+        assert item == (4, 4)
+        assert slot.dropped == 4
+        assert slot.empty()
+
+    def test_get_waits_for_put(self):
+        """get blocks until the producer stores a frame"""
+
+        async def run():
+            slot = LatestValueSlot()
+            getter = asyncio.create_task(slot.get())
+            await asyncio.sleep(0)
+            assert not getter.done()
+            slot.put_nowait(b"frame")
+            return await getter
+
+        assert asyncio.run(run()) == b"frame"
+
+    def test_feed_loop_join(self):
+        """join returns once the consumer processed the latest frame"""
+
+        async def run():
+            slot = LatestValueSlot()
+            feed = RecordingFeed()
+            task = asyncio.create_task(feed_loop(slot, feed))
+            slot.put_nowait((1, 1))
+            slot.put_nowait((2, 2))
+            await slot.join()
+            slot.put_nowait((3, 3))
+            await slot.join()
+            task.cancel()
+            return feed.frames, slot.dropped
+
+        frames, dropped = asyncio.run(run())
+        assert frames == [2, 3]
+        assert dropped == 1
@@ -0,0 +1,78 @@
+import asyncio
+from state.flashblocks import FlashblockBuffer
+
+
+class TestFlashblockBuffer:
+    """Test for own tx inclusion tracking"""
+
+    def test_resolved_by_feed(self):
+        """Waiter resolves with flashblock position and status"""
+
+        async def run():
+            buffer = FlashblockBuffer()
+            future = buffer.wait_for_tx("0xABC", 10)
+            buffer.on_flashblock()
+            buffer.resolve_tx("0xabc", 100, 3, True)
+            return await future, buffer.waiters
+
+        inclusion, waiters = asyncio.run(run())
+        assert inclusion == (100, 3, True)
+        assert not waiters
+
+    def test_timeout_in_flashblocks(self):
+        """Waiter resolves with None after max_flashblocks"""
+
+        async def run():
+            buffer = FlashblockBuffer()
+            future = buffer.wait_for_tx("0xabc", 3)
+            for _ in range(2):
+                buffer.on_flashblock()
+            assert not future.done()
+            buffer.on_flashblock()
+            return await future
+
+        assert asyncio.run(run()) is None
+
+    def test_concurrent_waiters(self):
+        """Independent hashes resolve independently, same hash shares a future"""
+
+        async def run():
+            buffer = FlashblockBuffer()
+            f1 = buffer.wait_for_tx("0x01", 5)
+            f2 = buffer.wait_for_tx("0x02", 5)
+            assert buffer.wait_for_tx("0x01", 5) is f1
+            buffer.resolve_tx("0x02", 7, 1, False)
+            buffer.resolve_tx("0x01", 7, 2, True)
+            return await asyncio.gather(f1, f2)
+
+        assert asyncio.run(run()) == [(7, 2, True), (7, 1, False)]
+
+    def test_already_buffered(self):
+        """A tx seen before registering resolves immediately"""
+
+        async def run():
+            buffer = FlashblockBuffer()
+            buffer.add_block(5, 0, ["0xabc"])
+            return await buffer.wait_for_tx("0xabc", 5)
+
+        assert asyncio.run(run()) == (5, 0, True)
+
+    def test_resolved_before_waiter(self):
+        """Inclusion and receipt published before wait_for_tx are kept, bounded"""
+
+        async def run():
+            buffer = FlashblockBuffer(size=2)
+            buffer.resolve_tx("0xabc", 5, 1, False, receipt={"status": "0x0"})
+            for tx_hash in ("0x01", "0x02"):
+                buffer.resolve_tx(tx_hash, 5, 2, True, receipt={"status": "0x1"})
+            inclusion = await buffer.wait_for_tx("0x02", 5)
+            # only the latest `size` are kept, the oldest waits again
+            evicted = buffer.wait_for_tx("0xabc", 1)
+            buffer.on_flashblock()
+            return inclusion, await evicted, buffer
+
+        inclusion, evicted, buffer = asyncio.run(run())
+        assert inclusion == (5, 2, True)
+        assert buffer.pop_receipt("0x02") == {"status": "0x1"}
+        assert evicted is None
+        assert buffer.pop_receipt("0xabc") is None
@@ -0,0 +1,57 @@
+import pytest
+from state.pool_cache import (
+    PoolCheckpoint,
+    encode_checkpoint,
+    decode_checkpoint,
+    save_checkpoint,
+    load_checkpoint,
+)
+
+OTHER_POOL_ID = "0x" + "11" * 32
+
+
+def checkpoint() -> PoolCheckpoint:
+    """Checkpoint using the full value ranges"""
+    return PoolCheckpoint(
+        from_block=35_000_000,
+        applied_txs={"0x" + "aa" * 32, "0x" + "bb" * 32},
+        sqrt_price_x96=2**160 - 1,
+        active_liquidity=2**128 - 1,
+        current_tick=-887_272,
+        ticks=[(-887_270, 2**128 - 1, 2**127 - 1), (-190_000, 5, -(2**127))],
+    )
+
+
+class TestPoolCache:
+    """Binary pool state checkpoints"""
+
+    def test_roundtrip(self):
+        """Decoding returns the encoded checkpoint"""
+        data = encode_checkpoint(checkpoint())
+        assert decode_checkpoint(data) == checkpoint()
+        # header + 2 tx hashes + 2 ticks of 4 + 16 + 16 bytes
+        assert len(data) == 94 + 2 * 32 + 2 * 36
+
+    def test_roundtrip_without_price(self):
+        """Checkpoint taken before the first Swap keeps price unset"""
+        empty = PoolCheckpoint(from_block=1)
+        assert decode_checkpoint(encode_checkpoint(empty)) == empty
+
+    def test_rejects_other_pool_and_truncated(self):
+        """Data for another pool or cut off data is not loaded"""
+        data = encode_checkpoint(checkpoint(), pool_id=OTHER_POOL_ID)
+        with pytest.raises(ValueError):
+            decode_checkpoint(data)
+        with pytest.raises(ValueError):
+            decode_checkpoint(encode_checkpoint(checkpoint())[:-1])
+
+    def test_save_and_load(self, tmp_path):
+        """Saved checkpoints load back, missing or corrupt files return None"""
+        path = str(tmp_path / "cache" / "pool.bin")
+        assert load_checkpoint(path) is None
+        save_checkpoint(path, checkpoint())
+        assert load_checkpoint(path) == checkpoint()
+        assert not (tmp_path / "cache" / "pool.bin.tmp").exists()
+
+        (tmp_path / "cache" / "pool.bin").write_bytes(b"garbage")
+        assert load_checkpoint(path) is None
@@ -0,0 +1,79 @@
+import random
+import pytest
+from state.tick_bitmap import (
+    TickBitmap,
+    least_significant_bit,
+    most_significant_bit,
+    word_ticks,
+)
+from state.ticks import TickStore
+
+
+def next_reference(ticks: list[int], tick: int, spacing: int, lte: bool):
+    """nextInitializedTickWithinOneWord by scanning a sorted tick list"""
+    compressed = tick // spacing
+    if lte:
+        word_start = (compressed >> 8 << 8) * spacing
+        below = [t for t in ticks if word_start <= t <= tick]
+        return (below[-1], True) if below else (word_start, False)
+    word_end = (((compressed + 1) >> 8 << 8) + 255) * spacing
+    above = [t for t in ticks if tick < t <= word_end]
+    return (above[0], True) if above else (word_end, False)
+
+
+class TestTickBitmap:
+    """Bit helpers and the local tickBitmap mirror"""
+
+    def test_bit_helpers(self):
+        """Lowest/highest set bit and word decoding"""
+        assert least_significant_bit(1) == 0
+        assert least_significant_bit(0b1011000) == 3
+        assert least_significant_bit(1 << 255) == 255
+        assert most_significant_bit(0b1011000) == 6
+        assert most_significant_bit(2**256 - 1) == 255
+
+        word = (1 << 255) | (1 << 7) | 1
+        assert list(word_ticks(-347, word, 10)) == [-888_320, -888_250, -885_770]
+        assert not list(word_ticks(3, 0, 10))
+
+    def test_flip_and_misaligned(self):
+        """Flipping twice clears the tick, misaligned ticks are rejected"""
+        bitmap = TickBitmap(10, [-20, 30])
+        assert bitmap.is_initialized(-20)
+        assert not bitmap.is_initialized(-10)
+        bitmap.flip_tick(-20)
+        assert not bitmap.is_initialized(-20)
+        assert bitmap.word(-1) == 0
+        with pytest.raises(ValueError):
+            bitmap.flip_tick(15)
+
+    def test_next_initialized_matches_scan(self):
+        """Random ticks across word boundaries match a linear scan"""
+        rng = random.Random(5)
+        ticks = sorted({rng.randrange(-3000, 3000) * 10 for _ in range(300)})
+        bitmap = TickBitmap(10, ticks)
+        for tick in [rng.randrange(-31_000, 31_000) for _ in range(3000)] + ticks:
+            for lte in (True, False):
+                assert bitmap.next_initialized_tick_within_one_word(
+                    tick, lte
+                ) == next_reference(ticks, tick, 10, lte)
+
+    def test_tick_store_mirror_follows_updates(self):
+        """ModifyLiquidity inserts/removals keep the store's bitmap in sync"""
+        store = TickStore([(-199_010, 1, 1), (-198_990, 1, -1)])
+        assert store.next_initialized_tick_within_one_word(-199_000, 10, False) == (
+            -198_990,
+            True,
+        )
+        store.update(-198_990, -1, 1)
+        store.update(-198_980, 2, 2)
+        assert store.next_initialized_tick_within_one_word(-199_000, 10, False) == (
+            -198_980,
+            True,
+        )
+        store.update(-199_010, 5, 5)
+        store.update(-199_010, -6, -6)
+        assert store.next_initialized_tick_within_one_word(-199_000, 10, True) == (
+            -199_680,
+            False,
+        )
@@ -0,0 +1,124 @@
+import random
+from state.pool import Pool
+from state.ticks import Tick, TickStore
+
+
+def apply_reference(ticks: dict, tick_lower, tick_upper, liq_delta):
+    """Tick.update semantics on a dict of Tick"""
+    for idx, net in ((tick_lower, liq_delta), (tick_upper, -liq_delta)):
+        t = ticks.setdefault(idx, Tick(0, 0))
+        t.liquidity_gross += liq_delta
+        t.liquidity_net += net
+        if t.liquidity_gross == 0:
+            del ticks[idx]
+
+
+class TestTickStore:
+    """Sorted array tick store"""
+
+    def test_matches_dict_reference(self):
+        """Random position adds/removes keep both representations equal"""
+        rng = random.Random(11)
+        pool, reference = Pool(), {}
+        positions = []
+        for _ in range(2000):
+            if positions and rng.random() < 0.4:
+                lower, upper, liq = positions.pop(rng.randrange(len(positions)))
+                liq = -liq
+            else:
+                lower = rng.randrange(-500, 500) * 10
+                upper = lower + rng.randrange(1, 50) * 10
+                liq = rng.randint(1, 10**20)
+                positions.append((lower, upper, liq))
+            pool.update_liquidity(lower, upper, liq)
+            apply_reference(reference, lower, upper, liq)
+
+        assert list(pool.ticks) == sorted(reference)
+        for idx, t in reference.items():
+            assert pool.ticks.get(idx) == t
+            assert pool.ticks.liquidity_net(idx) == t.liquidity_net
+
+    def test_removed_when_gross_zero(self):
+        """Closing the only position uninitializes both ticks"""
+        pool = Pool()
+        pool.update_liquidity(-20, 30, 5)
+        assert len(pool.ticks) == 2
+        pool.update_liquidity(-20, 30, -5)
+        assert len(pool.ticks) == 0
+        assert -20 not in pool.ticks
+        assert pool.ticks.get(30) is None
+
+    def test_update_inserts_and_removes(self):
+        """Updates keep the order, zero liquidityGross uninitializes the tick"""
+        store = TickStore()
+        store.update(30, 5, -5)
+        store.update(-20, 5, 5)
+        store.update(30, 2, 2)
+        assert list(store) == [-20, 30]
+        assert store.get(30) == Tick(liquidity_gross=7, liquidity_net=-3)
+        store.update(-20, -5, -5)
+        assert list(store) == [30]
+
+    def test_neighbours(self):
+        """O(log n) next initialized tick below/above"""
+        store = TickStore([(-100, 1, 1), (0, 1, 1), (250, 1, -1)])
+        assert store.next_below(0) == 0
+        assert store.next_below(-1) == -100
+        assert store.next_below(-101) is None
+        assert store.next_above(0) == 250
+        assert store.next_above(-100) == 0
+        assert store.next_above(250) is None
+
+    def test_next_initialized_tick_within_one_word(self):
+        """Mirrors TickBitmap, stops at the word edge if nothing is initialized"""
+        store = TickStore([(-199010, 1, 1), (-198990, 1, -1)])
+        assert store.next_initialized_tick_within_one_word(-199000, 10, True) == (
+            -199010,
+            True,
+        )
+        assert store.next_initialized_tick_within_one_word(-199010, 10, True) == (
+            -199010,
+            True,
+        )
+        assert store.next_initialized_tick_within_one_word(-199010, 10, False) == (
+            -198990,
+            True,
+        )
+        # compressed -19902 lies in word -78: [-19968, -19713]
+        assert store.next_initialized_tick_within_one_word(-199011, 10, True) == (
+            -199680,
+            False,
+        )
+        assert store.next_initialized_tick_within_one_word(-198990, 10, False) == (
+            -197130,
+            False,
+        )
+        # negative ticks compress towards -inf
+        empty = TickStore()
+        assert empty.next_initialized_tick_within_one_word(-5, 10, True) == (
+            -2560,
+            False,
+        )
+        assert empty.next_initialized_tick_within_one_word(-5, 10, False) == (
+            2550,
+            False,
+        )
+
+    def test_iter_range(self):
+        """Only ticks within the inclusive range are visited"""
+        store = TickStore([(t, 2, t) for t in range(-50, 60, 10)])
+        assert list(store.iter_range(-15, 20)) == [
+            (-10, 2, -10),
+            (0, 2, 0),
+            (10, 2, 10),
+            (20, 2, 20),
+        ]
+        assert not list(store.iter_range(21, 29))
+
+    def test_load_ticks(self):
+        """Snapshot rows replace the store, unsorted input is sorted"""
+        pool = Pool()
+        pool.update_liquidity(-10, 10, 1)
+        pool.load_ticks([("30", "4", "-4", 0, 0), ("-20", "4", "4", 0, 0)])
+        assert list(pool.ticks) == [-20, 30]
+        assert pool.ticks.get(30) == Tick(liquidity_gross=4, liquidity_net=-4)
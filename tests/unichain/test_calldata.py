@@ -0,0 +1,44 @@
+import random
+import pytest
+from web3 import Web3
+from clients.uniswap.calldata import (
+    ExecuteCalldataTemplate,
+    encode_execute_calldata,
+    UINT128_MAX,
+)
+from config import UNIVERSAL_ROUTER_ABI
+
+
+class TestExecuteCalldataTemplate:
+    """Byte-for-byte equality of the template builder with the eth_abi path"""
+
+    router = Web3().eth.contract(abi=UNIVERSAL_ROUTER_ABI)
+    rng = random.Random(7)
+
+    @pytest.mark.parametrize("zero_for_one", [True, False])
+    def test_equal_to_reference(self, zero_for_one):
+        """Randomized and boundary amounts/limits"""
+        template = ExecuteCalldataTemplate(zero_for_one, self.router)
+        values = [0, 1, 2 * 10**15, UINT128_MAX]
+        values += [self.rng.randint(0, UINT128_MAX) for _ in range(200)]
+        for amount in values:
+            limit = self.rng.choice(values)
+            expected = encode_execute_calldata(zero_for_one, amount, limit, self.router)
+            assert template.build(amount, limit) == expected
+
+    def test_default_limits(self):
+        """Unlimited defaults as used by build_tx"""
+        for zero_for_one, limit in ((True, 0), (False, UINT128_MAX)):
+            template = ExecuteCalldataTemplate(zero_for_one, self.router)
+            expected = encode_execute_calldata(
+                zero_for_one, 2 * 10**15, limit, self.router
+            )
+            assert template.build(2 * 10**15, limit) == expected
+
+    def test_out_of_range(self):
+        """uint128 overflow is rejected"""
+        template = ExecuteCalldataTemplate(True, self.router)
+        with pytest.raises(ValueError):
+            template.build(UINT128_MAX + 1, 0)
+        with pytest.raises(ValueError):
+            template.build(1, -1)
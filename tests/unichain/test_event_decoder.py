@@ -0,0 +1,70 @@
+import random
+import pytest
+from eth_abi import encode, decode
+from feeds.event_decoder import decode_swap_data, decode_modify_liquidity_data
+
+SWAP_TYPES = ["int128", "int128", "uint160", "uint128", "int24", "int24"]
+MODIFY_TYPES = ["int24", "int24", "int256", "bytes32"]
+
+
+def _rand_int(rng: random.Random, bits: int, signed: bool) -> int:
+    # bias towards boundaries, where two's complement handling matters
+    if signed:
+        lo, hi = -(2 ** (bits - 1)), 2 ** (bits - 1) - 1
+    else:
+        lo, hi = 0, 2**bits - 1
+    return rng.choice([lo, hi, 0, -1 if signed else 1, rng.randint(lo, hi)])
+
+
+class TestEventDecoder:
+    """Differential tests of the fixed-layout decoder against eth_abi"""
+
+    rng = random.Random(42)
+
+    def _random_swap(self):
+        return [
+            _rand_int(self.rng, 128, True),
+            _rand_int(self.rng, 128, True),
+            _rand_int(self.rng, 160, False),
+            _rand_int(self.rng, 128, False),
+            _rand_int(self.rng, 24, True),
+            _rand_int(self.rng, 24, True),
+        ]
+
+    def _random_modify(self):
+        return [
+            _rand_int(self.rng, 24, True),
+            _rand_int(self.rng, 24, True),
+            _rand_int(self.rng, 256, True),
+            self.rng.randbytes(32),
+        ]
+
+    def test_swap_matches_eth_abi(self):
+        """Randomized Swap data, hex and bytes input"""
+        for _ in range(2_000):
+            data = encode(SWAP_TYPES, self._random_swap())
+            expected = decode(SWAP_TYPES, data)
+            assert decode_swap_data("0x" + data.hex()) == expected
+            assert decode_swap_data(data) == expected
+
+    def test_modify_liquidity_matches_eth_abi(self):
+        """Randomized ModifyLiquidity data, hex and bytes input"""
+        for _ in range(2_000):
+            data = encode(MODIFY_TYPES, self._random_modify())
+            expected = decode(MODIFY_TYPES, data)
+            assert decode_modify_liquidity_data("0x" + data.hex()) == expected
+            assert decode_modify_liquidity_data(data) == expected
+
+    def test_swap_known_values(self):
+        """Negative amounts and ticks"""
+        values = [-2_000_000_000_000_000, 6_543_210, 2**96, 10**18, -198_765, 500]
+        data = "0x" + encode(SWAP_TYPES, values).hex()
+        assert decode_swap_data(data) == tuple(values)
+
+    def test_invalid_length(self):
+        """Truncated data is rejected like eth_abi does"""
+        data = "0x" + encode(SWAP_TYPES, [0] * 6).hex()
+        with pytest.raises(ValueError):
+            decode_swap_data(data[:-2])
+        with pytest.raises(ValueError):
+            decode_modify_liquidity_data(data)
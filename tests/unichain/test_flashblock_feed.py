@@ -0,0 +1,328 @@
+import asyncio
+import brotli
+import orjson
+from eth_abi import encode
+from feeds.flashblock_feed import (
+    UnichainFlashFeed,
+    SWAP_TOPIC,
+    MODIFY_LIQ_TOPIC,
+    DONATE_TOPIC,
+    pool_id,
+    pool_manager,
+)
+from engine.executor import TRANSFER_TOPIC
+from state.pool import Pool
+from state.flashblocks import FlashblockBuffer
+from tests.utils.dummy_logger import DummyLogger
+
+OTHER_POOL_ID = "0x" + "11" * 32
+SWAP_TYPES = ["int128", "int128", "uint160", "uint128", "int24", "int24"]
+MODIFY_TYPES = ["int24", "int24", "int256", "bytes32"]
+SENDER = "0x" + "00" * 32
+
+
+def swap_log(pool: str, sqrt_price_x96: int, liquidity: int, tick: int) -> dict:
+    """PoolManager Swap log as found in flashblock receipts"""
+    data = encode(
+        SWAP_TYPES, [-(10**15), 3_000_000, sqrt_price_x96, liquidity, tick, 500]
+    )
+    return {
+        "address": pool_manager,
+        "topics": [SWAP_TOPIC, pool, "0x" + "00" * 32],
+        "data": "0x" + data.hex(),
+    }
+
+
+def modify_log(pool: str, tick_lower: int, tick_upper: int, liq_delta: int) -> dict:
+    """PoolManager ModifyLiquidity log"""
+    data = encode(MODIFY_TYPES, [tick_lower, tick_upper, liq_delta, b"\x00" * 32])
+    return {
+        "address": pool_manager,
+        "topics": [MODIFY_LIQ_TOPIC, pool, SENDER],
+        "data": "0x" + data.hex(),
+    }
+
+
+def flashblock(block_number: int, index: int, receipts: dict) -> bytes:
+    """Brotli compressed flashblock payload"""
+    payload = {
+        "payload_id": "0x01",
+        "index": index,
+        "diff": {"withdrawals": [{"index": "0x5"}]},
+        "metadata": {"block_number": block_number, "receipts": receipts},
+    }
+    return brotli.compress(orjson.dumps(payload))
+
+
+def receipt(logs: list, status: str = "0x1") -> dict:
+    """Single Eip1559 receipt"""
+    return {"Eip1559": {"status": status, "cumulativeGasUsed": "0x1", "logs": logs}}
+
+
+class TestUnichainFlashFeed:
+    """Test for flashblock processing"""
+
+    def _feed(self):
+        done = []
+        buffer = FlashblockBuffer()
+        feed = UnichainFlashFeed(
+            Pool(), DummyLogger(), lambda b, i: done.append((b, i)), buffer
+        )
+        feed.set_snapshot_block(0)
+        return feed, done, buffer
+
+    def test_swap_applied(self):
+        """Swap on our pool updates price state"""
+        feed, done, buffer = self._feed()
+        sqrt_price = 4_000 * 2**96 // 10**6
+        raw = flashblock(
+            10, 0, {"0xaa": receipt([swap_log(pool_id, sqrt_price, 10**18, -190_000)])}
+        )
+        feed.process(raw)
+        assert feed.pool.sqrt_price_x96 == sqrt_price
+        assert feed.pool.active_liquidity == 10**18
+        assert feed.pool.current_tick == -190_000
+        assert done == [(10, 0)]
+        assert buffer.lookup("0xaa") == (10, 0)
+
+    def test_prefilter_skips_other_pools(self):
+        """Flashblocks without our pool still run gap check and hook"""
+        feed, done, _buffer = self._feed()
+        for index in range(3):
+            raw = flashblock(
+                10, index, {"0xbb": receipt([swap_log(OTHER_POOL_ID, 2**96, 1, 0)])}
+            )
+            assert not feed._is_relevant(brotli.decompress(raw))
+            feed.process(raw)
+        assert feed.pool.sqrt_price_x96 is None
+        assert done == [(10, 0), (10, 1), (10, 2)]
+        assert feed.last_flashblock_index == 2
+
+    def test_own_swap_seen_before_waiter(self, monkeypatch):
+        """Tx with our wallet in a Transfer topic resolves a later waiter"""
+        wallet = "0x" + "ab" * 20
+        monkeypatch.setattr("feeds.flashblock_feed.wallet", wallet)
+        transfer = {
+            "address": "0x" + "cd" * 20,
+            "topics": [TRANSFER_TOPIC, "0x" + "00" * 12 + wallet[2:], SENDER],
+            "data": "0x" + "00" * 32,
+        }
+        swap = swap_log(pool_id, 4_000 * 2**96 // 10**6, 10**18, -190_000)
+
+        async def run():
+            feed, _done, buffer = self._feed()
+            feed.process(flashblock(10, 0, {"0xee": receipt([swap, transfer])}))
+            return await buffer.wait_for_tx("0xee", 5), buffer
+
+        inclusion, buffer = asyncio.run(run())
+        assert inclusion == (10, 0, True)
+        assert buffer.pop_receipt("0xee")["logs"][1] == transfer
+
+    def test_own_tx_resolved(self):
+        """Own reverted tx without pool events resolves the waiter"""
+
+        async def run():
+            feed, _done, buffer = self._feed()
+            future = buffer.wait_for_tx("0xcc", 5)
+            feed.process(flashblock(10, 0, {"0xcc": receipt([], status="0x0")}))
+            return await future
+
+        assert asyncio.run(run()) == (10, 0, False)
+
+
+class TestGapRecovery:
+    """Feed gaps are recovered from eth_getLogs, full resync as fallback"""
+
+    def _feed(self, monkeypatch, logs=None, error=None):
+        """Feed synced at block 9, fetch_pool_logs and snapshot_once stubbed"""
+        calls = {"fetch": [], "resync": 0}
+
+        async def fetch_pool_logs(_w3, from_block, to_block):
+            calls["fetch"].append((from_block, to_block))
+            if error is not None:
+                raise error
+            return logs or []
+
+        async def snapshot_once(_feed, _logger):
+            calls["resync"] += 1
+
+        monkeypatch.setattr("feeds.flashblock_feed.fetch_pool_logs", fetch_pool_logs)
+        monkeypatch.setattr("feeds.flashblock_feed.snapshot_once", snapshot_once)
+        done = []
+        feed = UnichainFlashFeed(
+            Pool(),
+            DummyLogger(),
+            lambda b, i: done.append((b, i)),
+            FlashblockBuffer(),
+            on_sync_lost=lambda: done.append("sync lost"),
+        )
+        feed._w3 = object()
+        feed.set_snapshot_block(9)
+        # last seen flashblock (9, 5)
+        feed.last_block, feed.last_flashblock_index = 9, 5
+        return feed, done, calls
+
+    @staticmethod
+    def log_entry(tx_hash: str, log: dict) -> tuple:
+        """fetch_pool_logs entry of a flashblock log"""
+        return tx_hash, log["data"], log["topics"]
+
+    @staticmethod
+    async def settle():
+        """Lets the recovery task run"""
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+    def test_index_gap_skips_applied_txs(self, monkeypatch):
+        """Missed flashblock is applied from logs, already applied txs are not"""
+        applied = modify_log(pool_id, -100, 100, 5)
+        missed = modify_log(pool_id, -200, 200, 7)
+        logs = [self.log_entry("0xaa", applied), self.log_entry("0xbb", missed)]
+        feed, done, calls = self._feed(monkeypatch, logs)
+
+        async def run():
+            feed.process(flashblock(10, 0, {"0xaa": receipt([applied])}))
+            # (10, 1) missed, (10, 2) is part of the logs of block 10
+            feed.process(flashblock(10, 2, {"0xbb": receipt([missed])}))
+            assert feed.snapshot_block_number is None
+            await self.settle()
+            feed.process(flashblock(11, 0, {}))
+
+        asyncio.run(run())
+        assert calls == {"fetch": [(10, 10)], "resync": 0}
+        assert feed.pool.ticks.get(-100).liquidity_gross == 5
+        assert feed.pool.ticks.get(-200).liquidity_gross == 7
+        assert feed.snapshot_block_number == 10
+        assert done == [(10, 0), "sync lost", (11, 0)]
+
+    def test_block_gap_replays_buffered(self, monkeypatch):
+        """Missed blocks are fetched up to the one before the new index 0"""
+        sqrt_price = 4_000 * 2**96 // 10**6
+        swap = swap_log(pool_id, sqrt_price, 10**18, -190_000)
+        feed, done, calls = self._feed(monkeypatch, [self.log_entry("0xcc", swap)])
+
+        async def run():
+            feed.process(flashblock(10, 0, {}))
+            feed.process(flashblock(13, 0, {}))
+            await self.settle()
+            feed.process(flashblock(13, 1, {}))
+
+        asyncio.run(run())
+        assert calls == {"fetch": [(10, 12)], "resync": 0}
+        assert feed.pool.sqrt_price_x96 == sqrt_price
+        assert feed.snapshot_block_number == 12
+        assert done == [(10, 0), "sync lost", (13, 1)]
+
+    def test_donate_falls_back_to_snapshot(self, monkeypatch):
+        """Untracked events in the gap trigger a full resync"""
+        donate = {"data": "0x", "topics": [DONATE_TOPIC, pool_id, SENDER]}
+        logs = [("0xdd", donate["data"], donate["topics"])]
+        feed, done, calls = self._feed(monkeypatch, logs)
+
+        async def run():
+            feed.process(flashblock(10, 0, {}))
+            feed.process(flashblock(12, 0, {}))
+            await self.settle()
+
+        asyncio.run(run())
+        assert calls == {"fetch": [(10, 11)], "resync": 1}
+        assert done == [(10, 0), "sync lost", "sync lost"]
+        assert feed.snapshot_block_number is None
+
+    def test_large_gap_falls_back_to_snapshot(self, monkeypatch):
+        """Gaps above gap_recovery_max_blocks are not fetched"""
+        monkeypatch.setattr("feeds.flashblock_feed.GAP_RECOVERY_MAX_BLOCKS", 2)
+        feed, _done, calls = self._feed(monkeypatch)
+
+        async def run():
+            feed.process(flashblock(10, 0, {}))
+            feed.process(flashblock(14, 0, {}))
+            await self.settle()
+
+        asyncio.run(run())
+        assert calls == {"fetch": [], "resync": 1}
+
+    def test_rpc_error_falls_back_to_snapshot(self, monkeypatch):
+        """Failed log fetch triggers a full resync"""
+        feed, _done, calls = self._feed(monkeypatch, error=OSError("rpc down"))
+
+        async def run():
+            feed.process(flashblock(10, 0, {}))
+            feed.process(flashblock(10, 3, {}))
+            await self.settle()
+
+        asyncio.run(run())
+        assert calls == {"fetch": [(10, 10)], "resync": 1}
+
+
+class TestWarmStart:
+    """Restart from a pool checkpoint plus catch-up logs"""
+
+    def test_checkpoint_restore_catch_up(self, monkeypatch):
+        """Restored feed matches the one that kept running"""
+        sqrt_price = 4_000 * 2**96 // 10**6
+        applied = modify_log(pool_id, -100, 100, 5)
+        swap = swap_log(pool_id, sqrt_price, 10**18, -190_000)
+        later = modify_log(pool_id, -200, 200, 7)
+        fetched = []
+
+        async def fetch_pool_logs(_w3, from_block, to_block):
+            fetched.append((from_block, to_block))
+            return [
+                ("0xaa", applied["data"], applied["topics"]),
+                ("0xbb", later["data"], later["topics"]),
+            ]
+
+        monkeypatch.setattr("feeds.flashblock_feed.fetch_pool_logs", fetch_pool_logs)
+
+        running = UnichainFlashFeed(
+            Pool(), DummyLogger(), lambda b, i: None, FlashblockBuffer()
+        )
+        assert running.checkpoint() is None
+        running.set_snapshot_block(9)
+        running.process(flashblock(10, 0, {"0xcc": receipt([swap])}))
+        running.process(flashblock(10, 1, {"0xaa": receipt([applied])}))
+        checkpoint = running.checkpoint()
+        assert checkpoint.from_block == 10
+        assert checkpoint.applied_txs == {"0xaa", "0xcc"}
+
+        done = []
+        restarted = UnichainFlashFeed(
+            Pool(), DummyLogger(), lambda b, i: done.append((b, i)), FlashblockBuffer()
+        )
+        restarted._w3 = object()
+
+        async def run():
+            restarted.process(flashblock(12, 3, {}))
+            restarted.restore(checkpoint)
+            await restarted.catch_up(checkpoint.from_block, checkpoint.applied_txs, 10)
+            restarted.process(flashblock(12, 4, {}))
+
+        asyncio.run(run())
+        assert fetched == [(10, 12)]
+        assert restarted.snapshot_block_number == 12
+        assert restarted.pool.sqrt_price_x96 == sqrt_price
+        assert restarted.pool.price == running.pool.price
+        assert restarted.pool.ticks.get(-100).liquidity_gross == 5
+        assert restarted.pool.ticks.get(-200).liquidity_gross == 7
+        assert done == [(12, 4)]
+
+    def test_stale_checkpoint_falls_back_to_snapshot(self, monkeypatch):
+        """Catch-up ranges above max_blocks resync instead"""
+        resyncs = []
+
+        async def snapshot_once(_feed, _logger):
+            resyncs.append(True)
+
+        monkeypatch.setattr("feeds.flashblock_feed.snapshot_once", snapshot_once)
+        feed = UnichainFlashFeed(
+            Pool(), DummyLogger(), lambda b, i: None, FlashblockBuffer()
+        )
+
+        async def run():
+            feed.process(flashblock(100, 0, {}))
+            await feed.catch_up(10, set(), 50)
+            await asyncio.sleep(0)
+
+        asyncio.run(run())
+        assert resyncs == [True]
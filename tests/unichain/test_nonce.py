@@ -0,0 +1,50 @@
+from clients.uniswap.nonce import NonceManager
+
+
+class TestNonceManager:
+    """Local nonce allocation for pipelined bundles"""
+
+    def test_sequential(self):
+        """Nonces are handed out in order, inclusion needs no reconciliation"""
+        nonces = NonceManager(5)
+        assert [nonces.acquire() for _ in range(3)] == [5, 6, 7]
+        for n in (6, 5, 7):
+            nonces.included(n)
+        assert nonces.in_flight == 0
+        assert not nonces.needs_reconcile
+        assert nonces.acquire() == 8
+
+    def test_expiry_withholds_until_reconciled(self):
+        """An expiry blocks new nonces until drained and reconciled"""
+        nonces = NonceManager(5)
+        nonces.acquire()
+        nonces.acquire()
+        nonces.expired(5)
+        assert nonces.acquire() is None
+        assert not nonces.needs_reconcile  # 6 still in flight
+        nonces.expired(6)
+        assert nonces.needs_reconcile
+        assert nonces.reconcile(5)
+        assert nonces.acquire() == 5
+
+    def test_expired_after_included_is_noop(self):
+        """Resolving an included nonce again doesn't mark a gap"""
+        nonces = NonceManager(1)
+        nonces.acquire()
+        nonces.included(1)
+        nonces.expired(1)
+        assert not nonces.reconcile(2)
+        assert nonces.acquire() == 2
+
+    def test_release_unsent(self):
+        """Unsent last nonce is handed out again, an earlier one leaves a gap"""
+        nonces = NonceManager(3)
+        nonces.acquire()
+        nonces.release(3)
+        assert nonces.in_flight == 0
+        assert nonces.acquire() == 3
+        nonces.acquire()
+        nonces.release(3)
+        assert nonces.acquire() is None
+        nonces.included(4)
+        assert nonces.needs_reconcile
@@ -0,0 +1,86 @@
+import threading
+import time
+from clients.uniswap.presign import PresignedTxCache
+
+
+class FakeSigner:
+    """Deterministic signer counting calls"""
+
+    def __init__(self, delay: float = 0.0):
+        self.calls = []
+        self.delay = delay
+        self.lock = threading.Lock()
+
+    def __call__(self, zero_for_one, nonce, amount_token0, amount_limit):
+        time.sleep(self.delay)
+        with self.lock:
+            self.calls.append((zero_for_one, nonce, amount_token0, amount_limit))
+        return f"0x{int(zero_for_one)}-{nonce}-{amount_token0}-{amount_limit}"
+
+
+def _wait_ready(cache, *args, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        raw = cache.get(*args)
+        if raw is not None:
+            return raw
+        time.sleep(0.001)
+    return None
+
+
+class TestPresignedTxCache:
+    """Test for the pre-signed tx cache"""
+
+    def test_directions_with_params_presigned(self):
+        """prepare signs each direction with params, get returns them"""
+        signer = FakeSigner()
+        cache = PresignedTxCache(signer)
+        cache.prepare(7, {True: (0.002, 100), False: (0.003, 5)})
+        assert _wait_ready(cache, True, 7, 0.002, 100, 100) == "0x1-7-0.002-100"
+        assert _wait_ready(cache, False, 7, 0.003, 5, 5) == "0x0-7-0.003-5"
+        cache.close()
+
+    def test_direction_without_params_not_signed(self):
+        """Nothing is signed before a size/limit is known for a direction"""
+        signer = FakeSigner()
+        cache = PresignedTxCache(signer)
+        cache.prepare(1, {True: (0.002, 100), False: None})
+        _wait_ready(cache, True, 1, 0.002, 100, 100)
+        cache.prepare(1, {True: None, False: None})
+        time.sleep(0.01)
+        assert signer.calls == [(True, 1, 0.002, 100)]
+        assert cache.get(True, 1, 0.002, 100, 100) is None
+        cache.close()
+
+    def test_unchanged_params_not_resigned(self):
+        """Repeated prepare with same params does not sign again"""
+        signer = FakeSigner()
+        cache = PresignedTxCache(signer)
+        params = {True: (0.002, 100), False: (0.002, 200)}
+        cache.prepare(1, params)
+        _wait_ready(cache, True, 1, 0.002, 100, 100)
+        _wait_ready(cache, False, 1, 0.002, 200, 200)
+        cache.prepare(1, params)
+        time.sleep(0.01)
+        assert len(signer.calls) == 2
+        cache.close()
+
+    def test_limit_range_and_invalidation(self):
+        """Limits within the accepted range hit, other nonces/amounts never do"""
+        signer = FakeSigner()
+        cache = PresignedTxCache(signer)
+        cache.prepare(1, {True: (0.002, 100)})
+        _wait_ready(cache, True, 1, 0.002, 100, 100)
+        cache.prepare(2, {True: (0.002, 105)})
+        assert cache.get(True, 1, 0.002, 100, 100) is None
+        assert _wait_ready(cache, True, 2, 0.002, 101, 110) == "0x1-2-0.002-105"
+        assert cache.get(True, 2, 0.002, 106, 110) is None
+        assert cache.get(True, 2, 0.003, 100, 110) is None
+        cache.close()
+
+    def test_not_ready_returns_none(self):
+        """While signing is in progress the caller falls back to inline signing"""
+        cache = PresignedTxCache(FakeSigner(delay=0.2))
+        cache.prepare(1, {True: (0.002, 100)})
+        assert cache.get(True, 1, 0.002, 100, 100) is None
+        cache.close()
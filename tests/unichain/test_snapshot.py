@@ -0,0 +1,284 @@
+import asyncio
+import pytest
+from eth_abi import encode, decode
+from eth_utils import function_signature_to_4byte_selector
+from hexbytes import HexBytes
+from web3 import AsyncWeb3
+from web3.exceptions import ContractLogicError
+from web3.providers.async_base import AsyncBaseProvider
+from clients.uniswap.snapshot import (
+    fetch_pool_logs,
+    fetch_pool_snapshot,
+    snapshot_once,
+    outer_chunks,
+    PoolSnapshot,
+    MIN_WORD,
+    MAX_WORD,
+)
+from feeds.flashblock_feed import UnichainFlashFeed
+from state.pool import Pool
+from tests.utils.dummy_logger import DummyLogger
+from config import UNICHAIN_POOL_MANAGER, UNISWAP_POOL_ID
+
+
+class FakeEth:
+    """AsyncWeb3 eth namespace, the node reaches the head after two polls"""
+
+    def __init__(self, head: int, logs: list):
+        self.heads = [head - 2, head - 1, head]
+        self.logs = logs
+        self.filters = []
+
+    @property
+    async def block_number(self) -> int:
+        return self.heads.pop(0) if len(self.heads) > 1 else self.heads[0]
+
+    async def get_logs(self, filter_params: dict) -> list:
+        self.filters.append(filter_params)
+        return self.logs
+
+
+class FakeWeb3:
+    """AsyncWeb3 stand-in"""
+
+    def __init__(self, eth: FakeEth):
+        self.eth = eth
+
+
+def rpc_log(block: int, log_index: int, tx: int) -> dict:
+    """eth_getLogs entry as returned by web3"""
+    return {
+        "blockNumber": block,
+        "logIndex": log_index,
+        "transactionHash": HexBytes(bytes([tx]) * 32),
+        "data": HexBytes(b"\x01\x02"),
+        "topics": [
+            HexBytes(b"\xab" * 32),
+            HexBytes(bytes.fromhex(UNISWAP_POOL_ID[2:])),
+        ],
+    }
+
+
+class TestFetchPoolLogs:
+    """eth_getLogs based gap recovery"""
+
+    def test_waits_for_block_and_returns_hex(self):
+        """Polls until to_block, returns hex strings in chain order"""
+        eth = FakeEth(12, [rpc_log(12, 0, 3), rpc_log(11, 4, 2), rpc_log(11, 1, 1)])
+        logs = asyncio.run(fetch_pool_logs(FakeWeb3(eth), 10, 12))
+
+        assert eth.heads == [12]
+        assert eth.filters == [
+            {
+                "fromBlock": 10,
+                "toBlock": 12,
+                "address": UNICHAIN_POOL_MANAGER,
+                "topics": [None, UNISWAP_POOL_ID],
+            }
+        ]
+        assert [tx_hash for tx_hash, _data, _topics in logs] == [
+            "0x" + "01" * 32,
+            "0x" + "02" * 32,
+            "0x" + "03" * 32,
+        ]
+        _tx_hash, data, topics = logs[0]
+        assert data == "0x0102"
+        assert topics == ["0x" + "ab" * 32, UNISWAP_POOL_ID.lower()]
+
+
+SNAPSHOT_TYPE = "(uint256,uint160,int24,uint128,int16,int16,(int24,uint128,int128)[])"
+TICKS_TYPE = "(int24,uint128,int128)[]"
+INITIALIZED_TICKS = function_signature_to_4byte_selector(
+    "getInitializedTicks(bytes32,int24,int16,int16)"
+)
+TICKS = [(-197_090, 20, 20), (-195_120, 30, -5)]
+
+
+def call_args(call: dict) -> tuple:
+    """Decoded getPoolSnapshot arguments of an eth_call"""
+    return decode(["bytes32", "int24", "uint16"], bytes.fromhex(call["data"][10:]))
+
+
+class FakeProvider(AsyncBaseProvider):
+    """JSON-RPC stand-in answering eth_call with a TickBitmapHelper result"""
+
+    def __init__(self, snapshot: tuple | None, outer_ticks: list | None = None):
+        super().__init__()
+        self.snapshot = snapshot
+        # ticks returned by getInitializedTicks, filtered by word range
+        self.outer_ticks = outer_ticks or []
+        self.block_number = snapshot[0] if snapshot else 100
+        self.calls = []
+
+    async def make_request(self, method, params):
+        self.calls.append((method, params))
+        if method == "eth_call":
+            data = bytes.fromhex(params[0]["data"][2:])
+            if data[:4] == INITIALIZED_TICKS:
+                _pool_id, spacing, start, end = decode(
+                    ["bytes32", "int24", "int16", "int16"], data[4:]
+                )
+                ticks = [
+                    t
+                    for t in self.outer_ticks
+                    if start <= (t[0] // spacing) >> 8 <= end
+                ]
+                result = encode([TICKS_TYPE], [ticks])
+                return {"jsonrpc": "2.0", "id": 1, "result": "0x" + result.hex()}
+            if self.snapshot is None:
+                return {
+                    "jsonrpc": "2.0",
+                    "id": 1,
+                    "error": {"code": 3, "message": "execution reverted"},
+                }
+            data = encode([SNAPSHOT_TYPE], [self.snapshot])
+            return {"jsonrpc": "2.0", "id": 1, "result": "0x" + data.hex()}
+        if method == "eth_chainId":
+            return {"jsonrpc": "2.0", "id": 1, "result": "0x82"}
+        if method == "eth_blockNumber":
+            return {"jsonrpc": "2.0", "id": 1, "result": hex(self.block_number)}
+        raise NotImplementedError(method)
+
+    def eth_calls(self) -> list:
+        """Params of the eth_call requests"""
+        return [params for method, params in self.calls if method == "eth_call"]
+
+    async def is_connected(self, show_traceback: bool = False) -> bool:
+        return True
+
+
+class TestFetchPoolSnapshot:
+    """Single-call pool snapshot"""
+
+    def test_decodes_snapshot(self):
+        """getPoolSnapshot result is decoded into PoolSnapshot"""
+        raw = (100, 4_000 * 2**96 // 10**6, -195_000, 10**18, -78, -76, TICKS)
+        provider = FakeProvider(raw)
+        w3 = AsyncWeb3(provider)
+        snapshot = asyncio.run(fetch_pool_snapshot(w3, 100, word_radius=1))
+
+        assert snapshot == PoolSnapshot(
+            100, 4_000 * 2**96 // 10**6, -195_000, 10**18, -78, -76, TICKS
+        )
+        ((call, block),) = provider.eth_calls()
+        assert block == hex(100)
+        selector = function_signature_to_4byte_selector(
+            "getPoolSnapshot(bytes32,int24,uint16)"
+        )
+        assert bytes.fromhex(call["data"][2:10]) == selector
+        assert call_args(call)[1:] == (10, 1)
+
+    def test_full_range_radius(self):
+        """word_radius 0 requests every word"""
+        provider = FakeProvider((1, 1, 0, 1, -347, 346, []))
+        asyncio.run(fetch_pool_snapshot(AsyncWeb3(provider), 1))
+        ((call, _block),) = provider.eth_calls()
+        assert call_args(call)[2] == 2**16 - 1
+
+    def test_revert_raises_contract_error(self):
+        """Helpers without getPoolSnapshot revert, snapshot_once falls back"""
+        provider = FakeProvider(None)
+        with pytest.raises(ContractLogicError):
+            asyncio.run(fetch_pool_snapshot(AsyncWeb3(provider), 1))
+
+
+class TestSnapshotOnce:
+    """Snapshot applied to the feed"""
+
+    def _run(self, monkeypatch, provider: FakeProvider) -> UnichainFlashFeed:
+        monkeypatch.setattr("clients.uniswap.snapshot.ALCHEMY_API_KEY", "")
+        monkeypatch.setattr(
+            "clients.uniswap.snapshot.connect_web3_async",
+            lambda _url: AsyncWeb3(provider),
+        )
+        feed = UnichainFlashFeed(Pool(), DummyLogger(), lambda b, i: None, None)
+        feed.last_block, feed.last_flashblock_index = 100, 0
+        asyncio.run(snapshot_once(feed, DummyLogger(), word_radius=0))
+        return feed
+
+    def test_slot0_and_ticks_applied(self, monkeypatch):
+        """Price is known right after the snapshot"""
+        sqrt_price = 4_000 * 2**96 // 10**6
+        provider = FakeProvider((100, sqrt_price, -195_000, 10**18, -347, 346, TICKS))
+        feed = self._run(monkeypatch, provider)
+
+        assert feed.snapshot_block_number == 100
+        assert feed.pool.sqrt_price_x96 == sqrt_price
+        assert feed.pool.active_liquidity == 10**18
+        assert feed.pool.current_tick == -195_000
+        assert feed.pool.price is not None
+        assert list(feed.pool.ticks.items()) == TICKS
+
+    def test_falls_back_to_two_call_snapshot(self, monkeypatch):
+        """Reverting getPoolSnapshot uses getTickBitmapsRange + getTicks"""
+        legacy_ticks = [(-197_090, 20, 20, 0, 0)]
+
+        async def initialize_uniswap_pool(_w3, snapshot_block):
+            assert snapshot_block == 100
+            return legacy_ticks
+
+        monkeypatch.setattr(
+            "clients.uniswap.snapshot.initialize_uniswap_pool", initialize_uniswap_pool
+        )
+        feed = self._run(monkeypatch, FakeProvider(None))
+
+        assert feed.snapshot_block_number == 100
+        assert feed.pool.sqrt_price_x96 is None
+        assert list(feed.pool.ticks.items()) == [(-197_090, 20, 20)]
+
+
+class TestProgressiveSnapshot:
+    """Window first, outer words merged in the background"""
+
+    def test_outer_chunks_cover_range_nearest_first(self):
+        """Chunks alternate below/above the window and cover every other word"""
+        chunks = outer_chunks(-78, -76, 100)
+        assert chunks[:3] == [(-178, -79), (-75, 24), (-278, -179)]
+        words = sorted(w for start, end in chunks for w in range(start, end + 1))
+        expected = [w for w in range(MIN_WORD, MAX_WORD + 1) if not -78 <= w <= -76]
+        assert words == expected
+
+    def test_merge_adds_to_events_since_snapshot(self):
+        """Chunk state at the snapshot block plus later ModifyLiquidity"""
+        feed = UnichainFlashFeed(Pool(), DummyLogger(), lambda b, i: None, None)
+        feed.create_snapshot(TICKS, 100, complete=False)
+        generation = feed.snapshot_count
+        # after block 100: +7 on an outer tick, removal of another one
+        feed._process_modify_liquidity_event(-300_000, -204_750, 7)
+        feed._process_modify_liquidity_event(300_000, 300_010, -4)
+        assert feed.checkpoint() is None
+
+        assert feed.merge_ticks(
+            [(-300_000, 3, 3), (300_000, 4, 4), (300_010, 4, -4)], generation
+        )
+        assert feed.pool.ticks.get(-300_000).liquidity_gross == 10
+        assert feed.pool.ticks.get(-300_000).liquidity_net == 10
+        assert feed.pool.ticks.get(-204_750).liquidity_gross == 7
+        assert 300_000 not in feed.pool.ticks
+        assert 300_010 not in feed.pool.ticks
+
+        feed.create_snapshot(TICKS, 101)
+        assert not feed.merge_ticks([(-300_000, 3, 3)], generation)
+        assert -300_000 not in feed.pool.ticks
+
+    def test_snapshot_once_fills_outer_words(self, monkeypatch):
+        """Window is usable first, outer ticks are read at the snapshot block"""
+        monkeypatch.setattr("clients.uniswap.snapshot.ALCHEMY_API_KEY", "")
+        sqrt_price = 4_000 * 2**96 // 10**6
+        outer = [(-887_270, 1, 1), (-204_750, 10, 10), (887_270, 1, -1)]
+        provider = FakeProvider(
+            (100, sqrt_price, -195_000, 10**18, -78, -76, TICKS), outer
+        )
+        monkeypatch.setattr(
+            "clients.uniswap.snapshot.connect_web3_async",
+            lambda _url: AsyncWeb3(provider),
+        )
+        feed = UnichainFlashFeed(Pool(), DummyLogger(), lambda b, i: None, None)
+        feed.last_block, feed.last_flashblock_index = 100, 0
+        asyncio.run(snapshot_once(feed, DummyLogger(), word_radius=1, chunk_words=64))
+
+        assert feed.ticks_complete
+        assert list(feed.pool.ticks.items()) == sorted(TICKS + outer)
+        eth_calls = provider.eth_calls()
+        assert len(eth_calls) == 1 + len(outer_chunks(-78, -76, 64))
+        assert {block for _call, block in eth_calls} == {hex(100)}
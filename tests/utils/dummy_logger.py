@@ -16,6 +16,10 @@ class DummyLogger:
         self.logs["error"].append(formatted_msg)
         print(formatted_msg)
 
+    def exception(self, msg, *args, **kwargs):
+        """Log an error message from an exception handler."""
+        self.error(msg, *args, **kwargs)
+
     def debug(self, msg, *args, **kwargs):
         """Log a debug message."""
         formatted_msg = msg % args if args else msg
@@ -28,6 +32,17 @@ class DummyLogger:
         self.logs["warning"].append(formatted_msg)
         print(formatted_msg)
 
+    def log(self, level, msg, *args, **kwargs):
+        """Log a message at a numeric level."""
+        name = {10: "debug", 20: "info", 30: "warning"}.get(level, "error")
+        formatted_msg = msg % args if args else msg
+        self.logs[name].append(formatted_msg)
+        print(formatted_msg)
+
+    def isEnabledFor(self, level):  # pylint: disable=invalid-name
+        """All levels are enabled."""
+        return True
+
     def get_logs(self, level):
         """Retrieve logs by level ('info', 'error', 'debug', 'warning')."""
         return self.logs.get(level, [])